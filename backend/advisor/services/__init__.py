@@ -1,13 +1,28 @@
 # Services Package
-from .market_data import MarketDataService
+from .market_data import IndexSnapshot, MarketDataService, Quote, SectorEntry, to_json_ready
+from .market_snapshot import MarketSnapshot, get_market_snapshot
 from .readiness_engine import ReadinessEngine
-from .llm_client import LLMClient, get_llm_client
+from .llm_client import (
+    CachedLLMClient, CoalescingLLMClient, FallbackLLMClient, LLMClient, get_llm_client,
+    get_llm_stats, warm_up_llm_clients,
+)
 from .advice_engine import AdviceEngine
 
 __all__ = [
     'MarketDataService',
+    'Quote',
+    'IndexSnapshot',
+    'SectorEntry',
+    'to_json_ready',
+    'MarketSnapshot',
+    'get_market_snapshot',
     'ReadinessEngine', 
     'LLMClient',
+    'CachedLLMClient',
+    'CoalescingLLMClient',
+    'FallbackLLMClient',
     'get_llm_client',
+    'get_llm_stats',
+    'warm_up_llm_clients',
     'AdviceEngine',
 ]
@@ -0,0 +1,104 @@
+"""
+Advice Buckets - Quantize advice inputs into a bounded set of bands.
+
+Personalized advice only really varies by band (a score of 57 and 58 get
+the same guidance), so prompts are built from bands instead of raw values.
+Every user in a band shares one prompt, one LLM call and one cache entry,
+and the full set of bands is small enough to prewarm.
+"""
+from bisect import bisect_right
+from itertools import product
+from typing import Dict, List, NamedTuple, Optional
+
+from django.conf import settings
+
+from .readiness_engine import ReadinessEngine
+
+
+RISK_LEVELS = ('CONSERVATIVE', 'MODERATE', 'AGGRESSIVE')
+MARKET_RISK_LEVELS = ('LOW', 'MEDIUM', 'HIGH')
+
+
+class AdviceBucket(NamedTuple):
+    """Canonical advice inputs; the fields are the labels used in the prompt."""
+    score: str
+    status: str
+    risk_level: str
+    ef_months: str
+    market_risk: str
+
+
+def bucket_config() -> Dict:
+    return {
+        'score_step': 10,
+        'ef_months': [0, 1, 3, 6],
+        'cache_ttl': 6 * 60 * 60,
+        'prewarm': False,
+        'prewarm_interval': 60,
+        **getattr(settings, 'ADVICE_BUCKETS', {}),
+    }
+
+
+def _band_edges(step: int) -> List[int]:
+    """
+    Lower edges of the score bands: every `step` points, plus each readiness
+    status threshold so no band spans two statuses.
+    """
+    thresholds = {threshold for threshold, _ in ReadinessEngine.STATUS_THRESHOLDS}
+    return sorted(set(range(0, 100, step)) | thresholds)
+
+
+def _score_band(score: float, edges: List[int]) -> int:
+    """Lower edge of the band holding the score, e.g. 57 -> 50 with a step of 10."""
+    # Same rounding as the engine; 100 belongs to the top band rather than one of its own
+    return edges[bisect_right(edges, ReadinessEngine.clamp_score(score)) - 1]
+
+
+def _score_label(low: int, edges: List[int]) -> str:
+    i = edges.index(low)
+    high = edges[i + 1] - 1 if i + 1 < len(edges) else 100
+    return f"{low}-{high}"
+
+
+def _ef_label(months: float, edges: List[float]) -> str:
+    """Band of emergency fund coverage, e.g. 4.2 -> '3-6' with edges 0/1/3/6."""
+    i = max(bisect_right(edges, months) - 1, 0)
+    if i == len(edges) - 1:
+        return f"{edges[i]:g}+"
+    return f"{edges[i]:g}-{edges[i + 1]:g}"
+
+
+def bucket_advice_inputs(
+    score: float,
+    risk_level: Optional[str],
+    ef_months: float,
+    market_risk: str,
+) -> AdviceBucket:
+    """
+    Canonicalize one investor's inputs. Status is derived from the score band
+    rather than passed in, so it can never split a band into extra buckets;
+    bands never straddle a status threshold, so it matches the engine's.
+    """
+    config = bucket_config()
+    edges = _band_edges(config['score_step'])
+    low = _score_band(score, edges)
+    return AdviceBucket(
+        score=_score_label(low, edges),
+        status=ReadinessEngine.status_for_score(low),
+        risk_level=risk_level or 'MODERATE',
+        ef_months=_ef_label(ef_months, sorted(config['ef_months'])),
+        market_risk=market_risk,
+    )
+
+
+def all_buckets(market_risk: Optional[str] = None) -> List[AdviceBucket]:
+    """Every bucket (for one market risk level if given), for prewarming."""
+    config = bucket_config()
+    ef_edges = sorted(config['ef_months'])
+    market_risks = [market_risk] if market_risk else MARKET_RISK_LEVELS
+    return [
+        bucket_advice_inputs(score, risk_level, months, risk)
+        for score, risk_level, months, risk in product(
+            _band_edges(config['score_step']), RISK_LEVELS, ef_edges, market_risks
+        )
+    ]
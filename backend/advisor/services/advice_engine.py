@@ -1,9 +1,19 @@
 """
 Advice Engine - Generates AI-powered financial advice and insights.
 """
-from typing import Dict, Optional, List
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, Optional, List, Tuple
+from .advice_buckets import AdviceBucket, all_buckets, bucket_advice_inputs, bucket_config
+from .cache import TTLCache
 from .llm_client import get_llm_client
-from .market_data import MarketDataService
+from .llm_gate import GatedLLMClient
+from .market_snapshot import get_market_snapshot
+
+
+# Parsed advice per (provider, bucket); a few hundred buckets at most
+_advice_cache = TTLCache(max_entries=1024, default_ttl=bucket_config()['cache_ttl'])
 
 
 class AdviceEngine:
@@ -69,16 +79,40 @@ Describe a market pattern or insight for today based on this data:
 - Top Mover: {top_mover} ({top_mover_change}%)
 
 Keep it educational and under 80 words. Explain what it means for a beginner investor.
+""",
+        
+        'beginner_explanation': """
+Explain this for a beginner investor in India in simple terms (under 60 words):
+"{context}"
 """,
     }
     
     def __init__(self):
         self.llm = get_llm_client()
-        self.market_service = MarketDataService()
     
     def get_market_explanation(self) -> Dict:
         """Generate AI explanation of today's market."""
-        summary = self.market_service.get_market_summary()
+        prompt, explanation = self._market_explanation_context()
+        response = self.llm.generate(prompt)
+        
+        return {
+            **explanation,
+            'summary': response.get('text', 'Unable to generate market summary.'),
+            'provider': response.get('provider', 'unknown'),
+        }
+    
+    def stream_market_explanation(self) -> Tuple[Dict, Iterator[str]]:
+        """
+        The market explanation's headline fields, plus an iterator over the
+        AI summary's text chunks as the provider produces them. The stream's
+        `provider` names the provider actually used once its first chunk is out.
+        """
+        prompt, explanation = self._market_explanation_context()
+        return explanation, self.llm.generate_stream(prompt)
+    
+    def _market_explanation_context(self) -> Tuple[str, Dict]:
+        """The market explanation prompt and the fields that don't need the LLM."""
+        summary = get_market_snapshot().summary
         sectors = summary.get('sectors', [])
         
         top_sector = sectors[0] if sectors else {'name': 'N/A', 'change_percent': 0}
@@ -93,8 +127,6 @@ Keep it educational and under 80 words. Explain what it means for a beginner inv
             mood=summary.get('mood', 'Neutral')
         )
         
-        response = self.llm.generate(prompt)
-        
         # Determine headline based on mood
         mood = summary.get('mood', 'Neutral')
         if 'Positive' in mood or 'Bullish' in mood:
@@ -104,12 +136,10 @@ Keep it educational and under 80 words. Explain what it means for a beginner inv
         else:
             tone = 'NEUTRAL'
         
-        return {
+        return prompt, {
             'headline': f"Market Mood Today: {mood}",
-            'summary': response.get('text', 'Unable to generate market summary.'),
             'tone': tone,
             'index_change': summary['index'].get('change_percent', 0),
-            'provider': response.get('provider', 'unknown'),
         }
     
     def get_personalized_advice(
@@ -118,16 +148,32 @@ Keep it educational and under 80 words. Explain what it means for a beginner inv
         risk_profile,
         market_risk: str = 'MEDIUM'
     ) -> Dict:
-        """Generate personalized daily advice based on user's profile."""
-        
-        prompt = self.PROMPTS['personalized_advice'].format(
+        """
+        Generate personalized daily advice based on user's profile.
+        Inputs are bucketed into bands, so users in the same band share one
+        cached piece of advice.
+        """
+        bucket = bucket_advice_inputs(
             score=readiness_data.get('score', 50),
-            status=readiness_data.get('status', 'GETTING_THERE'),
             risk_level=risk_profile.risk_level if risk_profile else 'MODERATE',
-            ef_months=round(readiness_data.get('breakdown', {}).get('emergency_fund', {}).get('months_coverage', 0), 1),
-            market_risk=market_risk
+            ef_months=readiness_data.get('breakdown', {}).get('emergency_fund', {}).get('months_coverage', 0),
+            market_risk=market_risk,
         )
+        return self.get_bucket_advice(bucket)
+    
+    def get_bucket_advice(self, bucket: AdviceBucket) -> Dict:
+        """Advice for one bucket, from the advice cache when available."""
+        advice, _ = self._bucket_advice(bucket)
+        return advice
+    
+    def _bucket_advice(self, bucket: AdviceBucket) -> Tuple[Dict, bool]:
+        """(advice, whether it is cached) for one bucket."""
+        key = (self.llm.get_provider_name(), bucket)
+        cached = _advice_cache.get(key)
+        if cached is not None:
+            return dict(cached), True
         
+        prompt = self.PROMPTS['personalized_advice'].format(**bucket._asdict())
         response = self.llm.generate(prompt)
         text = response.get('text', '')
         
@@ -136,7 +182,23 @@ Keep it educational and under 80 words. Explain what it means for a beginner inv
         advice['provider'] = response.get('provider', 'unknown')
         advice['raw_response'] = text
         
-        return advice
+        # Failures and last-resort answers aren't pinned for the day
+        cacheable = bool(response.get('success')) and not response.get('fallback')
+        if cacheable:
+            _advice_cache.set(key, advice)
+        return dict(advice), cacheable
+    
+    def prewarm_advice(self, market_risk: Optional[str] = None, workers: int = 4) -> Dict:
+        """
+        Generate advice for every bucket (for one market risk level if given)
+        so no user waits on the LLM. Returns counts of warm and failed buckets.
+        """
+        buckets = all_buckets(market_risk)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='advice-prewarm') as pool:
+            cached = [ok for _, ok in pool.map(self._bucket_advice, buckets)]
+        
+        failed = cached.count(False)
+        return {'buckets': len(buckets), 'warm': len(buckets) - failed, 'failed': failed}
     
     def _parse_advice_response(self, text: str) -> Dict:
         """Parse LLM response into structured advice."""
@@ -174,7 +236,7 @@ Keep it educational and under 80 words. Explain what it means for a beginner inv
     
     def get_sector_insights(self) -> Dict:
         """Generate AI insights for sector performance."""
-        sectors = self.market_service.get_sector_performance()
+        sectors = get_market_snapshot().summary.get('sectors', [])
         
         sector_data = '\n'.join([
             f"- {s['name']}: {s['change_percent']:+.1f}%"
@@ -203,7 +265,7 @@ Keep it educational and under 80 words. Explain what it means for a beginner inv
     
     def get_pattern_insight(self) -> Dict:
         """Generate today's market pattern insight."""
-        summary = self.market_service.get_market_summary()
+        summary = get_market_snapshot().summary
         movers = summary.get('movers', {})
         gainers = movers.get('gainers', [])
         
@@ -237,15 +299,58 @@ Keep it educational and under 80 words. Explain what it means for a beginner inv
         }
     
     def get_beginner_explanation(self, context: str) -> Dict:
-        """Generate beginner-friendly explanation for any context."""
-        prompt = f"""
-Explain this for a beginner investor in India in simple terms (under 60 words):
-"{context}"
-"""
-        response = self.llm.generate(prompt)
+        """
+        Generate beginner-friendly explanation for any context. Waits behind
+        the LLM gate with a deadline and degrades to the fallback text when
+        overloaded.
+        """
+        prompt = self.PROMPTS['beginner_explanation'].format(context=context)
+        response = GatedLLMClient(self.llm).generate(prompt)
         
         return {
             'context': context,
             'explanation': response.get('text', 'Unable to generate explanation.'),
             'provider': response.get('provider', 'unknown'),
         }
+    
+    def stream_beginner_explanation(self, context: str) -> Iterator[str]:
+        """Text chunks of the beginner explanation as the provider produces them."""
+        prompt = self.PROMPTS['beginner_explanation'].format(context=context)
+        return self.llm.generate_stream(prompt)
+
+
+_prewarm_thread: Optional[threading.Thread] = None
+_prewarm_lock = threading.Lock()
+
+
+def start_advice_prewarm():
+    """
+    Keep advice for every bucket warm on a daemon thread (once per process).
+    Buckets are regenerated when the market risk level changes and before
+    the cached advice expires.
+    """
+    global _prewarm_thread
+    with _prewarm_lock:
+        if _prewarm_thread is not None:
+            return
+        
+        config = bucket_config()
+        
+        def loop():
+            warmed_risk, warmed_at = None, 0.0
+            while True:
+                try:
+                    risk = get_market_snapshot().risk['risk_level']
+                    if risk != warmed_risk or time.monotonic() - warmed_at > config['cache_ttl'] / 2:
+                        result = AdviceEngine().prewarm_advice(risk)
+                        print(
+                            f"[Advice] Prewarmed {result['warm']}/{result['buckets']} "
+                            f"buckets for {risk} market risk"
+                        )
+                        warmed_risk, warmed_at = risk, time.monotonic()
+                except Exception as e:
+                    print(f'[Advice] Prewarm failed: {e}')
+                time.sleep(config['prewarm_interval'])
+        
+        _prewarm_thread = threading.Thread(target=loop, name='advice-prewarm', daemon=True)
+        _prewarm_thread.start()
@@ -0,0 +1,108 @@
+"""
+Cache - Thread-safe, size-bounded TTL cache shared by the service layer.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    In-process LRU cache where every entry carries its own expiry.
+
+    Entries are evicted when they expire or, once `max_entries` is reached,
+    in least-recently-used order. Hit/miss/eviction counters are kept so
+    callers can expose them for monitoring.
+    """
+
+    def __init__(self, max_entries: int = 512, default_ttl: float = 60):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._data: 'OrderedDict[Hashable, Tuple[float, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for `key`, or `default` if absent/expired."""
+        value = self._lookup(key)
+        return default if value is _MISSING else value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store `value` under `key` for `ttl` seconds."""
+        ttl = self.default_ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_set(
+        self,
+        key: Hashable,
+        loader: Callable[[], Any],
+        ttl: Optional[float] = None,
+        should_cache: Optional[Callable[[Any], bool]] = None
+    ) -> Any:
+        """
+        Return the cached value for `key`, calling `loader` on a miss.
+
+        `should_cache` lets callers skip storing failed or empty results.
+        """
+        value = self._lookup(key)
+        if value is not _MISSING:
+            return value
+
+        value = loader()
+        if should_cache is None or should_cache(value):
+            self.set(key, value, ttl)
+        return value
+
+    def delete(self, key: Hashable):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict:
+        """Counters for monitoring."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._data),
+            'max_entries': self.max_entries,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def _lookup(self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return _MISSING
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return _MISSING
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
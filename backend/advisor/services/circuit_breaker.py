@@ -0,0 +1,163 @@
+"""
+Circuit Breaker - Fail fast when a market data provider is unhealthy.
+
+Tracks the outcome of recent calls per provider. Once the failure rate over
+the window crosses the threshold the breaker opens and callers skip the
+provider entirely; after a cool-down a limited number of probe calls are let
+through (half-open) to decide whether to close again.
+"""
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+from django.conf import settings
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is refused because the provider's breaker is open."""
+
+
+class CircuitBreaker:
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate: float = 0.5,
+        window: int = 20,
+        min_calls: int = 5,
+        open_seconds: float = 30,
+        half_open_probes: int = 1
+    ):
+        self.name = name
+        self.failure_rate_threshold = failure_rate
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+
+        self._outcomes = deque(maxlen=window)
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._lock = threading.Lock()
+        self.times_opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    @property
+    def is_open(self) -> bool:
+        """True while calls should skip the provider (cool-down not yet over)."""
+        return self.state == self.OPEN
+
+    def allow_request(self) -> bool:
+        """Claim permission for one call; half-open admits a limited number of probes."""
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and self._probes_in_flight < self.half_open_probes:
+                self._state = self.HALF_OPEN
+                self._probes_in_flight += 1
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                # Probe succeeded: start over with a clean window
+                self._state = self.CLOSED
+                self._probes_in_flight = 0
+                self._outcomes.clear()
+            self._outcomes.append(True)
+
+    def record_failure(self):
+        with self._lock:
+            if self._state == self.OPEN:
+                # A call admitted before the breaker opened finished late;
+                # re-opening would keep pushing the cool-down back
+                return
+            if self._state == self.HALF_OPEN:
+                self._open()
+                return
+            self._outcomes.append(False)
+            if len(self._outcomes) >= self.min_calls and self._failure_rate() >= self.failure_rate_threshold:
+                self._open()
+
+    def release(self):
+        """The call ended without a verdict (e.g. it never reached the provider)."""
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._probes_in_flight:
+                self._probes_in_flight -= 1
+
+    def reset(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._probes_in_flight = 0
+            self._outcomes.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            state = self._current_state()
+            return {
+                'name': self.name,
+                'state': state,
+                'failure_rate': round(self._failure_rate(), 3),
+                'calls_in_window': len(self._outcomes),
+                'times_opened': self.times_opened,
+                'rejected': self.rejected,
+                'retry_in_seconds': (
+                    round(max(0.0, self._opened_at + self.open_seconds - time.monotonic()), 1)
+                    if state == self.OPEN else 0
+                ),
+            }
+
+    def _current_state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            return self.HALF_OPEN
+        return self._state
+
+    def _failure_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+
+    def _open(self):
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._probes_in_flight = 0
+        self.times_opened += 1
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    """Get the process-wide breaker for a provider, configured from settings."""
+    breaker = _breakers.get(name)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.get(name)
+            if breaker is None:
+                config = getattr(settings, 'MARKET_CIRCUIT_BREAKER', {})
+                breaker = CircuitBreaker(
+                    name,
+                    failure_rate=config.get('failure_rate', 0.5),
+                    window=config.get('window', 20),
+                    min_calls=config.get('min_calls', 5),
+                    open_seconds=config.get('open_seconds', 30),
+                )
+                _breakers[name] = breaker
+    return breaker
+
+
+def get_breaker_stats() -> Dict[str, Dict]:
+    """State of every breaker created so far, for monitoring."""
+    return {name: breaker.stats() for name, breaker in list(_breakers.items())}
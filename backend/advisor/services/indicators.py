@@ -0,0 +1,207 @@
+"""
+Indicators - Vectorized technical indicators over daily close prices.
+
+Everything works on a 2-D matrix of closes (one row per symbol, oldest bar
+first, NaN-padded on the left for shorter histories), so a whole universe is
+computed in a handful of NumPy passes instead of a Python loop per bar.
+"""
+import math
+from datetime import date
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .cache import TTLCache
+from .timeseries_store import DailyBars
+
+
+TREND_SHORT_WINDOW = 10
+TREND_LONG_WINDOW = 30
+VOLATILITY_WINDOW = 20
+TRADING_DAYS_PER_YEAR = 252
+
+
+def stack_closes(series: Sequence[np.ndarray], length: Optional[int] = None) -> np.ndarray:
+    """Right-align close arrays into a (symbols, bars) matrix padded with NaN."""
+    length = length or max((len(s) for s in series), default=0)
+    matrix = np.full((len(series), length), np.nan)
+    for row, closes in enumerate(series):
+        tail = np.asarray(closes[-length:], dtype=float)
+        if len(tail):
+            matrix[row, length - len(tail):] = tail
+    return matrix
+
+
+def period_returns(closes: np.ndarray, window: int) -> np.ndarray:
+    """Percent change over the last `window` bars, per symbol."""
+    if closes.shape[1] <= window:
+        return np.full(closes.shape[0], np.nan)
+    return (closes[:, -1] / closes[:, -1 - window] - 1) * 100
+
+
+def rolling_volatility(closes: np.ndarray, window: int = VOLATILITY_WINDOW) -> np.ndarray:
+    """
+    Annualized rolling standard deviation of daily returns (in %), for every
+    bar. Uses cumulative sums, so cost is O(bars) regardless of window.
+    """
+    with np.errstate(invalid='ignore', divide='ignore'):
+        returns = closes[:, 1:] / closes[:, :-1] - 1
+    valid = ~np.isnan(returns)
+    values = np.where(valid, returns, 0.0)
+
+    def window_sum(x):
+        c = np.cumsum(x, axis=1)
+        c = np.concatenate([np.zeros((x.shape[0], 1)), c], axis=1)
+        return c[:, window:] - c[:, :-window]
+
+    result = np.full(returns.shape, np.nan)
+    if returns.shape[1] < window:
+        return result
+
+    n = window_sum(valid.astype(float))
+    s1 = window_sum(values)
+    s2 = window_sum(values ** 2)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        variance = (s2 - s1 ** 2 / n) / (n - 1)
+    std = np.sqrt(np.clip(variance, 0, None))
+    std[n < window] = np.nan
+    result[:, window - 1:] = std * math.sqrt(TRADING_DAYS_PER_YEAR) * 100
+    return result
+
+
+def latest_volatility(closes: np.ndarray, window: int = VOLATILITY_WINDOW) -> np.ndarray:
+    """Annualized volatility (in %) as of the latest bar."""
+    volatility = rolling_volatility(closes, window)
+    if volatility.shape[1] == 0:
+        return np.full(closes.shape[0], np.nan)
+    return volatility[:, -1]
+
+
+def max_drawdown(closes: np.ndarray, window: int = TREND_LONG_WINDOW) -> np.ndarray:
+    """Largest peak-to-trough fall (in %, <= 0) over the last `window` bars."""
+    recent = closes[:, -window:]
+    peaks = np.fmax.accumulate(recent, axis=1)
+    with np.errstate(invalid='ignore'):
+        drawdowns = (recent / peaks - 1) * 100
+    has_data = ~np.isnan(drawdowns).all(axis=1)
+    result = np.full(closes.shape[0], np.nan)
+    result[has_data] = np.nanmin(drawdowns[has_data], axis=1)
+    return result
+
+
+def steadiness(closes: np.ndarray, window: int = TREND_LONG_WINDOW) -> np.ndarray:
+    """
+    How straight the price path is over `window` bars, 0-100: the R² of a
+    linear fit of log price against time.
+    """
+    if closes.shape[1] < window:
+        return np.full(closes.shape[0], np.nan)
+
+    y = np.log(closes[:, -window:])
+    x = np.arange(window, dtype=float)
+    x = x - x.mean()
+    y = y - y.mean(axis=1, keepdims=True)
+    ss_y = (y ** 2).sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        r = (y @ x) / np.sqrt(ss_y * (x ** 2).sum())
+    # A perfectly flat price is as steady as it gets; NaN rows stay NaN
+    return np.where(ss_y == 0, 100.0, r ** 2 * 100)
+
+
+def compute_indicators(closes: np.ndarray) -> Dict[str, np.ndarray]:
+    """All learn-page indicators for a (symbols, bars) close matrix."""
+    return {
+        'return_10d': period_returns(closes, TREND_SHORT_WINDOW),
+        'return_30d': period_returns(closes, TREND_LONG_WINDOW),
+        'volatility': latest_volatility(closes),
+        'max_drawdown': max_drawdown(closes),
+        'steadiness': steadiness(closes),
+    }
+
+
+# ---------- Beginner-friendly labels ----------
+
+def trend_label(change_pct: Optional[float]) -> str:
+    if change_pct is None or math.isnan(change_pct):
+        return 'Not enough data'
+    if change_pct > 5:
+        return 'Strong Up'
+    if change_pct > 1:
+        return 'Up'
+    if change_pct > 0.25:
+        return 'Slightly Up'
+    if change_pct >= -0.25:
+        return 'Stable'
+    if change_pct >= -1:
+        return 'Slightly Down'
+    if change_pct >= -5:
+        return 'Down'
+    return 'Strong Down'
+
+
+def volatility_label(annualized_pct: Optional[float]) -> str:
+    if annualized_pct is None or math.isnan(annualized_pct):
+        return 'Not enough data'
+    if annualized_pct < 18:
+        return 'Low'
+    if annualized_pct < 32:
+        return 'Medium'
+    return 'High'
+
+
+def steadiness_label(score: Optional[float]) -> str:
+    if score is None or math.isnan(score):
+        return 'Not enough data'
+    if score >= 70:
+        return 'Very Steady'
+    if score >= 40:
+        return 'Fairly Steady'
+    return 'Some Ups & Downs'
+
+
+def describe(metrics: Dict[str, Optional[float]]) -> Dict:
+    """TrendInfo block for the learn payload, with the raw numbers attached."""
+    return {
+        'trend10': trend_label(metrics['return_10d']),
+        'trend30': trend_label(metrics['return_30d']),
+        'volatility': volatility_label(metrics['volatility']),
+        'steadiness': steadiness_label(metrics['steadiness']),
+        'metrics': metrics,
+    }
+
+
+# ---------- Cached batch entry point ----------
+
+_indicator_cache = TTLCache(max_entries=4096, default_ttl=24 * 60 * 60)
+
+
+def get_indicators(histories: Dict[str, DailyBars]) -> Dict[str, Dict[str, Optional[float]]]:
+    """
+    Indicators per symbol, cached per (symbol, last bar date). Symbols that
+    miss the cache are computed together in one vectorized batch.
+    """
+    results = {}
+    pending: List[str] = []
+    for symbol, bars in histories.items():
+        cached = _indicator_cache.get(_cache_key(symbol, bars.last_date))
+        if cached is not None:
+            results[symbol] = cached
+        else:
+            pending.append(symbol)
+
+    if pending:
+        closes = stack_closes([histories[s].adj_close for s in pending])
+        computed = compute_indicators(closes)
+        for row, symbol in enumerate(pending):
+            metrics = {
+                name: (None if math.isnan(values[row]) else round(float(values[row]), 2))
+                for name, values in computed.items()
+            }
+            _indicator_cache.set(_cache_key(symbol, histories[symbol].last_date), metrics)
+            results[symbol] = metrics
+
+    return results
+
+
+def _cache_key(symbol: str, last_date: Optional[date]) -> tuple:
+    return (symbol.upper(), last_date)
@@ -2,11 +2,28 @@
 LLM Client - Abstraction for AI providers (Gemini/OpenAI).
 Supports pluggable providers with fallback.
 """
+import hashlib
+import re
+import threading
 import time
 from abc import ABC, abstractmethod
-from typing import Dict, Optional
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterator, List, Optional
 from django.conf import settings
 
+from .cache import TTLCache
+from .metrics import LatencyStats, get_all_latency_stats, get_latency_stats
+from .singleflight import SingleFlight, SingleFlightTimeout
+
+
+def _request_timeout() -> float:
+    """Hard timeout for one provider SDK request (seconds)."""
+    return getattr(settings, 'LLM_REQUEST_TIMEOUT', 20)
+
+
+class LLMError(Exception):
+    """A streamed generation failed; raised from generate_stream()."""
+
 
 class LLMClient(ABC):
     """Abstract base class for LLM providers."""
@@ -16,10 +33,25 @@ class LLMClient(ABC):
         """Generate response from the LLM."""
         pass
     
+    def generate_stream(self, prompt: str, max_tokens: int = 500) -> Iterator[str]:
+        """
+        Yield the response text in chunks as the provider produces them.
+        Raises LLMError on failure. Providers without streaming support
+        yield the whole response as one chunk.
+        """
+        response = self.generate(prompt, max_tokens)
+        if not response.get('success'):
+            raise LLMError(response.get('error', 'Generation failed'))
+        yield response.get('text', '')
+    
     @abstractmethod
     def get_provider_name(self) -> str:
         """Get the provider name."""
         pass
+    
+    def warm_up(self):
+        """Load the SDK and open connections ahead of the first request."""
+        pass
 
 
 class GeminiClient(LLMClient):
@@ -28,18 +60,32 @@ class GeminiClient(LLMClient):
     def __init__(self, api_key: str):
         self.api_key = api_key
         self.model = 'gemini-1.5-flash'
+        self.timeout = _request_timeout()
         self._client = None
+        self._client_lock = threading.Lock()
     
     def _get_client(self):
         if self._client is None:
-            try:
-                import google.generativeai as genai
-                genai.configure(api_key=self.api_key)
-                self._client = genai.GenerativeModel(self.model)
-            except ImportError:
-                raise ImportError("google-generativeai package not installed")
+            with self._client_lock:
+                if self._client is None:
+                    try:
+                        import google.generativeai as genai
+                        genai.configure(api_key=self.api_key)
+                        self._client = genai.GenerativeModel(self.model)
+                    except ImportError:
+                        raise ImportError("google-generativeai package not installed")
         return self._client
     
+    def warm_up(self):
+        import google.generativeai as genai
+        from google.api_core.retry import Retry
+        self._get_client()
+        # Model metadata costs no tokens but opens the connection; retries stay within the timeout
+        genai.get_model(
+            f'models/{self.model}',
+            request_options={'timeout': self.timeout, 'retry': Retry(timeout=self.timeout)},
+        )
+    
     def generate(self, prompt: str, max_tokens: int = 500) -> Dict:
         """Generate response using Gemini."""
         start_time = time.time()
@@ -51,7 +97,8 @@ class GeminiClient(LLMClient):
                 generation_config={
                     'max_output_tokens': max_tokens,
                     'temperature': 0.7,
-                }
+                },
+                request_options={'timeout': self.timeout},
             )
             
             latency = int((time.time() - start_time) * 1000)
@@ -70,6 +117,25 @@ class GeminiClient(LLMClient):
                 'provider': 'gemini',
             }
     
+    def generate_stream(self, prompt: str, max_tokens: int = 500) -> Iterator[str]:
+        """Stream response chunks from Gemini."""
+        try:
+            client = self._get_client()
+            response = client.generate_content(
+                prompt,
+                generation_config={
+                    'max_output_tokens': max_tokens,
+                    'temperature': 0.7,
+                },
+                request_options={'timeout': self.timeout},
+                stream=True,
+            )
+            for chunk in response:
+                if chunk.text:
+                    yield chunk.text
+        except Exception as e:
+            raise LLMError(str(e)) from e
+    
     def get_provider_name(self) -> str:
         return 'gemini'
 
@@ -80,17 +146,25 @@ class OpenAIClient(LLMClient):
     def __init__(self, api_key: str):
         self.api_key = api_key
         self.model = 'gpt-4o-mini'
+        self.timeout = _request_timeout()
         self._client = None
+        self._client_lock = threading.Lock()
     
     def _get_client(self):
         if self._client is None:
-            try:
-                from openai import OpenAI
-                self._client = OpenAI(api_key=self.api_key)
-            except ImportError:
-                raise ImportError("openai package not installed")
+            with self._client_lock:
+                if self._client is None:
+                    try:
+                        from openai import OpenAI
+                        self._client = OpenAI(api_key=self.api_key, timeout=self.timeout)
+                    except ImportError:
+                        raise ImportError("openai package not installed")
         return self._client
     
+    def warm_up(self):
+        # Model metadata costs no tokens but opens the pooled connection
+        self._get_client().models.retrieve(self.model)
+    
     def generate(self, prompt: str, max_tokens: int = 500) -> Dict:
         """Generate response using OpenAI."""
         start_time = time.time()
@@ -124,6 +198,27 @@ class OpenAIClient(LLMClient):
                 'provider': 'openai',
             }
     
+    def generate_stream(self, prompt: str, max_tokens: int = 500) -> Iterator[str]:
+        """Stream response chunks from OpenAI."""
+        try:
+            client = self._get_client()
+            stream = client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": "You are a helpful financial advisor for Indian investors."},
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=max_tokens,
+                temperature=0.7,
+                stream=True,
+            )
+            for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    yield delta
+        except Exception as e:
+            raise LLMError(str(e)) from e
+    
     def get_provider_name(self) -> str:
         return 'openai'
 
@@ -131,9 +226,31 @@ class OpenAIClient(LLMClient):
 class MockLLMClient(LLMClient):
     """Mock LLM client for testing without API keys."""
     
+    def __init__(self, stream_delay: Optional[float] = None):
+        self.model = 'mock-v1'
+        # Seconds between streamed chunks, to exercise time-to-first-byte offline
+        self.stream_delay = (
+            getattr(settings, 'LLM_MOCK_STREAM_DELAY', 0.05) if stream_delay is None else stream_delay
+        )
+    
     def generate(self, prompt: str, max_tokens: int = 500) -> Dict:
         """Generate mock response based on prompt type."""
-        
+        return {
+            'success': True,
+            'text': self._mock_text(prompt),
+            'provider': 'mock',
+            'model': self.model,
+            'latency_ms': 50,
+        }
+    
+    def generate_stream(self, prompt: str, max_tokens: int = 500) -> Iterator[str]:
+        """Stream the mock response a word at a time, `stream_delay` apart."""
+        for i, chunk in enumerate(re.findall(r'\S+\s*', self._mock_text(prompt))):
+            if i and self.stream_delay:
+                time.sleep(self.stream_delay)
+            yield chunk
+    
+    def _mock_text(self, prompt: str) -> str:
         # Detect prompt type and return appropriate mock response
         prompt_lower = prompt.lower()
         
@@ -178,22 +295,395 @@ class MockLLMClient(LLMClient):
                 "What would you like to know about investing?"
             )
         
-        return {
-            'success': True,
-            'text': text,
-            'provider': 'mock',
-            'model': 'mock-v1',
-            'latency_ms': 50,
-        }
+        return text
     
     def get_provider_name(self) -> str:
         return 'mock'
 
 
-def get_llm_client() -> LLMClient:
-    """Factory function to get the configured LLM client."""
-    provider = getattr(settings, 'LLM_PROVIDER', 'gemini')
+def _response_cache_config() -> Dict:
+    return {
+        'enabled': True,
+        'ttl': 60 * 60,
+        'max_entries': 512,
+        **getattr(settings, 'LLM_CACHE', {}),
+    }
+
+
+_response_cache: Optional[TTLCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> TTLCache:
+    """Get the process-wide LLM response cache, shared by every client instance."""
+    global _response_cache
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                config = _response_cache_config()
+                _response_cache = TTLCache(
+                    max_entries=config['max_entries'],
+                    default_ttl=config['ttl'],
+                )
+    return _response_cache
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Collapse whitespace so reformatted templates share a cache entry."""
+    return ' '.join(prompt.split())
+
+
+def prompt_key(client: LLMClient, prompt: str, max_tokens: int) -> tuple:
+    """Identity of a generation: provider, model, normalized prompt and max_tokens."""
+    digest = hashlib.sha256(normalize_prompt(prompt).encode('utf-8')).hexdigest()
+    return (client.get_provider_name(), getattr(client, 'model', None), digest, max_tokens)
+
+
+class CachedLLMClient(LLMClient):
+    """
+    Serves repeated prompts from the response cache.
+    
+    Market explanations, sector insights, patterns and education cards are
+    the same for every user on a given market day, so one generation can
+    serve them all. Entries are keyed by provider, model, normalized prompt
+    and max_tokens; only successful responses are cached.
+    """
+    
+    def __init__(self, client: LLMClient, cache: Optional[TTLCache] = None):
+        self.client = client
+        self.model = getattr(client, 'model', None)
+        self.cache = cache or get_response_cache()
+    
+    def generate(self, prompt: str, max_tokens: int = 500) -> Dict:
+        key = prompt_key(self, prompt, max_tokens)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return {**cached, 'cached': True}
+        
+        response = self.client.generate(prompt, max_tokens)
+        # Last-resort fallback answers are served, but not pinned for the TTL.
+        # The cache keeps its own copy so callers can't mutate the entry.
+        if response.get('success') and not response.get('fallback'):
+            self.cache.set(key, dict(response))
+        return response
+    
+    def generate_stream(self, prompt: str, max_tokens: int = 500) -> 'CachedStream':
+        """Replay a cached response in one chunk; otherwise stream and cache the result."""
+        return CachedStream(self, prompt, max_tokens)
+    
+    def _stream_cached(self, stream: 'CachedStream', prompt: str, max_tokens: int) -> Iterator[str]:
+        key = prompt_key(self, prompt, max_tokens)
+        cached = self.cache.get(key)
+        if cached is not None:
+            stream.provider = cached.get('provider')
+            yield cached.get('text', '')
+            return
+        
+        start_time = time.time()
+        chunks = []
+        source = self.client.generate_stream(prompt, max_tokens)
+        for chunk in source:
+            if stream.provider is None:
+                stream.provider = getattr(source, 'provider', None) or self.client.get_provider_name()
+                stream.fallback = getattr(source, 'fallback', False)
+            chunks.append(chunk)
+            yield chunk
+        if stream.fallback or getattr(source, 'fallback', False):
+            return
+        self.cache.set(key, {
+            'success': True,
+            'text': ''.join(chunks),
+            'provider': stream.provider or self.get_provider_name(),
+            'model': self.model,
+            'latency_ms': int((time.time() - start_time) * 1000),
+        })
+    
+    def get_provider_name(self) -> str:
+        return self.client.get_provider_name()
+    
+    def warm_up(self):
+        self.client.warm_up()
+
+
+def _coalescing_config() -> Dict:
+    return {
+        'enabled': True,
+        'timeout': 30,
+        **getattr(settings, 'LLM_COALESCING', {}),
+    }
+
+
+# Generations in flight in this process, shared by every client instance
+_in_flight = SingleFlight()
+
+
+class CoalescingLLMClient(LLMClient):
+    """
+    Shares one in-flight generation among concurrent identical calls.
+    
+    On a cold cache at market open, every dashboard load asks for the same
+    market explanation at once; only the first caller reaches the provider
+    and the rest wait for its response, success or failure. Waiters give up
+    after `timeout` seconds with an error response.
+    """
+    
+    def __init__(self, client: LLMClient, flights: Optional[SingleFlight] = None,
+                 timeout: Optional[float] = None):
+        self.client = client
+        self.model = getattr(client, 'model', None)
+        self.flights = flights or _in_flight
+        self.timeout = _coalescing_config()['timeout'] if timeout is None else timeout
+    
+    def generate(self, prompt: str, max_tokens: int = 500) -> Dict:
+        key = prompt_key(self, prompt, max_tokens)
+        try:
+            response = self.flights.do(
+                key, lambda: self.client.generate(prompt, max_tokens), timeout=self.timeout
+            )
+        except SingleFlightTimeout as e:
+            return {
+                'success': False,
+                'error': str(e),
+                'provider': self.get_provider_name(),
+            }
+        # Every caller gets its own copy of the shared response
+        return dict(response)
+    
+    def generate_stream(self, prompt: str, max_tokens: int = 500) -> Iterator[str]:
+        # Each stream has its own consumer; there is nothing to share mid-flight
+        return self.client.generate_stream(prompt, max_tokens)
+    
+    def get_provider_name(self) -> str:
+        return self.client.get_provider_name()
+    
+    def warm_up(self):
+        self.client.warm_up()
+
+
+def _llm_hedging_config() -> Dict:
+    return {
+        'enabled': True,
+        'percentile': 90,
+        'default_delay': 5.0,
+        'min_delay': 0.5,
+        'min_samples': 20,
+        'max_workers': 8,
+        **getattr(settings, 'LLM_HEDGING', {}),
+    }
+
+
+# Providers failing more often than this are tried last
+UNHEALTHY_ERROR_RATE = 0.5
+
+_llm_executor: Optional[ThreadPoolExecutor] = None
+_llm_executor_lock = threading.Lock()
+
+
+def get_llm_executor() -> ThreadPoolExecutor:
+    global _llm_executor
+    if _llm_executor is None:
+        with _llm_executor_lock:
+            if _llm_executor is None:
+                _llm_executor = ThreadPoolExecutor(
+                    max_workers=_llm_hedging_config()['max_workers'],
+                    thread_name_prefix='llm-hedge',
+                )
+    return _llm_executor
+
+
+class LLMStream:
+    """
+    Chunks streamed through a wrapping client. `provider` names the provider
+    producing them once the first chunk is out; `fallback` is set if the
+    last resort produced them.
+    """
     
+    def __init__(self, chunks: Iterator[str]):
+        self.provider: Optional[str] = None
+        self.fallback = False
+        self._chunks = chunks
+    
+    def __iter__(self):
+        return self
+    
+    def __next__(self) -> str:
+        return next(self._chunks)
+    
+    def close(self):
+        self._chunks.close()
+
+
+class CachedStream(LLMStream):
+    """Chunks streamed (or replayed from the cache) by a CachedLLMClient."""
+    
+    def __init__(self, client: CachedLLMClient, prompt: str, max_tokens: int):
+        super().__init__(client._stream_cached(self, prompt, max_tokens))
+
+
+class ChainStream(LLMStream):
+    """Chunks streamed by a FallbackLLMClient from the first provider that starts."""
+    
+    def __init__(self, client: 'FallbackLLMClient', prompt: str, max_tokens: int):
+        super().__init__(client._stream_chain(self, prompt, max_tokens))
+
+
+class FallbackLLMClient(LLMClient):
+    """
+    An ordered chain of LLM providers with hedging and a last-resort fallback.
+    
+    Providers are tried in order, with ones failing most of their recent
+    calls moved to the back. When the current provider is slower than its
+    own rolling p90, a hedged request goes to the next one and the first
+    successful response wins; the loser finishes in the background and is
+    ignored. Fast calls never hedge, so they cost a single generation. The
+    fallback (the mock) only answers when every provider failed, and its
+    responses are marked `fallback` so they aren't cached.
+    """
+    
+    def __init__(self, clients: List[LLMClient], fallback: Optional[LLMClient] = None):
+        self.clients = clients
+        self.fallback = fallback
+        self.model = None
+        self.config = _llm_hedging_config()
+    
+    def stats_for(self, client: LLMClient) -> LatencyStats:
+        return get_latency_stats(f'llm:{client.get_provider_name()}')
+    
+    def ranked(self) -> List[LLMClient]:
+        """Healthy providers first, in configured order."""
+        healthy, degraded = [], []
+        for client in self.clients:
+            stats = self.stats_for(client)
+            if stats.error_rate > UNHEALTHY_ERROR_RATE and stats.calls >= self.config['min_samples']:
+                degraded.append(client)
+            else:
+                healthy.append(client)
+        return healthy + degraded
+    
+    def hedge_delay(self, client: LLMClient) -> float:
+        """How long to wait on `client` before racing the next provider."""
+        stats = self.stats_for(client)
+        if stats.samples < self.config['min_samples']:
+            return self.config['default_delay']
+        return max(self.config['min_delay'], stats.percentile(self.config['percentile']))
+    
+    def generate(self, prompt: str, max_tokens: int = 500) -> Dict:
+        candidates = self.ranked()
+        if len(candidates) > 1 and self.config['enabled']:
+            response = self._hedged(candidates, prompt, max_tokens)
+        else:
+            response = None
+            for client in candidates:
+                response = self._timed(client, prompt, max_tokens)
+                if response.get('success'):
+                    self.stats_for(client).record_win()
+                    break
+        
+        if (response is None or not response.get('success')) and self.fallback is not None:
+            print(f"[LLM] All providers failed, using {self.fallback.get_provider_name()}: "
+                  f"{response.get('error') if response else 'no providers'}")
+            response = {**self.fallback.generate(prompt, max_tokens), 'fallback': True}
+        return response or {'success': False, 'error': 'No LLM providers configured', 'provider': 'none'}
+    
+    def _hedged(self, candidates: List[LLMClient], prompt: str, max_tokens: int) -> Optional[Dict]:
+        executor = get_llm_executor()
+        pending = {}
+        remaining = list(candidates)
+        last_failure = None
+        
+        def launch():
+            client = remaining.pop(0)
+            future = executor.submit(self._timed, client, prompt, max_tokens)
+            pending[future] = client
+            return client
+        
+        current = launch()
+        hedged = False
+        while pending:
+            timeout = self.hedge_delay(current) if remaining else None
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                # Slower than this provider's p90: race the next one
+                current = launch()
+                hedged = True
+                continue
+            
+            for future in done:
+                client = pending.pop(future)
+                response = future.result()
+                if response.get('success'):
+                    self.stats_for(client).record_win(hedged=hedged and client is not candidates[0])
+                    return {**response, 'hedged': hedged}
+                last_failure = response
+            
+            if not pending and remaining:
+                current = launch()
+        
+        return last_failure
+    
+    def _timed(self, client: LLMClient, prompt: str, max_tokens: int) -> Dict:
+        start = time.monotonic()
+        try:
+            response = client.generate(prompt, max_tokens)
+        except Exception as e:
+            response = {'success': False, 'error': str(e), 'provider': client.get_provider_name()}
+        self.stats_for(client).record(time.monotonic() - start, bool(response.get('success')))
+        return response
+    
+    def generate_stream(self, prompt: str, max_tokens: int = 500) -> ChainStream:
+        """
+        Stream from the first provider that starts producing output. Streams
+        aren't hedged (two streams can't be merged); a provider that fails
+        before its first chunk hands over to the next, one that fails
+        mid-stream raises LLMError.
+        """
+        return ChainStream(self, prompt, max_tokens)
+    
+    def _stream_chain(self, stream: ChainStream, prompt: str, max_tokens: int) -> Iterator[str]:
+        error = None
+        for client in self.ranked():
+            start = time.monotonic()
+            chunks = client.generate_stream(prompt, max_tokens)
+            try:
+                first = next(chunks, None)
+            except LLMError as e:
+                self.stats_for(client).record(time.monotonic() - start, False)
+                error = e
+                continue
+            # Time to first chunk is what users wait on
+            self.stats_for(client).record(time.monotonic() - start, True)
+            self.stats_for(client).record_win()
+            stream.provider = client.get_provider_name()
+            if first is not None:
+                yield first
+            yield from chunks
+            return
+        
+        if self.fallback is None:
+            raise error or LLMError('No LLM providers configured')
+        print(f"[LLM] All providers failed to stream, using {self.fallback.get_provider_name()}: {error}")
+        stream.fallback = True
+        stream.provider = self.fallback.get_provider_name()
+        yield from self.fallback.generate_stream(prompt, max_tokens)
+    
+    def get_provider_name(self) -> str:
+        return '+'.join(client.get_provider_name() for client in self.clients)
+    
+    def warm_up(self):
+        """Warm every provider; one that can't be reached doesn't stop the others."""
+        for client in self.clients:
+            start = time.monotonic()
+            try:
+                client.warm_up()
+            except Exception as e:
+                print(f"[LLM] Warm-up of {client.get_provider_name()} failed: {e}")
+                continue
+            print(f"[LLM] Warmed up {client.get_provider_name()} in "
+                  f"{int((time.monotonic() - start) * 1000)} ms")
+
+
+def _build_client(provider: str) -> Optional[LLMClient]:
+    """A client for one configured provider, or None without an API key."""
     if provider == 'gemini':
         api_key = getattr(settings, 'GEMINI_API_KEY', '')
         if api_key:
@@ -202,6 +692,113 @@ def get_llm_client() -> LLMClient:
         api_key = getattr(settings, 'OPENAI_API_KEY', '')
         if api_key:
             return OpenAIClient(api_key)
+    return None
+
+
+def build_llm_client() -> LLMClient:
+    """Build the configured client stack: provider chain, coalescing, response cache."""
+    provider = getattr(settings, 'LLM_PROVIDER', 'gemini')
+    chain = getattr(settings, 'LLM_PROVIDERS', None) or [provider, 'gemini', 'openai']
+    
+    clients = [c for c in map(_build_client, dict.fromkeys(chain)) if c is not None]
     
     # Fallback to mock client
-    return MockLLMClient()
+    if clients:
+        client = FallbackLLMClient(clients, fallback=MockLLMClient())
+    else:
+        client = MockLLMClient()
+    
+    if _coalescing_config()['enabled']:
+        client = CoalescingLLMClient(client)
+    if _response_cache_config()['enabled']:
+        client = CachedLLMClient(client)
+    return client
+
+
+# Settings the client stack is built from; a change triggers a rebuild
+LLM_SETTINGS = (
+    'LLM_PROVIDER', 'LLM_PROVIDERS', 'GEMINI_API_KEY', 'OPENAI_API_KEY', 'LLM_REQUEST_TIMEOUT',
+    'LLM_HEDGING', 'LLM_COALESCING', 'LLM_CACHE', 'LLM_MOCK_STREAM_DELAY',
+)
+
+
+class LLMClientRegistry:
+    """
+    Process-wide home of the LLM client stack.
+    
+    Provider clients hold an imported SDK, its global configuration and an
+    HTTP connection pool, so they are built once per worker and shared by
+    every request. The stack is rebuilt only when one of LLM_SETTINGS
+    changes.
+    """
+    
+    def __init__(self):
+        self._client: Optional[LLMClient] = None
+        self._fingerprint: Optional[str] = None
+        self._lock = threading.Lock()
+        self.builds = 0
+    
+    def _current_fingerprint(self) -> str:
+        values = repr(tuple(getattr(settings, name, None) for name in LLM_SETTINGS))
+        # Hashed so API keys aren't kept around in another readable form
+        return hashlib.sha256(values.encode('utf-8')).hexdigest()
+    
+    def get(self) -> LLMClient:
+        fingerprint = self._current_fingerprint()
+        client = self._client
+        if client is None or fingerprint != self._fingerprint:
+            with self._lock:
+                if self._client is None or fingerprint != self._fingerprint:
+                    self._client = build_llm_client()
+                    self._fingerprint = fingerprint
+                    self.builds += 1
+                client = self._client
+        return client
+    
+    def warm_up(self):
+        """Build the stack and warm its providers (SDK import, client setup, connection)."""
+        self.get().warm_up()
+    
+    def stats(self) -> Dict:
+        return {'builds': self.builds}
+
+
+_registry = LLMClientRegistry()
+
+
+def get_llm_client() -> LLMClient:
+    """Get the configured LLM client, shared by every request in this process."""
+    return _registry.get()
+
+
+def warm_up_llm_clients(background: bool = True):
+    """
+    Warm the LLM clients at worker boot so the first user request doesn't
+    pay SDK import and connection setup. Runs on a daemon thread by default
+    so a slow provider doesn't hold up startup.
+    """
+    if not background:
+        _registry.warm_up()
+        return
+    
+    def run():
+        try:
+            _registry.warm_up()
+        except Exception as e:
+            print(f"[LLM] Warm-up failed: {e}")
+    
+    threading.Thread(target=run, name='llm-warm-up', daemon=True).start()
+
+
+def get_llm_stats() -> Dict:
+    """LLM provider latency, response cache, coalescing and gate counters for monitoring."""
+    from .llm_gate import get_gate_stats
+    
+    return {
+        'provider': get_llm_client().get_provider_name(),
+        'cache': get_response_cache().stats(),
+        'coalescing': _in_flight.stats(),
+        'latency': get_all_latency_stats('llm:'),
+        'gate': get_gate_stats(),
+        'registry': _registry.stats(),
+    }
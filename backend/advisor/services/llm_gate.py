@@ -0,0 +1,171 @@
+"""
+LLM Gate - Admission control and deadlines for LLM calls from request threads.
+
+The API runs on threaded WSGI workers, so every request waiting on a slow
+provider call holds one of the worker's threads. A burst of explain
+requests must not take all of them. One gate per process caps generations
+in flight (max_in_flight) and how many callers may wait for a slot
+(max_queue). Keep the two together below the worker's thread count.
+Callers beyond the queue, or whose deadline passes while queued or
+generating, get a degraded response straight away instead of waiting.
+
+Generations run on a small dedicated pool, so the full sync client stack
+(response cache, coalescing, provider chain) applies unchanged, and a
+caller can stop waiting at its deadline. A slot is only released when the
+provider call really finishes, so calls that timed out for their caller
+still count against the cap.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Dict, Optional
+
+from django.conf import settings
+
+from .llm_client import LLMClient, get_llm_client
+
+
+def _gate_config() -> Dict:
+    return {
+        'max_in_flight': 4,
+        'max_queue': 2,
+        'timeout': 15,
+        **getattr(settings, 'LLM_CONCURRENCY', {}),
+    }
+
+
+_gate_executor: Optional[ThreadPoolExecutor] = None
+_gate_executor_lock = threading.Lock()
+
+
+def get_gate_executor() -> ThreadPoolExecutor:
+    global _gate_executor
+    if _gate_executor is None:
+        with _gate_executor_lock:
+            if _gate_executor is None:
+                _gate_executor = ThreadPoolExecutor(
+                    max_workers=_gate_config()['max_in_flight'],
+                    thread_name_prefix='llm-gated',
+                )
+    return _gate_executor
+
+
+class LLMGate:
+    """Process-wide concurrency cap and bounded wait queue for LLM generations."""
+
+    def __init__(self, max_in_flight: int, max_queue: int):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self._cond = threading.Condition()
+        self.in_flight = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.timeouts = 0
+
+    def acquire(self, timeout: float) -> Optional[str]:
+        """
+        Take a slot, waiting at most `timeout` seconds. Returns None once
+        admitted, or why the caller was turned away ('busy' or 'timeout').
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            if self.in_flight + self.waiting >= self.max_in_flight + self.max_queue:
+                self.rejected += 1
+                return 'busy'
+            self.admitted += 1
+            self.waiting += 1
+            try:
+                while self.in_flight >= self.max_in_flight:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.timeouts += 1
+                        return 'timeout'
+                    self._cond.wait(remaining)
+            finally:
+                self.waiting -= 1
+            self.in_flight += 1
+            return None
+
+    def release(self, *_):
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify()
+
+    def record_timeout(self):
+        with self._cond:
+            self.timeouts += 1
+
+    def stats(self) -> Dict:
+        with self._cond:
+            return {
+                'in_flight': self.in_flight,
+                'waiting': self.waiting,
+                'admitted': self.admitted,
+                'rejected': self.rejected,
+                'timeouts': self.timeouts,
+            }
+
+
+_gate: Optional[LLMGate] = None
+_gate_lock = threading.Lock()
+
+
+def get_llm_gate() -> LLMGate:
+    """Get the process-wide gate."""
+    global _gate
+    if _gate is None:
+        with _gate_lock:
+            if _gate is None:
+                config = _gate_config()
+                _gate = LLMGate(config['max_in_flight'], config['max_queue'])
+    return _gate
+
+
+def get_gate_stats() -> Dict:
+    """Gate counters and limits for monitoring."""
+    config = _gate_config()
+    return {**get_llm_gate().stats(), 'max_in_flight': config['max_in_flight'],
+            'max_queue': config['max_queue']}
+
+
+class GatedLLMClient:
+    """
+    generate() with a per-call deadline, behind the process-wide gate.
+    Never raises for overload or timeouts: those come back as degraded
+    responses (`success: False, degraded: True`) the caller can render.
+    """
+
+    def __init__(self, client: Optional[LLMClient] = None, timeout: Optional[float] = None):
+        self.client = client or get_llm_client()
+        self.timeout = _gate_config()['timeout'] if timeout is None else timeout
+
+    def generate(self, prompt: str, max_tokens: int = 500, timeout: Optional[float] = None) -> Dict:
+        gate = get_llm_gate()
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+
+        refused = gate.acquire(max(0.0, deadline - time.monotonic()))
+        if refused == 'busy':
+            return self._degraded('LLM is busy, try again shortly.')
+        if refused == 'timeout':
+            return self._degraded('Timed out waiting for an LLM slot.')
+
+        call = get_gate_executor().submit(self.client.generate, prompt, max_tokens)
+        # The slot frees when the provider call ends, even if we stop waiting for it
+        call.add_done_callback(gate.release)
+        try:
+            return call.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FutureTimeout:
+            gate.record_timeout()
+            return self._degraded('LLM response timed out.')
+
+    def _degraded(self, error: str) -> Dict:
+        return {
+            'success': False,
+            'error': error,
+            'provider': self.client.get_provider_name(),
+            'degraded': True,
+        }
+
+    def get_provider_name(self) -> str:
+        return self.client.get_provider_name()
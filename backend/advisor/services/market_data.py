@@ -1,86 +1,506 @@
 """
 Market Data Service - Abstraction for market data providers.
-Supports Alpha Vantage with fallback to mock data.
+Supports Alpha Vantage and the local history store, routed by health and
+latency, with fallback to mock data.
 """
+import heapq
 import requests
-import random
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time, timedelta
+from typing import Callable, Dict, Hashable, List, Optional, Union
+from zoneinfo import ZoneInfo
+
+import numpy as np
 from django.conf import settings
 
+from .cache import TTLCache
+from .circuit_breaker import CircuitOpenError, get_breaker_stats, get_circuit_breaker
+from .market_risk import get_risk_tracker
+from .metrics import get_all_latency_stats
+from .provider_router import ProviderRouter, failed_lookups
+from .request_scheduler import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, SchedulerTimeout, get_scheduler
+from .tick_simulator import IntradayTickSimulator
+from .timeseries_store import get_timeseries_store
+from .universe_index import UniverseIndex
+
+
+# NSE regular session (IST, Monday-Friday)
+NSE_TIMEZONE = ZoneInfo('Asia/Kolkata')
+NSE_OPEN_TIME = time(9, 15)
+NSE_CLOSE_TIME = time(15, 30)
+
+
+def is_market_open(now: Optional[datetime] = None) -> bool:
+    """Whether the NSE regular session is currently trading."""
+    now = (now or datetime.now(NSE_TIMEZONE)).astimezone(NSE_TIMEZONE)
+    if now.weekday() >= 5:
+        return False
+    return NSE_OPEN_TIME <= now.time() < NSE_CLOSE_TIME
+
+
+def seconds_until_market_open(now: Optional[datetime] = None) -> float:
+    """Seconds until the next NSE session opens (0 while it is open)."""
+    now = (now or datetime.now(NSE_TIMEZONE)).astimezone(NSE_TIMEZONE)
+    if is_market_open(now):
+        return 0
+
+    next_open = datetime.combine(now.date(), NSE_OPEN_TIME, tzinfo=NSE_TIMEZONE)
+    if now >= next_open:
+        next_open += timedelta(days=1)
+    while next_open.weekday() >= 5:
+        next_open += timedelta(days=1)
+
+    return (next_open - now).total_seconds()
+
+
+def last_session_date(now: Optional[datetime] = None) -> date:
+    """Date of the most recent NSE session whose daily bar is complete."""
+    now = (now or datetime.now(NSE_TIMEZONE)).astimezone(NSE_TIMEZONE)
+    day = now.date()
+    if now.weekday() >= 5 or now.time() < NSE_CLOSE_TIME:
+        day -= timedelta(days=1)
+    while day.weekday() >= 5:
+        day -= timedelta(days=1)
+    return day
+
+
+def _index_session_date(now: Optional[datetime] = None) -> date:
+    """Session an index level seen right now belongs to (pre-open shows the last close)."""
+    now = (now or datetime.now(NSE_TIMEZONE)).astimezone(NSE_TIMEZONE)
+    if now.weekday() < 5 and now.time() >= NSE_OPEN_TIME:
+        return now.date()
+    return last_session_date(now)
+
+
+class MarketDataCache:
+    """
+    Process-wide memoization for market data lookups.
+
+    Entries live for `open_ttl` seconds while NSE is trading and for up to
+    `closed_ttl` seconds after the close, but never past the next open so
+    the first quotes of a session are always fresh. Results served from the
+    mock fallback, or dated before the current session, only live for
+    `fallback_ttl`, so live data replaces them as soon as it is available.
+    """
+
+    DEFAULTS = {
+        'open_ttl': 60,
+        'closed_ttl': 6 * 60 * 60,
+        'fallback_ttl': 30,
+        'max_entries': 1024,
+    }
+
+    def __init__(self, config: Optional[Dict] = None):
+        self.config = {**self.DEFAULTS, **(config or {})}
+        self._cache = TTLCache(max_entries=self.config['max_entries'])
+
+    def current_ttl(self, now: Optional[datetime] = None) -> float:
+        """TTL to apply to an entry stored right now."""
+        if is_market_open(now):
+            return self.config['open_ttl']
+
+        until_open = seconds_until_market_open(now)
+        return max(self.config['open_ttl'], min(self.config['closed_ttl'], until_open))
+
+    def ttl_for(self, value) -> float:
+        """TTL for storing `value` right now; fallback or stale data gets the short one."""
+        ttl = self.current_ttl()
+        if _is_fallback(value) or _is_stale(value):
+            return min(ttl, self.config['fallback_ttl'])
+        return ttl
+
+    def lookup(self, key: Hashable):
+        """Return the cached value for `key`, or None on a miss."""
+        return self._cache.get(key)
+    
+    def store(self, key: Hashable, value):
+        if _is_cacheable(value):
+            self._cache.set(key, value, ttl=self.ttl_for(value))
+
+    def get_or_fetch(self, key: Hashable, fetch: Callable):
+        """Return the cached value for `key`, fetching and storing on a miss."""
+        value = self._cache.get(key)
+        if value is None:
+            value = fetch()
+            self.store(key, value)
+        return value
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self) -> Dict:
+        return {**self._cache.stats(), 'ttl_seconds': self.current_ttl()}
+
+
+def _is_cacheable(result) -> bool:
+    """Don't memoize errors or empty provider responses."""
+    if not result:
+        return False
+    if isinstance(result, dict) and 'error' in result:
+        return False
+    return True
+
+
+def _is_fallback(result) -> bool:
+    """Whether `result`, or a record inside a composite like the summary, is mock fallback data."""
+    if isinstance(result, MarketRecord):
+        return bool(result.get('fallback'))
+    if isinstance(result, dict):
+        return any(_is_fallback(value) for value in result.values())
+    if isinstance(result, list):
+        return any(_is_fallback(value) for value in result)
+    return False
+
+
+def _is_stale(result) -> bool:
+    """Whether `result` is a record from before the current session (e.g. a store quote)."""
+    if not isinstance(result, MarketRecord):
+        return False
+    as_of = result.get('as_of')
+    return bool(as_of) and as_of < _index_session_date().isoformat()
+
+
+_market_cache: Optional[MarketDataCache] = None
+
+
+def get_market_cache() -> MarketDataCache:
+    """Get the process-wide market data cache."""
+    global _market_cache
+    if _market_cache is None:
+        _market_cache = MarketDataCache(getattr(settings, 'MARKET_DATA_CACHE', None))
+    return _market_cache
+
+
+# Shared HTTP session and worker pool for provider calls
+DEFAULT_MAX_WORKERS = 8
+
+_http_session: Optional[requests.Session] = None
+_quote_executor: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _max_workers() -> int:
+    return getattr(settings, 'MARKET_DATA_MAX_WORKERS', DEFAULT_MAX_WORKERS)
+
+
+def get_http_session() -> requests.Session:
+    """Get the process-wide keep-alive session used for provider calls."""
+    global _http_session
+    if _http_session is None:
+        with _pool_lock:
+            if _http_session is None:
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=4,
+                    pool_maxsize=_max_workers(),
+                )
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _http_session = session
+    return _http_session
+
+
+def get_quote_executor() -> ThreadPoolExecutor:
+    """Get the bounded thread pool used to fan out bulk quote requests."""
+    global _quote_executor
+    if _quote_executor is None:
+        with _pool_lock:
+            if _quote_executor is None:
+                _quote_executor = ThreadPoolExecutor(
+                    max_workers=_max_workers(),
+                    thread_name_prefix='market-quotes',
+                )
+    return _quote_executor
+
+
+class MarketRecord:
+    """
+    Base for compact market data records.
+    
+    Fields live in __slots__ rather than a per-instance dict, and no
+    timestamp is stored per record: the summary or response that carries
+    them has one. Read access also works dict-style (`quote['price']`,
+    `quote.get('name')`) so callers can treat records and error dicts
+    alike. Plain dicts are only built at the response boundary.
+    """
+    
+    __slots__ = ()
+    
+    def get(self, key: str, default=None):
+        value = getattr(self, key) if key in self.__slots__ else None
+        return default if value is None else value
+    
+    def __getitem__(self, key: str):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+    
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+    
+    def __eq__(self, other) -> bool:
+        return type(self) is type(other) and all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__
+        )
+    
+    __hash__ = None
+    
+    def to_dict(self) -> Dict:
+        """JSON-ready dict of the fields that are set."""
+        return {
+            name: getattr(self, name) for name in self.__slots__
+            if getattr(self, name) is not None
+        }
+    
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self.to_dict()})'
+
+
+class Quote(MarketRecord):
+    """One stock quote. `as_of` is only set when the data is older than the response."""
+    
+    __slots__ = ('symbol', 'name', 'sector', 'price', 'change', 'change_percent',
+                 'previous_close', 'volume', 'reason', 'source', 'as_of', 'fallback')
+    
+    def __init__(self, symbol: str, price: float, change: float, change_percent: float,
+                 previous_close: float, volume: int, source: str, name: Optional[str] = None,
+                 sector: Optional[str] = None, reason: Optional[str] = None,
+                 as_of: Optional[str] = None):
+        self.symbol = symbol
+        self.name = name
+        self.sector = sector
+        self.price = price
+        self.change = change
+        self.change_percent = change_percent
+        self.previous_close = previous_close
+        self.volume = volume
+        self.reason = reason
+        self.source = source
+        self.as_of = as_of
+        self.fallback = None
+
+
+class IndexSnapshot(MarketRecord):
+    """Level and daily move of a market index."""
+    
+    __slots__ = ('symbol', 'name', 'value', 'change', 'change_percent',
+                 'previous_close', 'source', 'as_of', 'fallback')
+    
+    def __init__(self, symbol: str, name: str, value: float, change: float,
+                 change_percent: float, previous_close: float, source: str,
+                 as_of: Optional[str] = None):
+        self.symbol = symbol
+        self.name = name
+        self.value = value
+        self.change = change
+        self.change_percent = change_percent
+        self.previous_close = previous_close
+        self.source = source
+        self.as_of = as_of
+        self.fallback = None
+
+
+class SectorEntry(MarketRecord):
+    """One sector's daily move, with the mock's weather metaphor when available."""
+    
+    __slots__ = ('name', 'change_percent', 'weather', 'outlook', 'stocks', 'source', 'fallback')
+    
+    def __init__(self, name: str, change_percent: float, source: str,
+                 weather: Optional[str] = None, outlook: Optional[str] = None,
+                 stocks: Optional[int] = None):
+        self.name = name
+        self.change_percent = change_percent
+        self.weather = weather
+        self.outlook = outlook
+        self.stocks = stocks
+        self.source = source
+        self.fallback = None
+
+
+def index_from_quote(quote: Optional[Quote]) -> Optional[IndexSnapshot]:
+    """Index record for providers that quote an index like a stock."""
+    if quote is None:
+        return None
+    return IndexSnapshot(
+        symbol=quote.symbol,
+        name=quote.symbol,
+        value=quote.price,
+        change=quote.change,
+        change_percent=quote.change_percent,
+        previous_close=quote.previous_close,
+        source=quote.source,
+        as_of=quote.as_of
+    )
+
+
+def to_json_ready(value):
+    """Replace market records, at any depth, with plain dicts for serialization."""
+    if isinstance(value, MarketRecord):
+        return value.to_dict()
+    if isinstance(value, dict):
+        return {key: to_json_ready(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_json_ready(item) for item in value]
+    return value
+
+
+def select_top_movers(quotes: List[Quote], count: int = 5) -> Dict[str, List[Quote]]:
+    """
+    Pick the top `count` gainers and losers by change_percent.
+    Uses bounded heaps, so cost is O(n log count) rather than a full sort.
+    """
+    key = lambda quote: quote.change_percent
+    return {
+        'gainers': heapq.nlargest(count, quotes, key=key),
+        'losers': heapq.nsmallest(count, quotes, key=key),
+    }
+
 
 class MarketDataProvider:
     """Base class for market data providers."""
     
-    def get_index_data(self, symbol: str) -> Dict:
+    name = 'provider'
+    
+    def get_index_data(self, symbol: str) -> Optional[IndexSnapshot]:
         raise NotImplementedError
     
-    def get_stock_quote(self, symbol: str) -> Dict:
+    def get_stock_quote(self, symbol: str) -> Optional[Quote]:
         raise NotImplementedError
     
-    def get_sector_performance(self) -> List[Dict]:
+    def get_stock_quotes(self, symbols: List[str]) -> List[Optional[Quote]]:
+        """
+        Get quotes for many symbols.
+        Returns one entry per symbol in input order; None marks a failure.
+        """
+        return [self.get_stock_quote(symbol) for symbol in symbols]
+    
+    def get_sector_performance(self) -> List[SectorEntry]:
         raise NotImplementedError
+    
+    def supports(self, method: str) -> bool:
+        """Whether this provider implements `method` rather than inheriting the stub."""
+        return getattr(type(self), method, None) is not getattr(MarketDataProvider, method, None)
 
 
 class AlphaVantageProvider(MarketDataProvider):
     """Alpha Vantage API provider for real market data."""
     
+    name = 'alpha_vantage'
     BASE_URL = "https://www.alphavantage.co/query"
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, priority: int = PRIORITY_INTERACTIVE,
+                 max_wait: Optional[float] = None):
         self.api_key = api_key
+        self.priority = priority
+        self.session = get_http_session()
+        self.scheduler = get_scheduler(self.name)
+        self.breaker = get_circuit_breaker(self.name)
+        # Background jobs may queue far longer than interactive requests
+        self.max_wait = max_wait or getattr(settings, 'ALPHA_VANTAGE_RATE_LIMIT', {}).get('max_wait', 20)
     
-    def get_stock_quote(self, symbol: str) -> Dict:
+    def query(self, params: Dict, timeout: float = 10) -> Dict:
+        """
+        Run an Alpha Vantage query through the shared rate-limit scheduler
+        and circuit breaker. Identical queued queries share one upstream call.
+        Raises requests.RequestException, SchedulerTimeout or CircuitOpenError.
+        """
+        if not self.breaker.allow_request():
+            raise CircuitOpenError(f'{self.name} circuit is open')
+        
+        key = (self.name,) + tuple(sorted(params.items()))
+        
+        def fetch():
+            # The breaker may have opened while this call waited for a token
+            if self.breaker.is_open:
+                raise CircuitOpenError(f'{self.name} circuit is open')
+            response = self.session.get(
+                self.BASE_URL,
+                params={**params, 'apikey': self.api_key},
+                timeout=timeout
+            )
+            response.raise_for_status()
+            data = response.json()
+            
+            # Quota exhausted: hold back further calls until the bucket refills
+            if 'Note' in data or 'Information' in data:
+                self.scheduler.report_throttled()
+            return data
+        
+        try:
+            data = self.scheduler.call(key, fetch, priority=self.priority, timeout=self.max_wait)
+        except (SchedulerTimeout, CircuitOpenError):
+            # Never reached the provider; says nothing about its health
+            self.breaker.release()
+            raise
+        except Exception:
+            self._record_failure()
+            raise
+        
+        if 'Note' in data or 'Information' in data:
+            self._record_failure()
+        else:
+            self.breaker.record_success()
+        return data
+    
+    def _record_failure(self):
+        self.breaker.record_failure()
+        if self.breaker.is_open:
+            # Queued calls would only wait out their deadline; fall back now
+            self.scheduler.fail_queued(CircuitOpenError(f'{self.name} circuit is open'))
+    
+    def get_stock_quote(self, symbol: str) -> Optional[Quote]:
         """Get real-time quote for a stock."""
         try:
-            params = {
+            data = self.query({
                 'function': 'GLOBAL_QUOTE',
                 'symbol': symbol,
-                'apikey': self.api_key
-            }
-            response = requests.get(self.BASE_URL, params=params, timeout=10)
-            data = response.json()
+            })
             
             if 'Global Quote' in data and data['Global Quote']:
                 quote = data['Global Quote']
-                return {
-                    'symbol': symbol,
-                    'price': float(quote.get('05. price', 0)),
-                    'change': float(quote.get('09. change', 0)),
-                    'change_percent': float(quote.get('10. change percent', '0%').replace('%', '')),
-                    'previous_close': float(quote.get('08. previous close', 0)),
-                    'volume': int(quote.get('06. volume', 0)),
-                    'timestamp': datetime.now().isoformat(),
-                    'source': 'alpha_vantage'
-                }
+                return Quote(
+                    symbol=symbol,
+                    price=float(quote.get('05. price', 0)),
+                    change=float(quote.get('09. change', 0)),
+                    change_percent=float(quote.get('10. change percent', '0%').replace('%', '')),
+                    previous_close=float(quote.get('08. previous close', 0)),
+                    volume=int(quote.get('06. volume', 0)),
+                    source='alpha_vantage'
+                )
             return None
         except Exception as e:
             print(f"Alpha Vantage error for {symbol}: {e}")
             return None
     
-    def get_index_data(self, symbol: str) -> Dict:
+    def get_stock_quotes(self, symbols: List[str]) -> List[Optional[Quote]]:
+        """Fetch quotes concurrently over the shared keep-alive session."""
+        if len(symbols) <= 1:
+            return [self.get_stock_quote(symbol) for symbol in symbols]
+        
+        executor = get_quote_executor()
+        return list(executor.map(self.get_stock_quote, symbols))
+    
+    def get_index_data(self, symbol: str) -> Optional[IndexSnapshot]:
         """Get index data (uses same endpoint as stock quote)."""
-        return self.get_stock_quote(symbol)
+        return index_from_quote(self.get_stock_quote(symbol))
     
-    def get_sector_performance(self) -> List[Dict]:
+    def get_sector_performance(self) -> List[SectorEntry]:
         """Get sector performance data."""
         try:
-            params = {
-                'function': 'SECTOR',
-                'apikey': self.api_key
-            }
-            response = requests.get(self.BASE_URL, params=params, timeout=10)
-            data = response.json()
+            data = self.query({'function': 'SECTOR'})
             
             if 'Rank A: Real-Time Performance' in data:
                 performance = data['Rank A: Real-Time Performance']
                 sectors = []
                 for sector_name, change_str in performance.items():
-                    sectors.append({
-                        'name': sector_name,
-                        'change_percent': float(change_str.replace('%', '')),
-                        'source': 'alpha_vantage'
-                    })
+                    sectors.append(SectorEntry(
+                        name=sector_name,
+                        change_percent=float(change_str.replace('%', '')),
+                        source='alpha_vantage'
+                    ))
                 return sectors
             return []
         except Exception as e:
@@ -88,9 +508,51 @@ class AlphaVantageProvider(MarketDataProvider):
             return []
 
 
+class StoreMarketDataProvider(MarketDataProvider):
+    """
+    Quotes from the local daily history store: the latest close against the
+    one before it. Instant and never rate limited, but only as fresh as the
+    last stored session, so it ranks behind live sources.
+    """
+
+    name = 'store'
+
+    def __init__(self, store=None):
+        self.store = store or get_timeseries_store()
+
+    @property
+    def hedgeable(self) -> bool:
+        """Not worth racing a live provider while the market trades: the store lags a session."""
+        return not is_market_open()
+
+    def get_stock_quote(self, symbol: str) -> Optional[Quote]:
+        bars = self.store.read(symbol).tail(2)
+        if len(bars) < 2:
+            return None
+
+        price = float(bars.close[-1])
+        previous_close = float(bars.close[-2])
+        change = price - previous_close
+        return Quote(
+            symbol=symbol,
+            price=round(price, 2),
+            change=round(change, 2),
+            change_percent=round(change / previous_close * 100, 2) if previous_close else 0,
+            previous_close=round(previous_close, 2),
+            volume=int(bars.volume[-1]),
+            source='store',
+            as_of=bars.last_date.isoformat()
+        )
+
+    def get_index_data(self, symbol: str) -> Optional[IndexSnapshot]:
+        return index_from_quote(self.get_stock_quote(symbol))
+
+
 class MockMarketDataProvider(MarketDataProvider):
     """Mock provider for demo/testing with realistic Indian market data."""
     
+    name = 'mock'
+    
     # Indian market stocks and sectors
     INDIAN_STOCKS = {
         'INFY.NS': {'name': 'Infosys', 'sector': 'IT Services', 'base_price': 1650},
@@ -103,6 +565,12 @@ class MockMarketDataProvider(MarketDataProvider):
         'WIPRO.NS': {'name': 'Wipro', 'sector': 'IT Services', 'base_price': 480},
         'SBIN.NS': {'name': 'SBI', 'sector': 'Banking', 'base_price': 620},
         'BHARTIARTL.NS': {'name': 'Bharti Airtel', 'sector': 'Telecom', 'base_price': 1200},
+        'SUNPHARMA.NS': {'name': 'Sun Pharma', 'sector': 'Pharma', 'base_price': 1500},
+        'DRREDDY.NS': {'name': "Dr. Reddy's", 'sector': 'Pharma', 'base_price': 6000},
+        'TATAMOTORS.NS': {'name': 'Tata Motors', 'sector': 'Auto', 'base_price': 950},
+        'MARUTI.NS': {'name': 'Maruti Suzuki', 'sector': 'Auto', 'base_price': 11500},
+        'TATASTEEL.NS': {'name': 'Tata Steel', 'sector': 'Metal', 'base_price': 150},
+        'HINDALCO.NS': {'name': 'Hindalco', 'sector': 'Metal', 'base_price': 620},
     }
     
     INDIAN_SECTORS = {
@@ -143,212 +611,502 @@ class MockMarketDataProvider(MarketDataProvider):
         ]
     }
     
-    def __init__(self):
+    WEATHER_MAP = {
+        'high_positive': ('Sunny', 'Strong momentum'),
+        'positive': ('Partly Cloudy', 'Positive outlook'),
+        'neutral': ('Cloudy', 'Stable conditions'),
+        'negative': ('Light Rain', 'Under pressure'),
+        'high_negative': ('Stormy', 'Significant headwinds'),
+    }
+    
+    INDEX_BASE_VALUE = 22500
+    
+    # One generated universe per (date seed, size), shared by all instances
+    _universes: Dict[tuple, 'MockUniverse'] = {}
+    _universes_lock = threading.Lock()
+    
+    _simulators: Dict[tuple, IntradayTickSimulator] = {}
+    
+    def __init__(self, universe_size: Optional[int] = None):
         # Generate consistent daily seed based on date
-        self.daily_seed = int(datetime.now().strftime('%Y%m%d'))
-        random.seed(self.daily_seed)
-        self._generate_daily_data()
-    
-    def _generate_daily_data(self):
-        """Generate mock data that stays consistent for the day."""
-        self.stock_changes = {}
-        for symbol, info in self.INDIAN_STOCKS.items():
-            sector = info['sector']
-            sector_base = self.INDIAN_SECTORS.get(sector, {}).get('base_change', 0)
-            volatility = self.INDIAN_SECTORS.get(sector, {}).get('volatility', 1)
-            
-            # Stock change = sector base + random individual component
-            change = sector_base + random.uniform(-volatility, volatility)
-            self.stock_changes[symbol] = round(change, 2)
-        
-        self.sector_changes = {}
-        for sector, info in self.INDIAN_SECTORS.items():
-            change = info['base_change'] + random.uniform(-0.5, 0.5)
-            self.sector_changes[sector] = round(change, 2)
+        self.daily_seed = int(datetime.now(NSE_TIMEZONE).strftime('%Y%m%d'))
+        self.universe_size = universe_size or getattr(
+            settings, 'MOCK_MARKET_UNIVERSE_SIZE', len(self.INDIAN_STOCKS)
+        )
+        self.universe = self._get_universe(self.daily_seed, self.universe_size)
         
-        # Reset seed for other operations
-        random.seed()
+        # Simulator mode: quotes and movers follow a live intraday tick stream
+        self.simulator = None
+        if getattr(settings, 'MOCK_MARKET_SIMULATION', {}).get('enabled'):
+            self.simulator = self.get_simulator()
+            self.simulator.start()
+    
+    def get_simulator(self) -> IntradayTickSimulator:
+        """Get the shared intraday tick simulator for today's universe."""
+        key = (self.daily_seed, self.universe_size)
+        simulator = self._simulators.get(key)
+        if simulator is None:
+            with self._universes_lock:
+                simulator = self._simulators.get(key)
+                if simulator is None:
+                    config = getattr(settings, 'MOCK_MARKET_SIMULATION', {})
+                    simulator = IntradayTickSimulator(
+                        self.universe,
+                        ticks_per_second=config.get('ticks_per_second', 50),
+                        ring_size=config.get('ring_size', 128),
+                        seed=self.daily_seed,
+                    )
+                    for stale_key, stale in list(self._simulators.items()):
+                        if stale_key[0] != self.daily_seed:
+                            stale.stop()
+                            del self._simulators[stale_key]
+                    self._simulators[key] = simulator
+        return simulator
+    
+    @classmethod
+    def reference_universe(cls) -> 'MockUniverse':
+        """Today's universe of the named stocks only: names and sectors for peer lookups."""
+        seed = int(datetime.now(NSE_TIMEZONE).strftime('%Y%m%d'))
+        return cls._get_universe(seed, len(cls.INDIAN_STOCKS))
     
-    def get_stock_quote(self, symbol: str) -> Dict:
+    @classmethod
+    def _get_universe(cls, seed: int, size: int) -> 'MockUniverse':
+        key = (seed, size)
+        universe = cls._universes.get(key)
+        if universe is None:
+            with cls._universes_lock:
+                universe = cls._universes.get(key)
+                if universe is None:
+                    universe = MockUniverse.generate(cls, seed, size)
+                    # Yesterday's universes are no longer needed
+                    cls._universes = {
+                        k: v for k, v in cls._universes.items() if k[0] == seed
+                    }
+                    cls._universes[key] = universe
+        return universe
+    
+    def get_stock_quote(self, symbol: str) -> Optional[Quote]:
         """Get mock stock quote."""
-        random.seed(self.daily_seed)
-        
-        if symbol not in self.INDIAN_STOCKS:
-            # Generic mock for unknown symbols
-            change = round(random.uniform(-3, 3), 2)
-            return {
-                'symbol': symbol,
-                'price': round(random.uniform(100, 5000), 2),
-                'change': change,
-                'change_percent': change,
-                'previous_close': round(random.uniform(100, 5000), 2),
-                'volume': random.randint(100000, 10000000),
-                'timestamp': datetime.now().isoformat(),
-                'source': 'mock'
-            }
-        
-        info = self.INDIAN_STOCKS[symbol]
-        change_percent = self.stock_changes.get(symbol, 0)
-        base_price = info['base_price']
-        change = round(base_price * change_percent / 100, 2)
-        current_price = round(base_price + change, 2)
-        
-        # Determine reason based on change
-        if change_percent > 0.5:
-            reason = random.choice(self.REASONS['positive'])
-        elif change_percent < -0.5:
-            reason = random.choice(self.REASONS['negative'])
-        else:
-            reason = random.choice(self.REASONS['neutral'])
-        
-        random.seed()
-        
-        return {
-            'symbol': symbol,
-            'name': info['name'],
-            'sector': info['sector'],
-            'price': current_price,
-            'change': change,
-            'change_percent': change_percent,
-            'previous_close': base_price,
-            'volume': random.randint(1000000, 50000000),
-            'timestamp': datetime.now().isoformat(),
-            'reason': reason,
-            'source': 'mock'
-        }
+        row = self.universe.index.get(symbol)
+        if row is None:
+            return self._generic_quote(symbol)
+        if self.simulator:
+            return self.universe.quote(row, price=self.simulator.latest_price(row))
+        return self.universe.quote(row)
+    
+    def _generic_quote(self, symbol: str) -> Quote:
+        """Deterministic quote for symbols outside the universe."""
+        rng = np.random.default_rng([self.daily_seed, zlib.crc32(symbol.encode())])
+        change = round(float(rng.uniform(-3, 3)), 2)
+        previous_close = round(float(rng.uniform(100, 5000)), 2)
+        return Quote(
+            symbol=symbol,
+            price=round(previous_close * (1 + change / 100), 2),
+            change=change,
+            change_percent=change,
+            previous_close=previous_close,
+            volume=int(rng.integers(100000, 10000000)),
+            source='mock'
+        )
+    
+    def search(self, prefix: str, limit: int = 10) -> List[Quote]:
+        """Quotes for stocks whose name or symbol starts with `prefix`."""
+        return [self.universe.quote(row) for row in self.universe.index.search(prefix, limit)]
+    
+    def _stock_changes(self) -> np.ndarray:
+        """Per-row change percent: live from the simulator, else the daily close."""
+        if self.simulator:
+            return self.simulator.change_percent()
+        return self.universe.change_percent
     
-    def get_index_data(self, symbol: str = 'NIFTY50') -> Dict:
+    def _sector_changes(self) -> np.ndarray:
+        if self.simulator:
+            return self.universe.index.sector_means(self.simulator.change_percent())
+        return self.universe.sector_changes
+    
+    def get_index_data(self, symbol: str = 'NIFTY50') -> IndexSnapshot:
         """Get mock index data."""
-        random.seed(self.daily_seed)
-        
-        # NIFTY 50 mock
-        base_value = 22500
-        change_percent = round(sum(self.sector_changes.values()) / len(self.sector_changes), 2)
+        # NIFTY 50 mock: equal-weighted across sectors with constituents
+        base_value = self.INDEX_BASE_VALUE
+        change_percent = round(float(np.nanmean(self._sector_changes())), 2)
         change = round(base_value * change_percent / 100, 2)
         
-        random.seed()
-        
-        return {
-            'symbol': symbol,
-            'name': 'NIFTY 50',
-            'value': round(base_value + change, 2),
-            'change': change,
-            'change_percent': change_percent,
-            'previous_close': base_value,
-            'timestamp': datetime.now().isoformat(),
-            'source': 'mock'
-        }
+        return IndexSnapshot(
+            symbol=symbol,
+            name='NIFTY 50',
+            value=round(base_value + change, 2),
+            change=change,
+            change_percent=change_percent,
+            previous_close=base_value,
+            source='mock'
+        )
     
-    def get_sector_performance(self) -> List[Dict]:
+    def get_sector_performance(self) -> List[SectorEntry]:
         """Get mock sector performance."""
         sectors = []
+        counts = self.universe.index.sector_counts
         
-        weather_map = {
-            'high_positive': ('Sunny', 'Strong momentum'),
-            'positive': ('Partly Cloudy', 'Positive outlook'),
-            'neutral': ('Cloudy', 'Stable conditions'),
-            'negative': ('Light Rain', 'Under pressure'),
-            'high_negative': ('Stormy', 'Significant headwinds'),
-        }
-        
-        for sector, change in self.sector_changes.items():
+        for sector, change, count in zip(self.universe.sector_names, self._sector_changes(), counts):
+            if not count:
+                continue
+            change = round(float(change), 2)
             if change > 1:
-                weather = weather_map['high_positive']
+                weather = self.WEATHER_MAP['high_positive']
             elif change > 0.3:
-                weather = weather_map['positive']
+                weather = self.WEATHER_MAP['positive']
             elif change > -0.3:
-                weather = weather_map['neutral']
+                weather = self.WEATHER_MAP['neutral']
             elif change > -1:
-                weather = weather_map['negative']
+                weather = self.WEATHER_MAP['negative']
             else:
-                weather = weather_map['high_negative']
+                weather = self.WEATHER_MAP['high_negative']
             
-            sectors.append({
-                'name': sector,
-                'change_percent': change,
-                'weather': weather[0],
-                'outlook': weather[1],
-                'source': 'mock'
-            })
+            sectors.append(SectorEntry(
+                name=sector,
+                change_percent=change,
+                weather=weather[0],
+                outlook=weather[1],
+                stocks=int(count),
+                source='mock'
+            ))
         
-        return sorted(sectors, key=lambda x: x['change_percent'], reverse=True)
+        return sorted(sectors, key=lambda x: x.change_percent, reverse=True)
     
-    def get_top_movers(self, count: int = 5) -> Dict[str, List[Dict]]:
+    def get_top_movers(self, count: int = 5) -> Dict[str, List[Quote]]:
         """Get top gainers and losers."""
-        stocks = []
-        for symbol in self.INDIAN_STOCKS:
-            quote = self.get_stock_quote(symbol)
-            stocks.append(quote)
-        
-        sorted_stocks = sorted(stocks, key=lambda x: x['change_percent'], reverse=True)
+        if self.simulator:
+            gainers, losers = self.universe.top_rows(count, self._stock_changes())
+            return {
+                'gainers': [self.get_stock_quote(self.universe.symbols[row]) for row in gainers],
+                'losers': [self.get_stock_quote(self.universe.symbols[row]) for row in losers],
+            }
         
+        gainers, losers = self.universe.top_rows(count)
         return {
-            'gainers': sorted_stocks[:count],
-            'losers': sorted_stocks[-count:][::-1]
+            'gainers': [self.universe.quote(row) for row in gainers],
+            'losers': [self.universe.quote(row) for row in losers],
         }
 
 
+class MockUniverse:
+    """
+    One trading day of mock market data, held in arrays.
+    
+    Built once per day from a private, date-seeded RNG, so output is
+    reproducible for a given date and never touches the global `random`
+    state. Sector changes are the mean of each sector's constituents, so
+    sectors and movers always agree. Treated as read-only after generation,
+    which makes it safe to share across threads.
+    """
+    
+    def __init__(self, symbols, names, sector_names, sector_ids, base_prices,
+                 change_percent, volumes, reasons):
+        self.symbols = symbols
+        self.names = names
+        self.sector_names = sector_names
+        self.sector_ids = sector_ids
+        self.base_prices = base_prices
+        self.change_percent = change_percent
+        self.changes = np.round(base_prices * change_percent / 100, 2)
+        self.prices = np.round(base_prices + self.changes, 2)
+        self.volumes = volumes
+        self.reasons = reasons
+        self.index = UniverseIndex(symbols, names, sector_names, sector_ids)
+        self.sector_changes = np.round(self.index.sector_means(change_percent), 2)
+    
+    def __len__(self) -> int:
+        return len(self.symbols)
+    
+    @classmethod
+    def generate(cls, provider_cls, seed: int, size: int) -> 'MockUniverse':
+        rng = np.random.default_rng(seed)
+        sector_names = list(provider_cls.INDIAN_SECTORS)
+        sector_base = np.array([provider_cls.INDIAN_SECTORS[s]['base_change'] for s in sector_names])
+        sector_vol = np.array([provider_cls.INDIAN_SECTORS[s]['volatility'] for s in sector_names])
+        sector_row = {name: i for i, name in enumerate(sector_names)}
+        
+        # Well-known stocks first, then synthetic names spread across sectors
+        known = list(provider_cls.INDIAN_STOCKS.items())[:size]
+        symbols = [symbol for symbol, _ in known]
+        names = [info['name'] for _, info in known]
+        sector_ids = [sector_row[info['sector']] for _, info in known]
+        base_prices = [info['base_price'] for _, info in known]
+        
+        synthetic = size - len(known)
+        if synthetic > 0:
+            synthetic_sectors = np.arange(synthetic) % len(sector_names)
+            for i, sector_id in enumerate(synthetic_sectors):
+                symbols.append(f'MOCK{i + 1:04d}.NS')
+                names.append(f'{sector_names[sector_id]} Co {i + 1}')
+            sector_ids.extend(synthetic_sectors.tolist())
+            base_prices.extend(np.round(rng.lognormal(np.log(800), 0.9, synthetic), 2).tolist())
+        
+        sector_ids = np.array(sector_ids, dtype=np.int16)
+        base_prices = np.array(base_prices, dtype=float)
+        
+        # Stock change = sector base + random individual component
+        volatility = sector_vol[sector_ids]
+        change_percent = np.round(sector_base[sector_ids] + rng.uniform(-volatility, volatility), 2)
+        volumes = rng.integers(1000000, 50000000, size)
+        
+        # Reason depends on the direction and size of the move
+        reasons = []
+        pools = provider_cls.REASONS
+        picks = rng.random(size)
+        for change, pick in zip(change_percent, picks):
+            if change > 0.5:
+                pool = pools['positive']
+            elif change < -0.5:
+                pool = pools['negative']
+            else:
+                pool = pools['neutral']
+            reasons.append(pool[int(pick * len(pool))])
+        
+        return cls(symbols, names, sector_names, sector_ids, base_prices,
+                   change_percent, volumes, reasons)
+    
+    def quote(self, row: int, price: Optional[float] = None) -> Quote:
+        """Quote dict for one row of the universe, optionally at a live price."""
+        previous_close = float(self.base_prices[row])
+        if price is None:
+            price = float(self.prices[row])
+            change = float(self.changes[row])
+            change_percent = float(self.change_percent[row])
+        else:
+            change = round(price - previous_close, 2)
+            change_percent = round(change / previous_close * 100, 2)
+        
+        return Quote(
+            symbol=self.symbols[row],
+            name=self.names[row],
+            sector=self.sector_names[self.sector_ids[row]],
+            price=price,
+            change=change,
+            change_percent=change_percent,
+            previous_close=previous_close,
+            volume=int(self.volumes[row]),
+            reason=self.reasons[row],
+            source='mock'
+        )
+    
+    def top_rows(self, count: int, changes: Optional[np.ndarray] = None):
+        """Row ids of the top `count` gainers and losers, best first."""
+        count = min(count, len(self))
+        if count <= 0:
+            return [], []
+        changes = self.change_percent if changes is None else changes
+        if count < len(self):
+            top = np.argpartition(-changes, count - 1)[:count]
+            bottom = np.argpartition(changes, count - 1)[:count]
+        else:
+            top = bottom = np.arange(len(self))
+        gainers = top[np.argsort(-changes[top], kind='stable')]
+        losers = bottom[np.argsort(changes[bottom], kind='stable')]
+        return gainers.tolist(), losers.tolist()
+
+
+def _alpha_vantage_provider(priority: int) -> MarketDataProvider:
+    return AlphaVantageProvider(getattr(settings, 'ALPHA_VANTAGE_API_KEY', 'demo'), priority=priority)
+
+
+# Market data sources by name; MARKET_DATA_PROVIDERS picks and orders them
+PROVIDER_REGISTRY: Dict[str, Callable[[int], MarketDataProvider]] = {
+    'alpha_vantage': _alpha_vantage_provider,
+    'store': lambda priority: StoreMarketDataProvider(),
+    'mock': lambda priority: MockMarketDataProvider(),
+}
+
+
+def register_provider(name: str, factory: Callable[[int], MarketDataProvider]):
+    """Make a provider available to MARKET_DATA_PROVIDERS. `factory` takes the request priority."""
+    PROVIDER_REGISTRY[name] = factory
+
+
+_background_fetch: Optional[ThreadPoolExecutor] = None
+_background_symbols = set()
+_background_lock = threading.Lock()
+
+
+def _fetch_quotes_in_background(symbols: List[str]):
+    """Queue a background-priority bulk fetch; symbols already queued are skipped."""
+    global _background_fetch
+    with _background_lock:
+        symbols = [symbol for symbol in symbols if symbol not in _background_symbols]
+        if not symbols:
+            return
+        _background_symbols.update(symbols)
+        if _background_fetch is None:
+            # One worker: the rate limit is the bottleneck, not concurrency
+            _background_fetch = ThreadPoolExecutor(max_workers=1, thread_name_prefix='quote-fetch')
+        executor = _background_fetch
+    
+    def fetch():
+        try:
+            MarketDataService(priority=PRIORITY_BACKGROUND).get_stock_quotes(symbols)
+        except Exception as e:
+            print(f"Background quote fetch failed: {e}")
+        finally:
+            with _background_lock:
+                _background_symbols.difference_update(symbols)
+    
+    executor.submit(fetch)
+
+
 class MarketDataService:
     """
     Main service class for market data.
     Uses real data or mock based on settings.
+    Lookups are memoized in the process-wide MarketDataCache. Results are
+    MarketRecord objects (error dicts on failure); views convert them with
+    to_json_ready.
     """
     
-    def __init__(self):
+    def __init__(self, priority: int = PRIORITY_INTERACTIVE):
         self.use_real_data = getattr(settings, 'USE_REAL_MARKET_DATA', False)
         self.api_key = getattr(settings, 'ALPHA_VANTAGE_API_KEY', 'demo')
+        self.cache = get_market_cache()
         
         if self.use_real_data:
-            self.provider = AlphaVantageProvider(self.api_key)
+            names = getattr(settings, 'MARKET_DATA_PROVIDERS', None) or ['alpha_vantage', 'store']
+            self.providers = [PROVIDER_REGISTRY[name](priority) for name in names]
             self.fallback_provider = MockMarketDataProvider()
         else:
-            self.provider = MockMarketDataProvider()
+            self.providers = [MockMarketDataProvider()]
             self.fallback_provider = None
+        
+        self.provider = self.providers[0]
+        self.router = ProviderRouter(self.providers, self.fallback_provider)
+    
+    def _route(self, method: str, *args, key: tuple):
+        """Run `method` on the best available provider; fallback results are flagged."""
+        result, _, used_fallback = self.router.call(method, *args, key=key)
+        if used_fallback:
+            for record in (result if isinstance(result, list) else [result]):
+                if isinstance(record, MarketRecord):
+                    record.fallback = True
+        return result
+    
+    @staticmethod
+    def get_cache_stats() -> Dict:
+        """Hit/miss counters for the shared market data cache."""
+        return get_market_cache().stats()
+    
+    @staticmethod
+    def get_health() -> Dict:
+        """Breaker, latency, negative cache, scheduler and cache state for monitoring."""
+        return {
+            'breakers': get_breaker_stats(),
+            'latency': get_all_latency_stats('market:'),
+            'negative_cache': failed_lookups.stats(),
+            'scheduler': get_scheduler('alpha_vantage').stats(),
+            'cache': get_market_cache().stats(),
+        }
+    
+    def _cache_key(self, key: tuple) -> tuple:
+        source = 'real' if self.use_real_data else 'mock'
+        return (source,) + key
+    
+    def _cached(self, key: tuple, fetch: Callable):
+        return self.cache.get_or_fetch(self._cache_key(key), fetch)
     
-    def get_stock_quote(self, symbol: str) -> Dict:
+    def get_stock_quote(self, symbol: str) -> Union[Quote, Dict]:
         """Get stock quote with fallback."""
-        result = self.provider.get_stock_quote(symbol)
-        
-        if result is None and self.fallback_provider:
-            result = self.fallback_provider.get_stock_quote(symbol)
-            if result:
-                result['fallback'] = True
-        
+        return self._cached(('quote', symbol), lambda: self._fetch_stock_quote(symbol))
+    
+    def _fetch_stock_quote(self, symbol: str) -> Union[Quote, Dict]:
+        result = self._route('get_stock_quote', symbol, key=('quote', symbol))
         return result or {'error': f'Unable to fetch data for {symbol}'}
     
-    def get_index_data(self, symbol: str = 'NIFTY50') -> Dict:
-        """Get index data with fallback."""
-        result = self.provider.get_index_data(symbol)
+    def get_stock_quotes(self, symbols: List[str]) -> List[Union[Quote, Dict]]:
+        """
+        Get quotes for many symbols in one call.
         
-        if result is None and self.fallback_provider:
-            result = self.fallback_provider.get_index_data(symbol)
-            if result:
-                result['fallback'] = True
+        Cached symbols are served locally, the rest are fetched in bulk from
+        each provider in turn, and only the symbols that every provider failed
+        go to the fallback. Fallback quotes are flagged and only cached for
+        the short fallback TTL, so real quotes replace them once a provider
+        recovers. Results follow input order; failures carry an 'error' key.
+        """
+        results = {}
+        missing = []
+        for symbol in dict.fromkeys(symbols):
+            cached = self.cache.lookup(self._cache_key(('quote', symbol)))
+            if cached is not None:
+                results[symbol] = cached
+            else:
+                missing.append(symbol)
+        
+        if missing:
+            for symbol, (result, used_fallback) in self.router.call_bulk(missing).items():
+                if result is None:
+                    result = {'symbol': symbol, 'error': f'Unable to fetch data for {symbol}'}
+                else:
+                    if used_fallback:
+                        result.fallback = True
+                    self.cache.store(self._cache_key(('quote', symbol)), result)
+                results[symbol] = result
         
+        return [results[symbol] for symbol in symbols]
+    
+    def get_index_data(self, symbol: str = 'NIFTY50') -> Union[IndexSnapshot, Dict]:
+        """Get index data with fallback."""
+        return self._cached(('index', symbol), lambda: self._fetch_index_data(symbol))
+    
+    def _fetch_index_data(self, symbol: str) -> Union[IndexSnapshot, Dict]:
+        result = self._route('get_index_data', symbol, key=('index', symbol))
         return result or {'error': f'Unable to fetch index data for {symbol}'}
     
-    def get_sector_performance(self) -> List[Dict]:
+    def get_sector_performance(self) -> List[SectorEntry]:
         """Get sector performance data."""
-        result = self.provider.get_sector_performance()
-        
-        if not result and self.fallback_provider:
-            result = self.fallback_provider.get_sector_performance()
-        
-        return result
+        return self._cached(('sectors',), self._fetch_sector_performance)
+    
+    def _fetch_sector_performance(self) -> List[SectorEntry]:
+        return self._route('get_sector_performance', key=('sectors',)) or []
     
-    def get_top_movers(self, count: int = 5) -> Dict[str, List[Dict]]:
+    def get_top_movers(self, count: int = 5) -> Dict[str, List[Quote]]:
         """Get top gainers and losers."""
         if isinstance(self.provider, MockMarketDataProvider):
             return self.provider.get_top_movers(count)
         
-        # For real provider, manually compute from stock list
-        if self.fallback_provider:
-            return self.fallback_provider.get_top_movers(count)
+        # For real provider, rank the watchlist quotes we already have
+        key = self._cache_key(('movers', count))
+        movers = self.cache.lookup(key)
+        if movers is None:
+            movers, complete = self._compute_top_movers(count)
+            # A partial ranking is recomputed once the background fetch lands
+            if complete:
+                self.cache.store(key, movers)
+        return movers
+    
+    def _compute_top_movers(self, count: int):
+        """
+        Rank the watchlist from cached quotes, or the last stored session when
+        a symbol isn't cached, so the request never waits on the rate limit.
+        Symbols without a real quote are fetched in the background for the
+        next computation. Fallback (mock) quotes are never ranked.
+        Returns (movers, complete).
+        """
+        watchlist = getattr(settings, 'MARKET_WATCHLIST', None) or list(MockMarketDataProvider.INDIAN_STOCKS)
+        store = StoreMarketDataProvider()
+        quotes = []
+        missing = []
+        for symbol in dict.fromkeys(watchlist):
+            quote = self.cache.lookup(self._cache_key(('quote', symbol)))
+            if not isinstance(quote, Quote) or quote.fallback:
+                missing.append(symbol)
+                quote = store.get_stock_quote(symbol)
+            if quote is not None:
+                quotes.append(quote)
         
-        return {'gainers': [], 'losers': []}
+        if missing:
+            _fetch_quotes_in_background(missing)
+        return select_top_movers(quotes, count), not missing
     
     def get_market_summary(self) -> Dict:
         """Get comprehensive market summary."""
+        return self._cached(('summary',), self._build_market_summary)
+    
+    def _build_market_summary(self) -> Dict:
         index = self.get_index_data()
         sectors = self.get_sector_performance()
         movers = self.get_top_movers(3)
@@ -381,10 +1139,35 @@ class MarketDataService:
         }
     
     def get_market_risk_level(self) -> Dict:
-        """Calculate overall market risk level."""
+        """
+        Calculate overall market risk level from realized index volatility
+        and drawdown over a rolling window. Falls back to the day's index
+        move until enough history exists.
+        """
         index = self.get_index_data()
-        change = abs(index.get('change_percent', 0))
+        change_percent = index.get('change_percent', 0)
+        
+        tracker = get_risk_tracker()
+        if self.use_real_data:
+            # Local history only (the learn prewarm keeps it current); today's
+            # level must come from the same series, not the headline index
+            symbol = tracker.config['index_symbol']
+            tracker.sync_bars(get_timeseries_store().read(symbol))
+            live = self.get_stock_quote(symbol)
+            level = live.get('price')
+        else:
+            live = index
+            level = index.get('value')
+        
+        # Stored or fallback levels aren't today's trading
+        if level and 'error' not in live and not live.get('fallback') and not live.get('as_of'):
+            tracker.observe(_index_session_date(), float(level))
+        
+        reading = tracker.assess(change_percent)
+        if reading is not None:
+            return {**reading, 'timestamp': datetime.now().isoformat()}
         
+        change = abs(change_percent)
         if change > 2:
             risk_level = 'HIGH'
             reason = 'High market volatility detected'
@@ -398,6 +1181,7 @@ class MarketDataService:
         return {
             'risk_level': risk_level,
             'reason': reason,
-            'index_change': index.get('change_percent', 0),
+            'index_change': change_percent,
+            'method': 'daily_change',
             'timestamp': datetime.now().isoformat()
         }
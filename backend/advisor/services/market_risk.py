@@ -0,0 +1,212 @@
+"""
+Market Risk - Volatility-based market risk from a rolling window of index closes.
+
+The tracker keeps running sums of daily returns and a monotonic queue of
+closes, so adding a bar is O(1) (amortized for the peak) instead of a pass
+over the full history. Completed sessions are committed; the current
+session's level is applied provisionally without mutating the window.
+"""
+import math
+import threading
+from collections import deque
+from datetime import date
+from typing import Dict, List, Optional
+
+import numpy as np
+from django.conf import settings
+
+
+TRADING_DAYS_PER_YEAR = 252
+
+
+class RollingRiskWindow:
+    """Return volatility and drawdown over the last `window` daily closes."""
+
+    def __init__(self, window: int = 20):
+        self.window = window
+        self._returns = deque()
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self._closes = deque()   # (position, close) of the last window + 1 closes
+        self._peaks = deque()    # monotonic (position, close), highest first
+        self._position = 0
+
+    def __len__(self) -> int:
+        return len(self._returns)
+
+    @property
+    def last_close(self) -> Optional[float]:
+        return self._closes[-1][1] if self._closes else None
+
+    def push(self, close: float):
+        if close <= 0:
+            return
+        if self._closes:
+            ret = close / self._closes[-1][1] - 1
+            self._returns.append(ret)
+            self._sum += ret
+            self._sum_sq += ret * ret
+            if len(self._returns) > self.window:
+                old = self._returns.popleft()
+                self._sum -= old
+                self._sum_sq -= old * old
+
+        self._closes.append((self._position, close))
+        while self._peaks and self._peaks[-1][1] <= close:
+            self._peaks.pop()
+        self._peaks.append((self._position, close))
+        self._position += 1
+
+        if len(self._closes) > self.window + 1:
+            dropped, _ = self._closes.popleft()
+            if self._peaks[0][0] == dropped:
+                self._peaks.popleft()
+
+    def volatility(self, provisional: Optional[float] = None) -> Optional[float]:
+        """Annualized volatility (%) of daily returns, optionally with one more close."""
+        count, total, total_sq = len(self._returns), self._sum, self._sum_sq
+        if provisional and self._closes:
+            ret = provisional / self._closes[-1][1] - 1
+            count, total, total_sq = count + 1, total + ret, total_sq + ret * ret
+            if count > self.window:
+                old = self._returns[0]
+                count, total, total_sq = count - 1, total - old, total_sq - old * old
+        if count < 2:
+            return None
+        variance = max(0.0, (total_sq - total * total / count) / (count - 1))
+        return math.sqrt(variance * TRADING_DAYS_PER_YEAR) * 100
+
+    def drawdown(self, provisional: Optional[float] = None) -> Optional[float]:
+        """How far (%) the latest close sits below the window's peak."""
+        if not self._peaks:
+            return None
+        close = provisional or self._closes[-1][1]
+        first = 0
+        if provisional and len(self._closes) > self.window and self._peaks[0][0] == self._closes[0][0]:
+            # The provisional close would push the oldest close (the peak) out
+            first = 1
+        peak = max(self._peaks[first][1], close) if len(self._peaks) > first else close
+        return (1 - close / peak) * 100
+
+
+class MarketRiskTracker:
+    """
+    Maintains the rolling window for one index and classifies its risk.
+    Keeps the last `history_size` readings so callers never recompute them.
+    """
+
+    DEFAULTS = {
+        'index_symbol': 'NIFTYBEES.BSE',
+        'window': 20,
+        'min_days': 5,
+        'history_size': 30,
+        'high_volatility': 25.0,
+        'medium_volatility': 15.0,
+        'high_drawdown': 10.0,
+        'medium_drawdown': 5.0,
+    }
+
+    def __init__(self, config: Optional[Dict] = None):
+        self.config = {**self.DEFAULTS, **(config or {})}
+        self.window = RollingRiskWindow(self.config['window'])
+        self.last_date: Optional[date] = None
+        self.readings = deque(maxlen=self.config['history_size'])
+        self._pending: Optional[tuple] = None
+        self._lock = threading.Lock()
+
+    def update(self, day: date, close: float):
+        """Commit one completed session's close; older or repeated days are ignored."""
+        with self._lock:
+            self._commit(day, close)
+
+    def sync_bars(self, bars):
+        """Commit stored daily bars newer than the window (reads only the new tail)."""
+        with self._lock:
+            if len(bars) == 0 or (self.last_date and bars.last_date <= self.last_date):
+                return
+            if self.last_date is None:
+                start = max(0, len(bars) - self.config['window'] - 1)
+            else:
+                start = int(np.searchsorted(bars.dates, np.datetime64(self.last_date, 'D'), side='right'))
+            for day, close in zip(bars.dates[start:], bars.close[start:]):
+                self._commit(day.astype(date), float(close))
+
+    def observe(self, day: date, level: float):
+        """
+        Record the index level seen during session `day`. The previous
+        session's last level is committed once a newer session is observed.
+        """
+        with self._lock:
+            if self._pending and self._pending[0] < day:
+                self._commit(*self._pending)
+            if self.last_date is None or day > self.last_date:
+                self._pending = (day, level)
+
+    def assess(self, index_change: float = 0.0) -> Optional[Dict]:
+        """Risk reading over the window (plus today's level), or None without history."""
+        with self._lock:
+            provisional = self._pending[1] if self._pending else None
+            days = len(self.window) + (1 if provisional and self.window.last_close else 0)
+            if days < self.config['min_days']:
+                return None
+            volatility = self.window.volatility(provisional)
+            drawdown = self.window.drawdown(provisional)
+            if volatility is None or drawdown is None:
+                # Too few returns yet; the caller falls back to the daily change
+                return None
+
+            config = self.config
+            if volatility >= config['high_volatility'] or drawdown >= config['high_drawdown']:
+                risk_level = 'HIGH'
+                reason = 'High market volatility detected'
+            elif volatility >= config['medium_volatility'] or drawdown >= config['medium_drawdown']:
+                risk_level = 'MEDIUM'
+                reason = 'Moderate market movement'
+            else:
+                risk_level = 'LOW'
+                reason = 'Stable market conditions'
+
+            reading = {
+                'risk_level': risk_level,
+                'reason': reason,
+                'index_change': index_change,
+                'volatility': round(float(volatility), 2),
+                'drawdown': round(float(drawdown), 2),
+                'window_days': len(self.window),
+                'method': 'volatility',
+            }
+            day = self._pending[0] if self._pending else self.last_date
+            if self.readings and self.readings[-1][0] == day:
+                self.readings[-1] = (day, reading)
+            else:
+                self.readings.append((day, reading))
+            return reading
+
+    def latest(self) -> Optional[Dict]:
+        return self.readings[-1][1] if self.readings else None
+
+    def history(self) -> List[Dict]:
+        """Cached readings, one per session, oldest first."""
+        return [{'date': day.isoformat(), **reading} for day, reading in list(self.readings)]
+
+    def _commit(self, day: date, close: float):
+        if self.last_date is not None and day <= self.last_date:
+            return
+        self.window.push(close)
+        self.last_date = day
+        if self._pending and self._pending[0] <= day:
+            self._pending = None
+
+
+_tracker: Optional[MarketRiskTracker] = None
+_tracker_lock = threading.Lock()
+
+
+def get_risk_tracker() -> MarketRiskTracker:
+    """Get the process-wide market risk tracker, configured from settings."""
+    global _tracker
+    if _tracker is None:
+        with _tracker_lock:
+            if _tracker is None:
+                _tracker = MarketRiskTracker(getattr(settings, 'MARKET_RISK', None))
+    return _tracker
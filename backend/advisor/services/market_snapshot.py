@@ -0,0 +1,163 @@
+"""
+Market Snapshot - Precomputed, immutable view of the market.
+
+A background refresher builds one snapshot (summary, risk level, movers) per
+interval and publishes it with a single reference swap, so request handlers
+read the current market in O(1) instead of recomputing it inline. Each
+snapshot carries a monotonically increasing version and a timestamp that
+downstream caches can key on.
+"""
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Optional
+from django.conf import settings
+
+from .market_data import MarketDataService
+from .request_scheduler import PRIORITY_BACKGROUND
+
+
+class MarketSnapshot:
+    """One immutable market view. Treat the contained dicts as read-only."""
+
+    __slots__ = ('version', 'timestamp', 'built_at', 'summary', 'risk', 'movers')
+
+    def __init__(self, version: int, summary: Dict, risk: Dict, movers: Dict):
+        object.__setattr__(self, 'version', version)
+        object.__setattr__(self, 'timestamp', datetime.now().isoformat())
+        object.__setattr__(self, 'built_at', time.monotonic())
+        object.__setattr__(self, 'summary', summary)
+        object.__setattr__(self, 'risk', risk)
+        object.__setattr__(self, 'movers', movers)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('MarketSnapshot is immutable')
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.built_at
+
+    def top_movers(self, count: int) -> Optional[Dict]:
+        """Movers sliced to `count`, or None if the snapshot holds fewer."""
+        available = min(len(self.movers.get('gainers', [])), len(self.movers.get('losers', [])))
+        if count > available:
+            return None
+        return {
+            'gainers': self.movers['gainers'][:count],
+            'losers': self.movers['losers'][:count],
+        }
+
+
+class SnapshotRefresher:
+    """
+    Builds snapshots every `interval` seconds on a daemon thread.
+
+    The first read builds synchronously; later reads never block. Without a
+    background thread, reads rebuild lazily once the snapshot is older than
+    `interval`.
+    """
+
+    def __init__(
+        self,
+        interval: float = 60,
+        movers_count: int = 10,
+        background: bool = True,
+        service_factory: Optional[Callable[[], MarketDataService]] = None
+    ):
+        self.interval = interval
+        self.movers_count = movers_count
+        self.background = background
+        self.service_factory = service_factory or (lambda: MarketDataService(priority=PRIORITY_BACKGROUND))
+        self._current: Optional[MarketSnapshot] = None
+        self._version = 0
+        self._build_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def current(self) -> MarketSnapshot:
+        """The latest published snapshot."""
+        snapshot = self._current
+        if snapshot is None:
+            with self._build_lock:
+                if self._current is None:
+                    self._publish(self._build())
+            if self.background:
+                self.start()
+            return self._current
+
+        if not self.background and snapshot.age > self.interval:
+            if self._build_lock.acquire(blocking=False):
+                try:
+                    self._publish(self._build())
+                finally:
+                    self._build_lock.release()
+            return self._current
+
+        return snapshot
+
+    def refresh(self) -> MarketSnapshot:
+        """Build and publish a new snapshot now."""
+        with self._build_lock:
+            self._publish(self._build())
+        return self._current
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='market-snapshot', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                # Keep serving the previous snapshot
+                print(f"Market snapshot refresh failed: {e}")
+
+    def _build(self) -> MarketSnapshot:
+        service = self.service_factory()
+        summary = service.get_market_summary()
+        risk = service.get_market_risk_level()
+        movers = service.get_top_movers(self.movers_count)
+
+        version = self._version + 1
+        return MarketSnapshot(
+            version=version,
+            summary={**summary, 'snapshot_version': version},
+            risk=risk,
+            movers=movers,
+        )
+
+    def _publish(self, snapshot: MarketSnapshot):
+        # A single reference assignment: readers see the old or new snapshot, never a mix
+        self._version = snapshot.version
+        self._current = snapshot
+
+
+_refresher: Optional[SnapshotRefresher] = None
+_refresher_lock = threading.Lock()
+
+
+def get_snapshot_refresher() -> SnapshotRefresher:
+    """Get the process-wide snapshot refresher, configured from settings."""
+    global _refresher
+    if _refresher is None:
+        with _refresher_lock:
+            if _refresher is None:
+                config = getattr(settings, 'MARKET_SNAPSHOT', {})
+                _refresher = SnapshotRefresher(
+                    interval=config.get('interval', 60),
+                    movers_count=config.get('movers_count', 10),
+                    background=config.get('background', True),
+                )
+    return _refresher
+
+
+def get_market_snapshot() -> MarketSnapshot:
+    """The current market snapshot (O(1) after the first call)."""
+    return get_snapshot_refresher().current()
@@ -0,0 +1,173 @@
+"""
+Market Stream - Fan-out of market snapshot changes to streaming clients.
+
+One hub per event loop watches the published MarketSnapshot version and,
+when it changes, computes a diff of the client-facing fields once and pushes
+it to every subscriber queue. Thousands of idle connections therefore cost
+one small queue each and share a single upstream computation.
+"""
+import asyncio
+import json
+import time
+import weakref
+from typing import Dict, Optional, Set
+from django.conf import settings
+
+from .market_data import to_json_ready
+from .market_snapshot import MarketSnapshot, get_market_snapshot
+
+
+# Snapshot fields pushed to clients
+STREAM_FIELDS = ('index', 'sectors', 'movers', 'mood', 'mood_emoji')
+
+
+def snapshot_state(snapshot: MarketSnapshot) -> Dict:
+    """JSON-ready streamed fields; built once per snapshot version and shared by all clients."""
+    state = {field: snapshot.summary.get(field) for field in STREAM_FIELDS}
+    state['movers'] = snapshot.movers
+    return to_json_ready(state)
+
+
+def format_event(event: str, data: Dict) -> str:
+    """Encode one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+class SnapshotDiffer:
+    """Tracks the last state sent and works out what changed."""
+
+    def __init__(self):
+        self.version = 0
+        self.state: Dict = {}
+
+    def update(self, snapshot: MarketSnapshot) -> Optional[str]:
+        """Return a 'diff' event if the snapshot changed any streamed field."""
+        if snapshot.version == self.version:
+            return None
+
+        new_state = snapshot_state(snapshot)
+        changes = {
+            field: value for field, value in new_state.items()
+            if self.state.get(field) != value
+        }
+        self.version = snapshot.version
+        self.state = new_state
+        if not changes:
+            return None
+        return format_event('diff', {
+            'version': snapshot.version,
+            'timestamp': snapshot.timestamp,
+            'changes': changes,
+        })
+
+    def full_event(self) -> str:
+        return format_event('snapshot', {'version': self.version, **self.state})
+
+
+class MarketStreamHub:
+    """Watches the snapshot and broadcasts diffs to subscriber queues."""
+
+    def __init__(self, poll_interval: float = 2, queue_size: int = 16):
+        self.poll_interval = poll_interval
+        self.queue_size = queue_size
+        self.subscribers: Set[asyncio.Queue] = set()
+        self.differ = SnapshotDiffer()
+        self._task: Optional[asyncio.Task] = None
+
+    async def subscribe(self) -> asyncio.Queue:
+        """Register a client; its queue starts with the full current state."""
+        if not self.differ.state:
+            await self._poll()
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        queue.put_nowait(self.differ.full_event())
+        self.subscribers.add(queue)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._watch())
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self.subscribers.discard(queue)
+
+    async def _watch(self):
+        while self.subscribers:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self._poll()
+            except Exception as e:
+                print(f"Market stream poll failed: {e}")
+
+    async def _poll(self):
+        # The first snapshot may be built synchronously; keep it off the loop
+        snapshot = await asyncio.to_thread(get_market_snapshot)
+        event = self.differ.update(snapshot)
+        if event:
+            self._broadcast(event)
+
+    def _broadcast(self, event: str):
+        for queue in list(self.subscribers):
+            if queue.full():
+                # Slow client: drop its backlog and resync with the full state
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(self.differ.full_event())
+            else:
+                queue.put_nowait(event)
+
+
+_hubs: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, MarketStreamHub]' = weakref.WeakKeyDictionary()
+
+
+def get_stream_hub() -> MarketStreamHub:
+    """Get the hub for the running event loop."""
+    loop = asyncio.get_running_loop()
+    hub = _hubs.get(loop)
+    if hub is None:
+        hub = MarketStreamHub(poll_interval=_stream_config()['poll_interval'])
+        _hubs[loop] = hub
+    return hub
+
+
+def _stream_config() -> Dict:
+    return {'poll_interval': 2, 'keepalive': 15, **getattr(settings, 'MARKET_STREAM', {})}
+
+
+async def market_event_stream(keepalive: Optional[float] = None):
+    """Async iterator of SSE frames for one client (ASGI)."""
+    if keepalive is None:
+        keepalive = _stream_config()['keepalive']
+
+    hub = get_stream_hub()
+    queue = await hub.subscribe()
+    try:
+        while True:
+            try:
+                yield await asyncio.wait_for(queue.get(), timeout=keepalive)
+            except asyncio.TimeoutError:
+                # Comment frame keeps proxies from closing idle connections
+                yield ': keepalive\n\n'
+    finally:
+        hub.unsubscribe(queue)
+
+
+def market_event_stream_sync():
+    """
+    Blocking SSE iterator for WSGI servers (e.g. runserver in development).
+    Each client pins a worker thread, so production should serve the ASGI app.
+    """
+    config = _stream_config()
+    differ = SnapshotDiffer()
+    differ.update(get_market_snapshot())
+    yield differ.full_event()
+
+    idle = 0.0
+    while True:
+        time.sleep(config['poll_interval'])
+        event = differ.update(get_market_snapshot())
+        if event:
+            idle = 0.0
+            yield event
+        else:
+            idle += config['poll_interval']
+            if idle >= config['keepalive']:
+                idle = 0.0
+                yield ': keepalive\n\n'
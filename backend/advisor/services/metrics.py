@@ -0,0 +1,90 @@
+"""
+Metrics - Rolling latency and outcome statistics for upstream providers.
+"""
+import threading
+from collections import deque
+from typing import Dict, Optional
+
+
+class LatencyStats:
+    """
+    Latencies and outcomes of the last `window` calls to one provider.
+    Used to rank providers and to decide when a call is slow enough to hedge.
+    """
+
+    def __init__(self, name: str, window: int = 200):
+        self.name = name
+        self._latencies = deque(maxlen=window)
+        self._outcomes = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.wins = 0
+        self.hedged_wins = 0
+
+    def record(self, seconds: float, ok: bool):
+        with self._lock:
+            self.calls += 1
+            self._outcomes.append(ok)
+            if ok:
+                self._latencies.append(seconds)
+
+    def record_win(self, hedged: bool = False):
+        with self._lock:
+            self.wins += 1
+            if hedged:
+                self.hedged_wins += 1
+
+    @property
+    def samples(self) -> int:
+        return len(self._latencies)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Latency percentile in seconds over successful calls, or None without data."""
+        with self._lock:
+            if not self._latencies:
+                return None
+            ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+    @property
+    def error_rate(self) -> float:
+        with self._lock:
+            if not self._outcomes:
+                return 0.0
+            return self._outcomes.count(False) / len(self._outcomes)
+
+    def stats(self) -> Dict:
+        p50 = self.percentile(50)
+        p90 = self.percentile(90)
+        p95 = self.percentile(95)
+        return {
+            'name': self.name,
+            'calls': self.calls,
+            'samples': self.samples,
+            'error_rate': round(self.error_rate, 3),
+            'p50_ms': int(p50 * 1000) if p50 is not None else None,
+            'p90_ms': int(p90 * 1000) if p90 is not None else None,
+            'p95_ms': int(p95 * 1000) if p95 is not None else None,
+            'wins': self.wins,
+            'hedged_wins': self.hedged_wins,
+        }
+
+
+_latency_stats: Dict[str, LatencyStats] = {}
+_latency_lock = threading.Lock()
+
+
+def get_latency_stats(name: str) -> LatencyStats:
+    """Get the process-wide latency stats for a provider."""
+    stats = _latency_stats.get(name)
+    if stats is None:
+        with _latency_lock:
+            stats = _latency_stats.setdefault(name, LatencyStats(name))
+    return stats
+
+
+def get_all_latency_stats(prefix: str = '') -> Dict[str, Dict]:
+    return {
+        name: stats.stats() for name, stats in list(_latency_stats.items())
+        if name.startswith(prefix)
+    }
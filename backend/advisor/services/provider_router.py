@@ -0,0 +1,205 @@
+"""
+Provider Router - Health- and latency-aware routing across market data sources.
+
+Providers are tried in their configured order of preference. Unhealthy ones
+(breaker open, high recent error rate) drop to the back, lookups that a
+provider just failed skip it for a short while, and when the first choice is
+slower than its own observed p95 a hedged request goes to the next one. The
+first usable answer wins. A last-resort fallback (the mock) is only used
+when every real source has failed.
+"""
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Tuple
+from django.conf import settings
+
+from .cache import TTLCache
+from .circuit_breaker import get_circuit_breaker
+from .metrics import LatencyStats, get_latency_stats
+
+
+# Short-lived negative cache of (provider, lookup) pairs that just failed
+failed_lookups = TTLCache(max_entries=4096)
+
+# Providers failing more often than this are tried last
+UNHEALTHY_ERROR_RATE = 0.5
+
+_router_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _hedging_config() -> Dict:
+    return {
+        'enabled': True,
+        'default_delay': 2.0,
+        'min_delay': 0.05,
+        'min_samples': 20,
+        'max_workers': 16,
+        **getattr(settings, 'MARKET_HEDGING', {}),
+    }
+
+
+def _negative_ttl() -> float:
+    return getattr(settings, 'MARKET_CIRCUIT_BREAKER', {}).get('negative_ttl', 60)
+
+
+def get_router_executor() -> ThreadPoolExecutor:
+    global _router_executor
+    if _router_executor is None:
+        with _executor_lock:
+            if _router_executor is None:
+                _router_executor = ThreadPoolExecutor(
+                    max_workers=_hedging_config()['max_workers'],
+                    thread_name_prefix='market-router',
+                )
+    return _router_executor
+
+
+def _usable(result) -> bool:
+    return bool(result) and not (isinstance(result, dict) and 'error' in result)
+
+
+class ProviderRouter:
+    """Routes one service's lookups over an ordered list of providers."""
+
+    def __init__(self, providers: List, fallback=None):
+        self.providers = providers
+        self.fallback = fallback
+        self.config = _hedging_config()
+
+    def stats_for(self, provider) -> LatencyStats:
+        return get_latency_stats(f'market:{provider.name}')
+
+    def ranked(self, method: str, key: tuple) -> List:
+        """Candidates for `key`: healthy providers first, in configured order."""
+        healthy, degraded = [], []
+        for provider in self.providers:
+            if not provider.supports(method):
+                continue
+            if get_circuit_breaker(provider.name).is_open:
+                continue
+            if failed_lookups.get((provider.name,) + key):
+                continue
+            if self.stats_for(provider).error_rate > UNHEALTHY_ERROR_RATE:
+                degraded.append(provider)
+            else:
+                healthy.append(provider)
+        return healthy + degraded
+
+    def hedge_delay(self, provider) -> float:
+        """How long to wait on `provider` before hedging: its observed p95."""
+        stats = self.stats_for(provider)
+        if stats.samples < self.config['min_samples']:
+            return self.config['default_delay']
+        return max(self.config['min_delay'], stats.percentile(95))
+
+    def call(self, method: str, *args, key: tuple) -> Tuple[Any, Optional[str], bool]:
+        """
+        Run `method` on the best provider, hedging to the next one when slow.
+        Returns (result, provider name, used_fallback).
+        """
+        candidates = self.ranked(method, key)
+
+        if len(candidates) == 1 or (candidates and not self.config['enabled']):
+            # Nothing to hedge against: call inline, falling through on failure
+            for provider in candidates:
+                result = self._timed(provider, method, args, key)
+                if _usable(result):
+                    self.stats_for(provider).record_win()
+                    return result, provider.name, False
+        elif candidates:
+            result, provider = self._hedged(candidates, method, args, key)
+            if provider is not None:
+                return result, provider.name, False
+
+        if self.fallback is not None:
+            result = getattr(self.fallback, method)(*args)
+            if _usable(result):
+                return result, self.fallback.name, True
+        return None, None, False
+
+    def call_bulk(self, symbols: List[str]) -> Dict[str, Tuple[Optional[Dict], bool]]:
+        """
+        Bulk quotes: each provider in turn gets only the symbols still missing.
+        Returns {symbol: (quote or None, used_fallback)}.
+        """
+        results: Dict[str, Tuple[Optional[Dict], bool]] = {s: (None, False) for s in symbols}
+        for provider in self.providers:
+            if get_circuit_breaker(provider.name).is_open:
+                continue
+            wanted = [
+                s for s in symbols
+                if results[s][0] is None and not failed_lookups.get((provider.name, 'quote', s))
+            ]
+            if not wanted:
+                continue
+            for symbol, quote in zip(wanted, provider.get_stock_quotes(wanted)):
+                if _usable(quote):
+                    results[symbol] = (quote, False)
+                else:
+                    self._mark_failed(provider, ('quote', symbol))
+
+        missing = [s for s in symbols if results[s][0] is None]
+        if missing and self.fallback is not None:
+            for symbol, quote in zip(missing, self.fallback.get_stock_quotes(missing)):
+                if _usable(quote):
+                    results[symbol] = (quote, True)
+        return results
+
+    def _hedged(self, candidates: List, method: str, args: tuple, key: tuple):
+        executor = get_router_executor()
+        pending = {}
+        remaining = list(candidates)
+
+        def launch():
+            provider = remaining.pop(0)
+            future = executor.submit(self._timed, provider, method, args, key)
+            pending[future] = provider
+            return provider
+
+        current = launch()
+        hedged = False
+        while pending:
+            # Providers that can't beat a live answer (e.g. the store while
+            # the market trades) are only tried once the others fail
+            can_hedge = remaining and getattr(remaining[0], 'hedgeable', True)
+            timeout = self.hedge_delay(current) if can_hedge else None
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                # First choice is slower than usual: race the next provider
+                current = launch()
+                hedged = True
+                continue
+
+            for future in done:
+                provider = pending.pop(future)
+                result = future.result()
+                if _usable(result):
+                    # Any still-running loser finishes in the background and is ignored
+                    self.stats_for(provider).record_win(hedged=hedged and provider is not candidates[0])
+                    return result, provider
+
+            if not pending and remaining:
+                current = launch()
+
+        return None, None
+
+    def _timed(self, provider, method: str, args: tuple, key: tuple):
+        start = time.monotonic()
+        try:
+            result = getattr(provider, method)(*args)
+        except Exception as e:
+            print(f"Market provider {provider.name} {method} failed: {e}")
+            result = None
+        ok = _usable(result)
+        self.stats_for(provider).record(time.monotonic() - start, ok)
+        if not ok:
+            self._mark_failed(provider, key)
+        return result
+
+    def _mark_failed(self, provider, key: tuple):
+        # Only blame the lookup while the provider itself looks healthy
+        breaker = get_circuit_breaker(provider.name)
+        if breaker.state == breaker.CLOSED:
+            failed_lookups.set((provider.name,) + key, True, ttl=_negative_ttl())
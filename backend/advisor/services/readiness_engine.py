@@ -33,6 +33,14 @@ class ReadinessEngine:
     SAVINGS_RATE_IDEAL = 30  # 30% ideal savings rate
     DEBT_TO_INCOME_SAFE = 30  # Below 30% is safe
     
+    # Lowest score for each status, highest first
+    STATUS_THRESHOLDS = (
+        (80, 'READY'),
+        (60, 'ALMOST_READY'),
+        (40, 'GETTING_THERE'),
+        (0, 'NOT_READY'),
+    )
+    
     def __init__(self, weights: Optional[Dict] = None):
         self.weights = weights or getattr(settings, 'READINESS_WEIGHTS', self.DEFAULT_WEIGHTS)
     
@@ -109,11 +117,10 @@ class ReadinessEngine:
             suggestions.append(ra_suggestion)
         
         # Calculate total score
-        total_score = sum(comp['weighted_score'] for comp in breakdown.values())
-        total_score = round(min(100, max(0, total_score)))
+        total_score = self.clamp_score(sum(comp['weighted_score'] for comp in breakdown.values()))
         
         # Determine status
-        status = self._get_status(total_score)
+        status = self.status_for_score(total_score)
         status_message = self._get_status_message(total_score, status)
         
         return {
@@ -226,15 +233,19 @@ class ReadinessEngine:
                 return 50, "Build more safety cushion for aggressive investing."
             return 30, "High-risk investing requires solid financial foundation first."
     
-    def _get_status(self, score: int) -> str:
-        """Get status label from score."""
-        if score >= 80:
-            return 'READY'
-        elif score >= 60:
-            return 'ALMOST_READY'
-        elif score >= 40:
-            return 'GETTING_THERE'
-        return 'NOT_READY'
+    @staticmethod
+    def clamp_score(score: float) -> int:
+        """Round a raw score into 0-100, as reported by calculate_score."""
+        return round(min(100, max(0, score)))
+    
+    @classmethod
+    def status_for_score(cls, score: float) -> str:
+        """Get status label from score (rounded the way calculate_score rounds it)."""
+        score = cls.clamp_score(score)
+        for threshold, status in cls.STATUS_THRESHOLDS:
+            if score >= threshold:
+                return status
+        return cls.STATUS_THRESHOLDS[-1][1]
     
     def _get_status_message(self, score: int, status: str) -> str:
         """Get human-friendly status message."""
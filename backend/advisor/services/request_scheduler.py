@@ -0,0 +1,326 @@
+"""
+Request Scheduler - Rate-limit-aware dispatcher for outgoing provider calls.
+
+Alpha Vantage's free tier allows only a handful of calls per minute, so every
+call goes through one token bucket. The bucket's state lives in a small
+file shared by every process on the host (web workers, cron commands), so
+the quota holds however many workers run. Queued calls are served in
+priority order (interactive before background refreshes), and identical calls
+that are already queued or in flight share a single upstream request.
+"""
+import heapq
+import itertools
+import os
+import threading
+import time
+from pathlib import Path
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Any, Callable, Dict, Hashable, Optional
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows dev machines
+    fcntl = None
+
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+
+
+class SchedulerTimeout(Exception):
+    """Raised when a queued call does not complete within the caller's deadline."""
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at `rate_per_minute`."""
+
+    def __init__(self, rate_per_minute: float, burst: Optional[int] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = burst or max(1, int(rate_per_minute))
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def try_acquire(self) -> float:
+        """Take a token. Returns 0 on success, else seconds until one is available."""
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / self.rate
+
+    def drain(self):
+        """Empty the bucket, e.g. after the provider reports we are throttled."""
+        self._refill()
+        self.tokens = min(self.tokens, 0)
+
+    @property
+    def available(self) -> float:
+        self._refill()
+        return self.tokens
+
+
+class SharedTokenBucket(TokenBucket):
+    """
+    Token bucket whose state is kept in `path` under an exclusive file lock,
+    so every process on the host draws from the same quota.
+    """
+
+    def __init__(self, path: str, rate_per_minute: float, burst: Optional[int] = None):
+        super().__init__(rate_per_minute, burst)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def _locked(self, update: Callable[[], Any]) -> Any:
+        """Load the shared state, run `update` on it and write it back, under the lock."""
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            raw = os.read(fd, 64).split()
+            # Wall clock: monotonic clocks aren't comparable across processes
+            now = time.time()
+            if len(raw) == 2:
+                tokens, updated_at = float(raw[0]), float(raw[1])
+                self.tokens = min(self.capacity, tokens + max(0.0, now - updated_at) * self.rate)
+            else:
+                self.tokens = float(self.capacity)
+            result = update()
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.ftruncate(fd, 0)
+            os.write(fd, f'{self.tokens} {now}'.encode())
+            return result
+        finally:
+            os.close(fd)
+
+    def _refill(self):
+        pass
+
+    def try_acquire(self) -> float:
+        return self._locked(super().try_acquire)
+
+    def drain(self):
+        self._locked(super().drain)
+
+    @property
+    def available(self) -> float:
+        return self._locked(lambda: self.tokens)
+
+
+class _QueuedCall:
+    __slots__ = ('key', 'fn', 'priority', 'future', 'enqueued_at', 'waiters', 'dispatched')
+
+    def __init__(self, key: Hashable, fn: Callable, priority: int):
+        self.key = key
+        self.fn = fn
+        self.priority = priority
+        self.future = Future()
+        self.enqueued_at = time.monotonic()
+        self.waiters = 1
+        self.dispatched = False
+
+
+class RequestScheduler:
+    """
+    Priority queue in front of a token bucket.
+
+    A single dispatcher thread hands calls to a small worker pool whenever a
+    token is available; callers block on a Future with their own deadline.
+    """
+
+    def __init__(
+        self,
+        calls_per_minute: float = 5,
+        burst: Optional[int] = None,
+        max_workers: int = 4,
+        name: str = 'provider',
+        bucket: Optional[TokenBucket] = None
+    ):
+        self.name = name
+        self.bucket = bucket or TokenBucket(calls_per_minute, burst)
+        self._heap = []
+        self._pending: Dict[Hashable, _QueuedCall] = {}
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=f'{name}-scheduler'
+        )
+        self._waits = deque(maxlen=200)
+        self._counters = {
+            'submitted': 0,
+            'dispatched': 0,
+            'deduplicated': 0,
+            'cancelled': 0,
+            'throttled': 0,
+        }
+        self._dispatcher = threading.Thread(
+            target=self._run, name=f'{name}-dispatcher', daemon=True
+        )
+        self._dispatcher.start()
+
+    def submit(self, key: Hashable, fn: Callable[[], Any], priority: int = PRIORITY_INTERACTIVE) -> Future:
+        """
+        Queue `fn` under `key`. If an identical call is already queued or in
+        flight, its Future is shared instead of issuing a second request.
+        """
+        with self._cond:
+            self._counters['submitted'] += 1
+            queued = self._pending.get(key)
+            if queued is not None:
+                queued.waiters += 1
+                self._counters['deduplicated'] += 1
+                if not queued.dispatched and priority < queued.priority:
+                    # Re-queue at the higher priority; the stale heap entry is skipped.
+                    queued.priority = priority
+                    heapq.heappush(self._heap, (priority, next(self._seq), queued))
+                    self._cond.notify()
+                return queued.future
+
+            queued = _QueuedCall(key, fn, priority)
+            self._pending[key] = queued
+            heapq.heappush(self._heap, (priority, next(self._seq), queued))
+            self._cond.notify()
+            return queued.future
+
+    def call(
+        self,
+        key: Hashable,
+        fn: Callable[[], Any],
+        priority: int = PRIORITY_INTERACTIVE,
+        timeout: Optional[float] = None
+    ) -> Any:
+        """Queue `fn` and wait for its result, raising SchedulerTimeout on deadline."""
+        future = self.submit(key, fn, priority)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeout:
+            self._abandon(key, future)
+            raise SchedulerTimeout(f'{self.name} call {key!r} timed out after {timeout}s')
+
+    def report_throttled(self):
+        """Provider said we're over quota: stop dispatching until the bucket refills."""
+        with self._cond:
+            self.bucket.drain()
+            self._counters['throttled'] += 1
+
+    def fail_queued(self, error: Exception) -> int:
+        """
+        Fail every call still waiting for a token with `error` (e.g. once the
+        provider's breaker opens), so callers fall back now instead of at
+        their deadline. Calls already in flight are left alone.
+        """
+        with self._cond:
+            queued = [call for call in self._pending.values() if not call.dispatched]
+            for call in queued:
+                del self._pending[call.key]
+                call.future.set_exception(error)
+            self._counters['cancelled'] += len(queued)
+            self._cond.notify()
+            return len(queued)
+
+    def stats(self) -> Dict:
+        """Queue depth, wait times and counters for monitoring."""
+        with self._cond:
+            waits = sorted(self._waits)
+            queued = sum(1 for call in self._pending.values() if not call.dispatched)
+            return {
+                'name': self.name,
+                'queue_depth': queued,
+                'in_flight': len(self._pending) - queued,
+                'tokens_available': round(self.bucket.available, 2),
+                'avg_wait_ms': int(sum(waits) / len(waits) * 1000) if waits else 0,
+                'p95_wait_ms': int(waits[min(len(waits) - 1, int(len(waits) * 0.95))] * 1000) if waits else 0,
+                'max_wait_ms': int(waits[-1] * 1000) if waits else 0,
+                **self._counters,
+            }
+
+    def _abandon(self, key: Hashable, future: Future):
+        with self._cond:
+            queued = self._pending.get(key)
+            if queued is None or queued.future is not future:
+                return
+            queued.waiters -= 1
+            if queued.waiters <= 0 and not queued.dispatched:
+                del self._pending[key]
+                queued.future.cancel()
+                self._counters['cancelled'] += 1
+
+    def _next_call(self) -> _QueuedCall:
+        """Block until a call is queued and a token is available."""
+        with self._cond:
+            while True:
+                while self._heap:
+                    priority, _, queued = self._heap[0]
+                    if queued.dispatched or queued.future.done() or priority != queued.priority:
+                        heapq.heappop(self._heap)
+                        continue
+                    break
+
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+
+                wait = self.bucket.try_acquire()
+                if wait > 0:
+                    # A higher-priority call may arrive while we wait.
+                    self._cond.wait(timeout=wait)
+                    continue
+
+                _, _, queued = heapq.heappop(self._heap)
+                queued.dispatched = True
+                self._counters['dispatched'] += 1
+                self._waits.append(time.monotonic() - queued.enqueued_at)
+                return queued
+
+    def _run(self):
+        while True:
+            queued = self._next_call()
+            self._executor.submit(self._execute, queued)
+
+    def _execute(self, queued: _QueuedCall):
+        try:
+            result = queued.fn()
+        except Exception as e:
+            queued.future.set_exception(e)
+        else:
+            queued.future.set_result(result)
+        finally:
+            with self._cond:
+                if self._pending.get(queued.key) is queued:
+                    del self._pending[queued.key]
+
+
+_schedulers: Dict[str, RequestScheduler] = {}
+_schedulers_lock = threading.Lock()
+
+
+def get_scheduler(name: str = 'alpha_vantage') -> RequestScheduler:
+    """Get the process-wide scheduler for a provider, configured from settings."""
+    scheduler = _schedulers.get(name)
+    if scheduler is None:
+        with _schedulers_lock:
+            scheduler = _schedulers.get(name)
+            if scheduler is None:
+                config = getattr(settings, 'ALPHA_VANTAGE_RATE_LIMIT', {})
+                bucket = None
+                state_dir = config.get('state_dir')
+                if state_dir and fcntl is not None:
+                    bucket = SharedTokenBucket(
+                        os.path.join(state_dir, f'{name}.bucket'),
+                        config.get('calls_per_minute', 5),
+                        config.get('burst'),
+                    )
+                scheduler = RequestScheduler(
+                    calls_per_minute=config.get('calls_per_minute', 5),
+                    burst=config.get('burst'),
+                    max_workers=config.get('max_workers', 4),
+                    name=name,
+                    bucket=bucket,
+                )
+                _schedulers[name] = scheduler
+    return scheduler
@@ -0,0 +1,83 @@
+"""
+Singleflight - Coalesce concurrent identical calls into one.
+
+The first caller for a key runs the function; callers arriving while it is
+in flight wait for that result instead of starting their own call. Results
+are not retained once the call finishes (that is the cache's job), so a
+failure is shared only with callers that were already waiting for it.
+"""
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class SingleFlightTimeout(TimeoutError):
+    """Raised to a waiter when the in-flight call doesn't finish in time."""
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Per-key call coalescing across the threads of one process."""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.coalesced = 0
+        self.timeouts = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any], timeout: Optional[float] = None) -> Any:
+        """
+        Return fn()'s result, sharing one execution among concurrent callers
+        with the same key. Exceptions raised by fn reach every caller; a
+        waiter gives up with SingleFlightTimeout after `timeout` seconds
+        (the call itself keeps running for the others).
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+
+        if leader:
+            try:
+                call.result = fn()
+            except BaseException as e:
+                call.error = e
+                raise
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+            return call.result
+
+        if not call.done.wait(timeout):
+            with self._lock:
+                self.timeouts += 1
+            raise SingleFlightTimeout(f'In-flight call for {key!r} did not finish within {timeout}s')
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def stats(self) -> Dict:
+        """Counters for monitoring."""
+        with self._lock:
+            in_flight = len(self._calls)
+        return {
+            'calls': self.calls,
+            'coalesced': self.coalesced,
+            'timeouts': self.timeouts,
+            'in_flight': in_flight,
+        }
@@ -0,0 +1,185 @@
+"""
+Tick Simulator - Synthetic intraday ticks for load and latency testing.
+
+Drives a sector-correlated random walk over a MockUniverse: every step draws
+one shock per sector plus an idiosyncratic shock per stock, so stocks in the
+same sector move together. Recent ticks are kept in fixed-size per-symbol
+ring buffers, and the stream is exposed as a plain iterator paced at a
+configurable rate. Runs entirely offline.
+"""
+import math
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+
+class Tick:
+    """A single simulated trade print."""
+
+    __slots__ = ('symbol', 'row', 'price', 'change_percent', 'timestamp')
+
+    def __init__(self, symbol: str, row: int, price: float, change_percent: float, timestamp: float):
+        self.symbol = symbol
+        self.row = row
+        self.price = price
+        self.change_percent = change_percent
+        self.timestamp = timestamp
+
+    def __repr__(self):
+        return f'Tick({self.symbol} {self.price:.2f} {self.change_percent:+.2f}%)'
+
+
+class TickRingBuffers:
+    """Last `capacity` ticks per symbol, stored as (symbols, capacity) arrays."""
+
+    def __init__(self, n_symbols: int, capacity: int = 128):
+        self.capacity = capacity
+        self.prices = np.zeros((n_symbols, capacity), dtype=np.float32)
+        self.timestamps = np.zeros((n_symbols, capacity), dtype=np.float64)
+        self.heads = np.zeros(n_symbols, dtype=np.int64)
+        self.counts = np.zeros(n_symbols, dtype=np.int64)
+
+    def push(self, rows: np.ndarray, prices: np.ndarray, timestamp: float):
+        """Append one tick for each of `rows` (rows must be unique)."""
+        slots = self.heads[rows]
+        self.prices[rows, slots] = prices
+        self.timestamps[rows, slots] = timestamp
+        self.heads[rows] = (slots + 1) % self.capacity
+        self.counts[rows] = np.minimum(self.counts[rows] + 1, self.capacity)
+
+    def recent(self, row: int, n: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """(timestamps, prices) of the latest `n` ticks for a row, oldest first."""
+        count = int(self.counts[row])
+        n = count if n is None else min(n, count)
+        idx = (self.heads[row] - n + np.arange(n)) % self.capacity
+        return self.timestamps[row, idx], self.prices[row, idx]
+
+
+class IntradayTickSimulator:
+    """
+    Sector-correlated random walk over a MockUniverse.
+
+    `sector_weight` is the share of each stock's variance explained by its
+    sector; `tick_volatility_bps` is the standard deviation of one tick's
+    return in basis points.
+    """
+
+    def __init__(
+        self,
+        universe,
+        ticks_per_second: float = 50,
+        ring_size: int = 128,
+        sector_weight: float = 0.6,
+        tick_volatility_bps: float = 5,
+        seed: Optional[int] = None
+    ):
+        self.universe = universe
+        self.ticks_per_second = ticks_per_second
+        self.sector_loading = math.sqrt(sector_weight)
+        self.idio_loading = math.sqrt(1 - sector_weight)
+        self.sigma = tick_volatility_bps / 10000
+        self.rng = np.random.default_rng(seed)
+
+        # The day's mock snapshot is the starting point of the walk
+        self.previous_close = universe.base_prices.astype(float)
+        self.prices = universe.prices.astype(float).copy()
+        self.buffers = TickRingBuffers(len(universe), ring_size)
+        self.ticks_generated = 0
+
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def step(self, batch_size: int) -> List[Tick]:
+        """Advance the walk for `batch_size` distinct symbols and return their ticks."""
+        n = len(self.universe)
+        batch_size = min(batch_size, n)
+        rows = self.rng.choice(n, size=batch_size, replace=False)
+
+        sector_shocks = self.rng.standard_normal(len(self.universe.sector_names))
+        idio_shocks = self.rng.standard_normal(batch_size)
+        shocks = (
+            self.sector_loading * sector_shocks[self.universe.sector_ids[rows]]
+            + self.idio_loading * idio_shocks
+        )
+        now = time.time()
+
+        with self._lock:
+            self.prices[rows] *= np.exp(self.sigma * shocks)
+            prices = self.prices[rows]
+            self.buffers.push(rows, prices, now)
+            self.ticks_generated += batch_size
+
+        changes = (prices / self.previous_close[rows] - 1) * 100
+        symbols = self.universe.symbols
+        return [
+            Tick(symbols[row], int(row), round(float(price), 2), round(float(change), 2), now)
+            for row, price, change in zip(rows, prices, changes)
+        ]
+
+    def stream(self, limit: Optional[int] = None, realtime: bool = True) -> Iterator[Tick]:
+        """
+        Yield ticks, paced at `ticks_per_second` when `realtime` is set.
+        Ticks are produced in small vectorized batches (about 10 per second).
+        """
+        batch_size = max(1, int(self.ticks_per_second / 10))
+        interval = batch_size / self.ticks_per_second
+        emitted = 0
+        next_batch = time.monotonic()
+
+        while limit is None or emitted < limit:
+            if realtime:
+                delay = next_batch - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                next_batch += interval
+
+            for tick in self.step(batch_size):
+                yield tick
+                emitted += 1
+                if limit is not None and emitted >= limit:
+                    return
+
+    __iter__ = stream
+
+    def change_percent(self) -> np.ndarray:
+        """Snapshot of every symbol's change from previous close, in %."""
+        with self._lock:
+            prices = self.prices.copy()
+        return np.round((prices / self.previous_close - 1) * 100, 2)
+
+    def latest_price(self, row: int) -> float:
+        return round(float(self.prices[row]), 2)
+
+    def recent_ticks(self, symbol: str, n: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """(timestamps, prices) of a symbol's most recent ticks, oldest first."""
+        with self._lock:
+            timestamps, prices = self.buffers.recent(self.universe.index[symbol], n)
+            return timestamps.copy(), prices.copy()
+
+    def start(self):
+        """Run the stream on a background thread until stop()."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+
+        def run():
+            for _ in self.stream():
+                if self._stop.is_set():
+                    break
+
+        self._thread = threading.Thread(target=run, name='mock-tick-simulator', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def stats(self) -> Dict:
+        return {
+            'symbols': len(self.universe),
+            'ticks_per_second': self.ticks_per_second,
+            'ticks_generated': self.ticks_generated,
+            'running': bool(self._thread and self._thread.is_alive()),
+        }
@@ -0,0 +1,199 @@
+"""
+Time Series Store - Append-only, memory-mapped daily OHLCV history.
+
+Each symbol gets a directory with one raw binary file per column. Reads
+memory-map the files and hand out zero-copy NumPy views; writes only append
+dates newer than the last stored bar. The date column is written last and
+defines the committed row count, so a crashed append never exposes a
+partial row.
+"""
+import os
+import threading
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows dev machines
+    fcntl = None
+
+
+DATE_DTYPE = np.dtype('<M8[D]')
+VALUE_COLUMNS = ('open', 'high', 'low', 'close', 'adj_close', 'volume')
+VALUE_DTYPE = np.dtype('<f8')
+
+# Alpha Vantage field names per column, in order of preference. The adjusted
+# series numbers volume as field 6, the unadjusted one as field 5.
+ALPHA_VANTAGE_FIELDS = {
+    'open': ('1. open',),
+    'high': ('2. high',),
+    'low': ('3. low',),
+    'close': ('4. close',),
+    'adj_close': ('5. adjusted close', '4. close'),
+    'volume': ('6. volume', '5. volume'),
+}
+
+
+class DailyBars:
+    """Column views over a symbol's daily history, oldest bar first."""
+
+    __slots__ = ('symbol', 'dates') + VALUE_COLUMNS
+
+    def __init__(self, symbol: str, dates: np.ndarray, columns: Dict[str, np.ndarray]):
+        self.symbol = symbol
+        self.dates = dates
+        for name in VALUE_COLUMNS:
+            setattr(self, name, columns[name])
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    @property
+    def last_date(self) -> Optional[date]:
+        return self.dates[-1].astype(date) if len(self.dates) else None
+
+    def tail(self, n: int) -> 'DailyBars':
+        """Zero-copy view of the latest `n` bars."""
+        start = max(0, len(self.dates) - n)
+        return DailyBars(
+            self.symbol,
+            self.dates[start:],
+            {name: getattr(self, name)[start:] for name in VALUE_COLUMNS},
+        )
+
+    @classmethod
+    def empty(cls, symbol: str) -> 'DailyBars':
+        return cls(
+            symbol,
+            np.empty(0, dtype=DATE_DTYPE),
+            {name: np.empty(0, dtype=VALUE_DTYPE) for name in VALUE_COLUMNS},
+        )
+
+
+class TimeSeriesStore:
+    """On-disk columnar store for daily bars, one directory per symbol."""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def read(self, symbol: str) -> DailyBars:
+        """Memory-map a symbol's committed history (empty if none stored)."""
+        path = self._symbol_dir(symbol)
+        rows = self._committed_rows(path)
+        if rows == 0:
+            return DailyBars.empty(symbol)
+
+        dates = np.memmap(path / 'date.bin', dtype=DATE_DTYPE, mode='r', shape=(rows,))
+        columns = {
+            name: np.memmap(path / f'{name}.bin', dtype=VALUE_DTYPE, mode='r', shape=(rows,))
+            for name in VALUE_COLUMNS
+        }
+        return DailyBars(symbol, dates, columns)
+
+    def last_date(self, symbol: str) -> Optional[date]:
+        path = self._symbol_dir(symbol)
+        rows = self._committed_rows(path)
+        if rows == 0:
+            return None
+        last = np.fromfile(path / 'date.bin', dtype=DATE_DTYPE, count=1, offset=(rows - 1) * DATE_DTYPE.itemsize)
+        return last[0].astype(date)
+
+    def symbols(self) -> Iterable[str]:
+        if not self.root.exists():
+            return []
+        return sorted(p.name for p in self.root.iterdir() if (p / 'date.bin').exists())
+
+    def append(self, symbol: str, dates: np.ndarray, columns: Dict[str, np.ndarray]) -> int:
+        """
+        Append bars newer than the last stored date.
+        Input may be in any order. Returns the number of rows written.
+        """
+        dates = np.asarray(dates, dtype=DATE_DTYPE)
+        order = np.argsort(dates, kind='stable')
+
+        with self._lock(symbol):
+            path = self._symbol_dir(symbol)
+            path.mkdir(parents=True, exist_ok=True)
+
+            with open(path / '.lock', 'a') as lock_file:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+                sorted_dates = dates[order]
+                new = np.ones(len(sorted_dates), dtype=bool)
+                # Drop duplicate dates within the batch and anything already stored
+                new[1:] = sorted_dates[1:] != sorted_dates[:-1]
+                last = self.last_date(symbol)
+                if last is not None:
+                    new &= sorted_dates > np.datetime64(last, 'D')
+                if not new.any():
+                    return 0
+
+                rows = self._committed_rows(path)
+                for name in VALUE_COLUMNS:
+                    values = np.asarray(columns[name], dtype=VALUE_DTYPE)[order][new]
+                    self._write_at(path / f'{name}.bin', values, rows * VALUE_DTYPE.itemsize)
+                # Date column last: it commits the new rows
+                self._write_at(path / 'date.bin', sorted_dates[new], rows * DATE_DTYPE.itemsize)
+                return int(new.sum())
+
+    def append_alpha_vantage(self, symbol: str, time_series: Dict[str, Dict]) -> int:
+        """Append a TIME_SERIES_DAILY(_ADJUSTED) "Time Series (Daily)" block."""
+        dates, columns = bars_from_alpha_vantage(time_series)
+        return self.append(symbol, dates, columns)
+
+    def _symbol_dir(self, symbol: str) -> Path:
+        return self.root / symbol.upper().replace('/', '_')
+
+    def _committed_rows(self, path: Path) -> int:
+        try:
+            return os.path.getsize(path / 'date.bin') // DATE_DTYPE.itemsize
+        except OSError:
+            return 0
+
+    @staticmethod
+    def _write_at(file_path: Path, values: np.ndarray, offset: int):
+        # Truncate any tail left behind by an interrupted append, then extend.
+        with open(file_path, 'r+b' if file_path.exists() else 'wb') as f:
+            f.truncate(offset)
+            f.seek(offset)
+            f.write(values.tobytes())
+
+    def _lock(self, symbol: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(symbol.upper(), threading.Lock())
+
+
+def bars_from_alpha_vantage(time_series: Dict[str, Dict]) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """Convert Alpha Vantage daily JSON into (dates, columns) arrays."""
+    keys = list(time_series.keys())
+    dates = np.array(keys, dtype=DATE_DTYPE)
+    columns = {
+        name: np.array([_field(time_series[k], fields) for k in keys], dtype=VALUE_DTYPE)
+        for name, fields in ALPHA_VANTAGE_FIELDS.items()
+    }
+    return dates, columns
+
+
+def _field(bar: Dict, fields: Tuple[str, ...]) -> float:
+    for field in fields:
+        if field in bar:
+            return float(bar[field])
+    return 0.0
+
+
+_store: Optional[TimeSeriesStore] = None
+
+
+def get_timeseries_store() -> TimeSeriesStore:
+    """Get the process-wide time series store."""
+    global _store
+    if _store is None:
+        _store = TimeSeriesStore(getattr(settings, 'MARKET_DATA_STORE_DIR', settings.BASE_DIR / 'data' / 'timeseries'))
+    return _store
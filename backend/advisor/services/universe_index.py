@@ -0,0 +1,106 @@
+"""
+Universe Index - Lookup structures over a symbol universe held in arrays.
+
+Maps symbols to row ids, sectors to their member rows and name prefixes to
+matching rows, and computes per-sector aggregates with grouped reductions
+(np.bincount) instead of Python loops, so sector figures are always derived
+from the same constituents the movers come from.
+"""
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+class UniverseIndex:
+    """Read-only index built once per universe; safe to share across threads."""
+
+    def __init__(self, symbols: Sequence[str], names: Sequence[str],
+                 sector_names: Sequence[str], sector_ids: np.ndarray):
+        self.symbols = symbols
+        self.sector_names = list(sector_names)
+        self.sector_ids = np.asarray(sector_ids, dtype=np.intp)
+        self.rows: Dict[str, int] = {symbol: row for row, symbol in enumerate(symbols)}
+        # Bare tickers ('INFY' for 'INFY.NS'), to match symbols across exchanges
+        self.tickers: Dict[str, int] = {
+            symbol.split('.')[0].upper(): row for row, symbol in enumerate(symbols)
+        }
+        self.sector_rows: Dict[str, int] = {name: i for i, name in enumerate(self.sector_names)}
+
+        # Rows grouped by sector: members of sector i are _by_sector[_offsets[i]:_offsets[i + 1]]
+        self.sector_counts = np.bincount(self.sector_ids, minlength=len(self.sector_names))
+        self._by_sector = np.argsort(self.sector_ids, kind='stable')
+        self._offsets = np.concatenate(([0], np.cumsum(self.sector_counts)))
+
+        # Sorted (key, row) pairs for prefix search over names and symbols
+        keys = [(name.lower(), row) for row, name in enumerate(names)]
+        keys += [(symbol.lower(), row) for row, symbol in enumerate(symbols)]
+        keys.sort()
+        self._prefix_keys = [key for key, _ in keys]
+        self._prefix_rows = [row for _, row in keys]
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self.rows
+
+    def __getitem__(self, symbol: str) -> int:
+        return self.rows[symbol]
+
+    def get(self, symbol: str, default: Optional[int] = None) -> Optional[int]:
+        return self.rows.get(symbol, default)
+
+    def members(self, sector: str) -> np.ndarray:
+        """Row ids of a sector's constituents (a view; empty for unknown sectors)."""
+        sector_id = self.sector_rows.get(sector)
+        if sector_id is None:
+            return self._by_sector[:0]
+        return self._by_sector[self._offsets[sector_id]:self._offsets[sector_id + 1]]
+
+    def find(self, symbol: str) -> Optional[int]:
+        """Row for `symbol`, ignoring any exchange suffix ('INFY.BSE' finds 'INFY.NS')."""
+        row = self.rows.get(symbol)
+        if row is None:
+            row = self.tickers.get(symbol.split('.')[0].upper())
+        return row
+
+    def peers(self, symbol: str, count: int) -> List[int]:
+        """Rows of up to `count` other constituents of `symbol`'s sector, in universe order."""
+        row = self.find(symbol)
+        if row is None:
+            return []
+        members = self.members(self.sector_names[self.sector_ids[row]])
+        return [int(member) for member in members if member != row][:count]
+
+    def search(self, prefix: str, limit: int = 10) -> List[int]:
+        """Rows whose name or symbol starts with `prefix` (case-insensitive)."""
+        prefix = prefix.lower()
+        if not prefix:
+            return []
+        matches = []
+        seen = set()
+        for i in range(bisect_left(self._prefix_keys, prefix), len(self._prefix_keys)):
+            if not self._prefix_keys[i].startswith(prefix):
+                break
+            row = self._prefix_rows[i]
+            if row not in seen:
+                seen.add(row)
+                matches.append(row)
+                if len(matches) >= limit:
+                    break
+        return matches
+
+    def sector_means(self, values: np.ndarray, weights: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Per-sector (optionally weighted) mean of a per-row array.
+        Sectors without constituents come out as NaN.
+        """
+        if weights is None:
+            totals = np.bincount(self.sector_ids, weights=values, minlength=len(self.sector_names))
+            counts = self.sector_counts
+        else:
+            totals = np.bincount(self.sector_ids, weights=values * weights, minlength=len(self.sector_names))
+            counts = np.bincount(self.sector_ids, weights=weights, minlength=len(self.sector_names))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return totals / counts
@@ -13,10 +13,11 @@ from .views import (
     # Readiness
     ReadinessView, ReadinessHistoryView,
     # Market
-    MarketRawView, MarketSummaryView, MarketExplainedView,
-    MarketRiskView, SectorsView, MoversView,
+    MarketRawView, MarketHealthView, MarketSummaryView, MarketExplainedView,
+    MarketRiskView, SectorsView, MoversView, market_stream, market_explained_stream,
     # Advice
-    DailyAdviceView, PatternInsightView, EducationView, BeginnerExplainView,
+    DailyAdviceView, PatternInsightView, EducationView, AIHealthView,
+    beginner_explain, beginner_explain_stream,
     # Notifications
     NotificationPreviewView,
 )
@@ -51,9 +52,12 @@ urlpatterns = [
     # Market endpoints
     # ============================================
     path('market/raw/', MarketRawView.as_view(), name='market-raw'),
+    path('market/health/', MarketHealthView.as_view(), name='market-health'),
     path('market/summary/', MarketSummaryView.as_view(), name='market-summary'),
     path('market/explained/', MarketExplainedView.as_view(), name='market-explained'),
+    path('market/explained/stream/', market_explained_stream, name='market-explained-stream'),
     path('market/risk/', MarketRiskView.as_view(), name='market-risk'),
+    path('market/stream/', market_stream, name='market-stream'),
     path('sectors/', SectorsView.as_view(), name='sectors'),
     path('movers/', MoversView.as_view(), name='movers'),
     
@@ -63,7 +67,9 @@ urlpatterns = [
     path('advice/today/', DailyAdviceView.as_view(), name='advice-today'),
     path('insights/pattern/', PatternInsightView.as_view(), name='pattern-insight'),
     path('education/today/', EducationView.as_view(), name='education'),
-    path('explain/', BeginnerExplainView.as_view(), name='explain'),
+    path('explain/', beginner_explain, name='explain'),
+    path('explain/stream/', beginner_explain_stream, name='explain-stream'),
+    path('ai/health/', AIHealthView.as_view(), name='ai-health'),
     
     # ============================================
     # Notifications
@@ -1,6 +1,8 @@
 """
 API Views for WealthWiz advisor app.
 """
+from datetime import datetime
+
 from rest_framework import status, generics, viewsets
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
@@ -8,6 +10,9 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth.models import User
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
 
 from .models import (
     Profile, FinancialProfile, RiskProfile,
@@ -21,8 +26,12 @@ from .serializers import (
     MarketExplanationSerializer, DailyAdviceSerializer
 )
 from .services import (
-    MarketDataService, ReadinessEngine, AdviceEngine
+    MarketDataService, ReadinessEngine, AdviceEngine, get_llm_stats, get_market_snapshot
 )
+from .services.llm_client import LLMError
+from .services.market_data import to_json_ready
+from .services.market_risk import get_risk_tracker
+from .services.market_stream import format_event, market_event_stream, market_event_stream_sync
 
 
 # ============================================
@@ -156,8 +165,7 @@ class ReadinessView(APIView):
         risk, _ = RiskProfile.objects.get_or_create(user=user)
         
         # Get market risk
-        market_service = MarketDataService()
-        market_risk = market_service.get_market_risk_level()
+        market_risk = get_market_snapshot().risk
         
         # Calculate readiness
         engine = ReadinessEngine()
@@ -201,11 +209,20 @@ class MarketRawView(APIView):
         service = MarketDataService()
         symbol = request.query_params.get('symbol', 'NIFTY50')
         
-        return Response({
+        return Response(to_json_ready({
             'index': service.get_index_data(symbol),
             'sectors': service.get_sector_performance(),
             'movers': service.get_top_movers(),
-        })
+            'timestamp': datetime.now().isoformat(),
+        }))
+
+
+class MarketHealthView(APIView):
+    """Provider circuit breakers, negative cache, rate limiter and cache stats."""
+    permission_classes = [AllowAny]
+    
+    def get(self, request):
+        return Response(MarketDataService.get_health())
 
 
 class MarketSummaryView(APIView):
@@ -213,9 +230,7 @@ class MarketSummaryView(APIView):
     permission_classes = [AllowAny]
     
     def get(self, request):
-        service = MarketDataService()
-        summary = service.get_market_summary()
-        return Response(summary)
+        return Response(to_json_ready(get_market_snapshot().summary))
 
 
 class MarketExplainedView(APIView):
@@ -228,13 +243,25 @@ class MarketExplainedView(APIView):
         return Response(explanation)
 
 
+@require_GET
+def market_explained_stream(request):
+    """
+    Market explanation as Server-Sent Events: a `meta` event with the
+    headline fields, `token` events as the AI summary arrives, then `done`.
+    """
+    meta, chunks = AdviceEngine().stream_market_explanation()
+    return _llm_event_response(chunks, meta)
+
+
 class MarketRiskView(APIView):
     """Current market risk level."""
     permission_classes = [AllowAny]
     
     def get(self, request):
-        service = MarketDataService()
-        return Response(service.get_market_risk_level())
+        risk = get_market_snapshot().risk
+        if request.query_params.get('history'):
+            risk = {**risk, 'history': get_risk_tracker().history()}
+        return Response(risk)
 
 
 class SectorsView(APIView):
@@ -243,7 +270,7 @@ class SectorsView(APIView):
     
     def get(self, request):
         engine = AdviceEngine()
-        return Response(engine.get_sector_insights())
+        return Response(to_json_ready(engine.get_sector_insights()))
 
 
 class MoversView(APIView):
@@ -251,9 +278,33 @@ class MoversView(APIView):
     permission_classes = [AllowAny]
     
     def get(self, request):
-        service = MarketDataService()
         count = int(request.query_params.get('count', 5))
-        return Response(service.get_top_movers(count))
+        
+        # Served from the precomputed snapshot unless more movers are requested
+        snapshot = get_market_snapshot()
+        movers = snapshot.top_movers(count)
+        timestamp = snapshot.timestamp
+        if movers is None:
+            movers = MarketDataService().get_top_movers(count)
+            timestamp = datetime.now().isoformat()
+        return Response(to_json_ready({**movers, 'timestamp': timestamp}))
+
+
+@require_GET
+def market_stream(request):
+    """
+    Server-Sent Events stream of market changes (index, sectors, movers, mood).
+    Sends the full state on connect, then diffs whenever the snapshot changes.
+    """
+    if isinstance(request, ASGIRequest):
+        events = market_event_stream()
+    else:
+        events = market_event_stream_sync()
+    
+    response = StreamingHttpResponse(events, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
 
 
 # ============================================
@@ -272,8 +323,7 @@ class DailyAdviceView(APIView):
         risk, _ = RiskProfile.objects.get_or_create(user=user)
         
         # Get market risk
-        market_service = MarketDataService()
-        market_risk = market_service.get_market_risk_level()
+        market_risk = get_market_snapshot().risk
         
         # Calculate readiness
         readiness_engine = ReadinessEngine()
@@ -317,14 +367,64 @@ class EducationView(APIView):
         return Response(engine.get_education_card(topic))
 
 
-class BeginnerExplainView(APIView):
-    """Explain anything for a beginner."""
+@require_GET
+def beginner_explain(request):
+    """
+    Explain anything for a beginner. Generations go through the LLM gate, so
+    a burst of slow ones is capped and degrades instead of taking every
+    worker thread.
+    """
+    context = request.GET.get('q', 'What does this mean for me?')
+    return JsonResponse(AdviceEngine().get_beginner_explanation(context))
+
+
+class AIHealthView(APIView):
+    """LLM provider latency, response cache, coalescing and concurrency stats."""
     permission_classes = [AllowAny]
     
     def get(self, request):
-        context = request.query_params.get('q', 'What does this mean for me?')
-        engine = AdviceEngine()
-        return Response(engine.get_beginner_explanation(context))
+        return Response(get_llm_stats())
+
+
+@require_GET
+def beginner_explain_stream(request):
+    """Beginner explanation streamed as Server-Sent Events (`token` events, then `done`)."""
+    context = request.GET.get('q', 'What does this mean for me?')
+    chunks = AdviceEngine().stream_beginner_explanation(context)
+    return _llm_event_response(chunks, {'context': context})
+
+
+def _llm_event_response(chunks, meta: dict) -> StreamingHttpResponse:
+    """
+    SSE response relaying LLM text chunks; failures end the stream with an
+    `error` event. `meta` waits for the first chunk so it can name the
+    provider that actually produced the stream.
+    """
+    def events():
+        stream = iter(chunks)
+        try:
+            chunk = next(stream, None)
+        except LLMError as e:
+            yield format_event('meta', meta)
+            yield format_event('error', {'error': str(e)})
+            return
+        provider = getattr(stream, 'provider', None)
+        yield format_event('meta', {**meta, 'provider': provider} if provider else meta)
+        text = []
+        try:
+            while chunk is not None:
+                text.append(chunk)
+                yield format_event('token', {'text': chunk})
+                chunk = next(stream, None)
+        except LLMError as e:
+            yield format_event('error', {'error': str(e)})
+            return
+        yield format_event('done', {'text': ''.join(text)})
+    
+    response = StreamingHttpResponse(events(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
 
 
 # ============================================
@@ -352,8 +452,7 @@ class NotificationPreviewView(APIView):
                 })
         
         # Market alert preview
-        market_service = MarketDataService()
-        risk = market_service.get_market_risk_level()
+        risk = get_market_snapshot().risk
         
         if risk['risk_level'] == 'HIGH':
             notifications.append({
@@ -0,0 +1,47 @@
+"""
+Prebuild learn-page payloads for the watchlist, e.g. from cron after the close:
+
+    python manage.py prewarm_learn
+    python manage.py prewarm_learn --symbols INFY.BSE,TCS.BSE --processes 4 --force
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from learn.prewarm import prewarm_learn_payloads
+
+
+class Command(BaseCommand):
+    help = 'Refresh stored history and prebuild learn-page payloads for the watchlist.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--symbols', help='Comma-separated symbols (default: LEARN_WATCHLIST)')
+        parser.add_argument('--processes', type=int, help='Worker processes for payload builds')
+        parser.add_argument('--force', action='store_true', help='Rebuild payloads that are already current')
+
+    def handle(self, *args, **options):
+        symbols = None
+        if options['symbols']:
+            symbols = [s.strip() for s in options['symbols'].split(',') if s.strip()]
+
+        start = time.perf_counter()
+        results = prewarm_learn_payloads(
+            symbols=symbols,
+            processes=options['processes'],
+            force=options['force'],
+        )
+        elapsed = time.perf_counter() - start
+
+        self.stdout.write(f"{'SYMBOL':<16} {'STATUS':<8} {'FETCH ms':>9} {'BUILD ms':>9}  ERROR")
+        for result in results:
+            line = (
+                f"{result['symbol']:<16} {result['status']:<8} "
+                f"{result['fetch_ms']:>9} {result['build_ms']:>9}  {result['error'] or ''}"
+            )
+            style = self.style.ERROR if result['status'] == 'failed' else self.style.SUCCESS
+            self.stdout.write(style(line))
+
+        failed = sum(1 for r in results if r['status'] == 'failed')
+        self.stdout.write(
+            f'{len(results) - failed}/{len(results)} symbols warm in {elapsed:.1f}s'
+        )
@@ -0,0 +1,65 @@
+"""
+Learn Payload Store - Built learn-page payloads persisted on disk.
+
+The in-memory payload cache is per process; this store lets a payload built
+once (by the nightly prewarm job or by any worker) be reused by every
+worker. One JSON file per symbol holds the payload for its latest bar date.
+"""
+import json
+import os
+import tempfile
+import threading
+from datetime import date
+from pathlib import Path
+from typing import Dict, Optional
+
+from django.conf import settings
+
+
+class LearnPayloadStore:
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def load(self, symbol: str, day: date) -> Optional[Dict]:
+        """The stored payload for `symbol` if it was built from bars up to `day`."""
+        try:
+            with open(self._path(symbol), encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("date") != day.isoformat():
+            return None
+        return entry.get("payload")
+
+    def save(self, symbol: str, day: date, payload: Dict):
+        """Atomically replace the stored payload for `symbol`."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"date": day.isoformat(), "payload": payload}, f)
+            os.replace(tmp_path, self._path(symbol))
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def _path(self, symbol: str) -> Path:
+        return self.root / f"{symbol.upper().replace('/', '_')}.json"
+
+
+_payload_store: Optional[LearnPayloadStore] = None
+_payload_store_lock = threading.Lock()
+
+
+def get_payload_store() -> LearnPayloadStore:
+    """Get the process-wide payload store rooted at LEARN_PAYLOAD_DIR."""
+    global _payload_store
+    if _payload_store is None:
+        with _payload_store_lock:
+            if _payload_store is None:
+                root = getattr(settings, "LEARN_PAYLOAD_DIR", None) or (
+                    Path(settings.BASE_DIR) / "data" / "learn"
+                )
+                _payload_store = LearnPayloadStore(root)
+    return _payload_store
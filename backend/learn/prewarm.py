@@ -0,0 +1,207 @@
+"""
+Learn Prewarm - Build learn-page payloads for a watchlist after the close.
+
+Runs in two stages so the first visitor of the day finds a warm payload:
+1. Bring the stored history of each symbol, its sector peers and the market
+   risk index series up to date. Fetches go through the shared Alpha
+   Vantage scheduler at background priority, so they respect the rate
+   limit and yield to interactive requests.
+2. Build the payloads (indicator computation) on a process pool, then
+   persist them to the payload store every worker reads from.
+
+Run it from cron with `manage.py prewarm_learn`, or enable the in-process
+daily schedule with LEARN_PREWARM_SCHEDULE.
+"""
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from django.conf import settings
+
+from advisor.services.market_data import NSE_CLOSE_TIME, NSE_TIMEZONE
+from advisor.services.market_risk import get_risk_tracker
+from advisor.services.request_scheduler import PRIORITY_BACKGROUND
+from advisor.services.timeseries_store import get_timeseries_store
+
+from .payload_store import get_payload_store
+from .views import (
+    cache_learn_payload, learn_payload_from_bars, load_daily_history, resolve_peers,
+    usable_peer_bars,
+)
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows dev machines
+    fcntl = None
+
+
+def _prewarm_config() -> Dict:
+    return {
+        'schedule': False,
+        'delay_minutes': 30,
+        'processes': 2,
+        'max_wait': 600,
+        **getattr(settings, 'LEARN_PREWARM', {}),
+    }
+
+
+def _init_worker():
+    # Workers started with spawn/forkserver need Django configured to read settings
+    import django
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'wealthwiz_backend.settings')
+    django.setup()
+
+
+def _build_in_worker(symbol: str):
+    """Process-pool task: build one payload from the stored history of the symbol and its peers."""
+    start = time.perf_counter()
+    store = get_timeseries_store()
+    bars = store.read(symbol)
+    if len(bars) < 2:
+        return symbol, None, None, 'Not enough time series data.', _elapsed_ms(start)
+    peers = resolve_peers(symbol)
+    peer_bars = usable_peer_bars(peers, [(store.read(peer), None) for peer in peers])
+    payload = learn_payload_from_bars(symbol, bars, peer_bars)
+    return symbol, bars.last_date, payload, None, _elapsed_ms(start)
+
+
+def _elapsed_ms(start: float) -> int:
+    return int((time.perf_counter() - start) * 1000)
+
+
+def prewarm_learn_payloads(
+    symbols: Optional[List[str]] = None,
+    processes: Optional[int] = None,
+    force: bool = False
+) -> List[Dict]:
+    """
+    Refresh history and build learn payloads for `symbols` (default: the
+    LEARN_WATCHLIST). Returns one result per symbol with its status
+    ('built', 'fresh' or 'failed'), timings and any error.
+    """
+    config = _prewarm_config()
+    symbols = list(dict.fromkeys(
+        s.upper() for s in (symbols or getattr(settings, 'LEARN_WATCHLIST', []))
+    ))
+    results = {
+        symbol: {'symbol': symbol, 'status': 'failed', 'fetch_ms': 0, 'build_ms': 0, 'error': None}
+        for symbol in symbols
+    }
+    if not symbols:
+        return []
+
+    def refresh(symbol: str):
+        start = time.perf_counter()
+        bars, error = load_daily_history(symbol, priority=PRIORITY_BACKGROUND, max_wait=config['max_wait'])
+        return symbol, bars, error, _elapsed_ms(start)
+
+    # Peers feed the trends section and the market risk window reads the
+    # stored index series, so their history is refreshed too
+    extras = [
+        extra for extra in dict.fromkeys(
+            [p for s in symbols for p in resolve_peers(s)] + [get_risk_tracker().config['index_symbol']]
+        )
+        if extra not in results
+    ]
+
+    # Stage 1: the scheduler paces these, so waiting on them concurrently is free
+    to_build = []
+    payload_store = get_payload_store()
+    with ThreadPoolExecutor(max_workers=min(16, len(symbols) + len(extras)), thread_name_prefix='learn-prewarm') as pool:
+        for symbol, bars, error, fetch_ms in pool.map(refresh, symbols + extras):
+            if symbol not in results:
+                if bars is None:
+                    print(f'[Learn] Could not refresh {symbol}: {error}')
+                continue
+            result = results[symbol]
+            result['fetch_ms'] = fetch_ms
+            if bars is None:
+                result['error'] = error
+            elif not force and payload_store.load(symbol, bars.last_date) is not None:
+                result['status'] = 'fresh'
+            else:
+                to_build.append(symbol)
+
+    # Stage 2: indicator computation and payload assembly off this process
+    if to_build:
+        workers = processes or config['processes']
+        # Spawn rather than fork: the web process already runs threads (schedulers,
+        # pools) whose locks a forked child could inherit held
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(to_build)),
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+        ) as pool:
+            for symbol, day, payload, error, build_ms in pool.map(_build_in_worker, to_build):
+                result = results[symbol]
+                result['build_ms'] = build_ms
+                if payload is None:
+                    result['error'] = error
+                    continue
+                try:
+                    payload_store.save(symbol, day, payload)
+                except OSError as e:
+                    result['error'] = f'Could not persist payload: {e}'
+                    continue
+                cache_learn_payload(symbol, day, payload)
+                result['status'] = 'built'
+
+    return list(results.values())
+
+
+def seconds_until_next_prewarm(now: Optional[datetime] = None) -> float:
+    """Seconds until `delay_minutes` after the next NSE close (weekdays only)."""
+    now = (now or datetime.now(NSE_TIMEZONE)).astimezone(NSE_TIMEZONE)
+    delay = timedelta(minutes=_prewarm_config()['delay_minutes'])
+    run_at = datetime.combine(now.date(), NSE_CLOSE_TIME, tzinfo=NSE_TIMEZONE) + delay
+    while run_at <= now or run_at.weekday() >= 5:
+        run_at = datetime.combine(run_at.date() + timedelta(days=1), NSE_CLOSE_TIME, tzinfo=NSE_TIMEZONE) + delay
+    return (run_at - now).total_seconds()
+
+
+def run_scheduled_prewarm():
+    """One scheduled run; skipped if another worker holds the prewarm lock."""
+    lock_dir = get_payload_store().root
+    lock_dir.mkdir(parents=True, exist_ok=True)
+    with open(lock_dir / '.prewarm.lock', 'w') as lock_file:
+        if fcntl is not None:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                print('[Learn] Prewarm already running in another worker, skipping.')
+                return
+
+        start = time.perf_counter()
+        results = prewarm_learn_payloads()
+        failed = [r['symbol'] for r in results if r['status'] == 'failed']
+        print(
+            f"[Learn] Prewarmed {len(results) - len(failed)}/{len(results)} symbols "
+            f"in {_elapsed_ms(start)} ms" + (f"; failed: {', '.join(failed)}" if failed else '')
+        )
+
+
+_schedule_thread: Optional[threading.Thread] = None
+_schedule_lock = threading.Lock()
+
+
+def start_prewarm_schedule():
+    """Start the daily after-close prewarm on a daemon thread (once per process)."""
+    global _schedule_thread
+    with _schedule_lock:
+        if _schedule_thread is not None:
+            return
+
+        def loop():
+            while True:
+                time.sleep(seconds_until_next_prewarm())
+                try:
+                    run_scheduled_prewarm()
+                except Exception as e:
+                    print(f'[Learn] Scheduled prewarm failed: {e}')
+
+        _schedule_thread = threading.Thread(target=loop, name='learn-prewarm-schedule', daemon=True)
+        _schedule_thread.start()
@@ -1,8 +1,10 @@
 # backend/learn/urls.py
 
 from django.urls import path
-from .views import get_infy_data
+from .views import get_bulk_data, get_infy_data, get_symbol_data
 
 urlpatterns = [
     path("infy/", get_infy_data, name="learn-infy"),
+    path("bulk/", get_bulk_data, name="learn-bulk"),
+    path("<str:symbol>/", get_symbol_data, name="learn-symbol"),
 ]
@@ -4,8 +4,22 @@ from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework import status
 
+import re
 import requests
-from typing import Tuple, Optional, Dict
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Tuple, Optional, Dict, List
+
+from advisor.services.cache import TTLCache
+from advisor.services.indicators import describe as describe_indicators, get_indicators
+from advisor.services.market_data import (
+    AlphaVantageProvider, MockMarketDataProvider, get_market_cache, last_session_date
+)
+from advisor.services.circuit_breaker import CircuitOpenError
+from advisor.services.request_scheduler import PRIORITY_INTERACTIVE, SchedulerTimeout
+from advisor.services.timeseries_store import DailyBars, get_timeseries_store
+
+from .payload_store import get_payload_store
 
 
 # ---------- MOCK DATA (your old hard‑coded JSON) ----------
@@ -80,7 +94,9 @@ MOCK_LEARN_DATA = {
 
 # ---------- HELPER: call Alpha Vantage & transform ----------
 
-def fetch_alpha_vantage_daily(symbol: str) -> Tuple[Optional[Dict], Optional[str]]:
+def fetch_alpha_vantage_daily(
+    symbol: str, priority: int = PRIORITY_INTERACTIVE, max_wait: Optional[float] = None
+) -> Tuple[Optional[Dict], Optional[str]]:
     """
     Fetch TIME_SERIES_DAILY_ADJUSTED data for the given symbol from Alpha Vantage.
     Returns (parsed_json, error_message).
@@ -89,19 +105,17 @@ def fetch_alpha_vantage_daily(symbol: str) -> Tuple[Optional[Dict], Optional[str
     if not api_key or api_key == "demo":
         return None, "Missing or demo Alpha Vantage API key."
 
-    url = "https://www.alphavantage.co/query"
+    # Goes through the shared Alpha Vantage rate-limit scheduler
+    provider = AlphaVantageProvider(api_key, priority=priority, max_wait=max_wait)
     params = {
         "function": "TIME_SERIES_DAILY_ADJUSTED",
         "symbol": symbol,
         "outputsize": "compact",
-        "apikey": api_key,
     }
 
     try:
         print(f"[Learn] Fetching live Alpha Vantage data for {symbol}...")
-        resp = requests.get(url, params=params, timeout=10)
-        resp.raise_for_status()
-        data = resp.json()
+        data = provider.query(params)
 
         # Alpha Vantage sends error / info messages here:
         if "Error Message" in data or "Note" in data:
@@ -113,37 +127,283 @@ def fetch_alpha_vantage_daily(symbol: str) -> Tuple[Optional[Dict], Optional[str
         return data, None
     except requests.RequestException as e:
         return None, f"Network error: {e}"
+    except SchedulerTimeout as e:
+        return None, f"Rate limited: {e}"
+    except CircuitOpenError as e:
+        return None, f"Provider unavailable: {e}"
+
+
+# Symbols whose stored history was refreshed recently; avoids re-asking the
+# provider on holidays, when the store can't catch up to last_session_date().
+_recently_refreshed = TTLCache(max_entries=2048)
+
+# Symbols whose refresh just failed, with the error, so views serve stored
+# history (or fail fast) instead of re-asking a provider that is down
+_failed_refreshes = TTLCache(max_entries=2048)
+
+
+def _needs_refresh(symbol: str, last) -> bool:
+    """Whether the stored history (ending at `last`) should be topped up from the provider."""
+    if last is not None and last >= last_session_date():
+        return False
+    return not _recently_refreshed.get(symbol) and not _failed_refreshes.get(symbol)
+
+
+def load_daily_history(
+    symbol: str, priority: int = PRIORITY_INTERACTIVE, max_wait: Optional[float] = None
+) -> Tuple[Optional[DailyBars], Optional[str]]:
+    """
+    Read daily bars from the local time series store, fetching from Alpha
+    Vantage and appending only the new dates when the store is behind.
+    """
+    store = get_timeseries_store()
+    last = store.last_date(symbol)
+
+    if _needs_refresh(symbol, last):
+        raw, error = fetch_alpha_vantage_daily(symbol, priority=priority, max_wait=max_wait)
+        if raw is not None:
+            added = store.append_alpha_vantage(symbol, raw["Time Series (Daily)"])
+            _recently_refreshed.set(symbol, True, ttl=get_market_cache().current_ttl())
+            print(f"[Learn] Stored {added} new daily bars for {symbol}")
+        else:
+            _failed_refreshes.set(
+                symbol, error,
+                ttl=getattr(settings, "MARKET_CIRCUIT_BREAKER", {}).get("negative_ttl", 60),
+            )
+            if last is None:
+                return None, error
+            print(f"[Learn] Serving stored history for {symbol}. Refresh failed: {error}")
+    elif last is None:
+        return None, _failed_refreshes.get(symbol)
+
+    return store.read(symbol), None
+
+
+# Sector peers shown next to the symbol in the trends section
+PEER_COUNT = 2
+
+# Dedicated pool for history loads: bulk requests already run get_learn_payload
+# on the bulk executor, so nesting peer loads there could exhaust it.
+_history_executor: Optional[ThreadPoolExecutor] = None
+_history_executor_lock = threading.Lock()
+
+
+def get_history_executor() -> ThreadPoolExecutor:
+    global _history_executor
+    if _history_executor is None:
+        with _history_executor_lock:
+            if _history_executor is None:
+                _history_executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, "MARKET_DATA_MAX_WORKERS", 8),
+                    thread_name_prefix="learn-history",
+                )
+    return _history_executor
+
+
+def resolve_peers(symbol: str, count: int = PEER_COUNT) -> List[str]:
+    """
+    Sector peers of `symbol` from the reference universe, on the caller's
+    exchange: INFY.BSE -> ['TCS.BSE', 'WIPRO.BSE'].
+    """
+    universe = MockMarketDataProvider.reference_universe()
+    ticker, dot, exchange = symbol.upper().partition(".")
+    peers = []
+    for row in universe.index.peers(ticker, count):
+        peer = universe.symbols[row].split(".")[0]
+        peers.append(f"{peer}.{exchange}" if dot else peer)
+    return peers
+
+
+def trend_key(symbol: str) -> str:
+    """Key of a company in the trends section: its lowercased name, e.g. 'infosys'."""
+    universe = MockMarketDataProvider.reference_universe()
+    row = universe.index.find(symbol.upper())
+    if row is None:
+        return symbol.split(".")[0].lower()
+    return universe.names[row].lower()
+
+
+# Sector-specific copy for the factors and sector sections of the payload
+SECTOR_NOTES = {
+    "IT Services": {
+        "global": "Global tech demand and USD‑INR movements influence Indian IT exporters.",
+        "description": (
+            "The IT sector is mainly affected by global demand for technology "
+            "services and the USD‑INR exchange rate. Stronger global economies "
+            "often mean more business for Indian IT firms."
+        ),
+    },
+    "Banking": {
+        "global": "Global interest rates and foreign investor flows affect Indian bank stocks.",
+        "description": (
+            "Banks earn from the gap between lending and deposit rates, so RBI "
+            "rate decisions, loan growth and bad-loan levels drive the sector."
+        ),
+    },
+    "FMCG": {
+        "global": "Global commodity prices change raw material costs for consumer goods makers.",
+        "description": (
+            "FMCG companies sell everyday products, so demand is steady. Rural "
+            "spending, inflation and input costs matter most for their profits."
+        ),
+    },
+    "Energy": {
+        "global": "Global crude oil and gas prices have a big effect on energy companies.",
+        "description": (
+            "Energy companies depend on oil and gas prices, refining margins "
+            "and government policy on fuel pricing."
+        ),
+    },
+    "Telecom": {
+        "global": "Global markets matter less here; the sector is driven mainly by Indian demand.",
+        "description": (
+            "Telecom companies grow with mobile and data usage. Tariff changes, "
+            "subscriber growth and spectrum costs drive the sector."
+        ),
+    },
+    "Pharma": {
+        "global": "US drug approvals and the USD‑INR rate matter for Indian pharma exporters.",
+        "description": (
+            "Pharma companies are affected by drug approvals, export demand "
+            "(especially from the US) and regulatory inspections."
+        ),
+    },
+    "Auto": {
+        "global": "Global metal and chip prices change production costs for carmakers.",
+        "description": (
+            "Auto companies follow consumer demand, fuel prices, interest rates "
+            "on vehicle loans and the cost of raw materials."
+        ),
+    },
+    "Metal": {
+        "global": "Global metal prices and demand from China strongly move metal stocks.",
+        "description": (
+            "Metal companies are cyclical: their profits rise and fall with "
+            "global metal prices and infrastructure spending."
+        ),
+    },
+}
+
+GENERIC_SECTOR_NOTE = {
+    "global": "Global market trends and currency movements can influence Indian stocks.",
+    "description": (
+        "Every sector has its own drivers. Read about the company's business "
+        "to understand what moves its sector."
+    ),
+}
+
+
+def company_profile(symbol: str) -> Tuple[Optional[str], Optional[str]]:
+    """(company name, sector) from the reference universe, or (None, None) if unknown."""
+    universe = MockMarketDataProvider.reference_universe()
+    row = universe.index.find(symbol.upper())
+    if row is None:
+        return None, None
+    return universe.names[row], universe.sector_names[universe.sector_ids[row]]
+
+
+def load_histories(
+    symbols: List[str], priority: int = PRIORITY_INTERACTIVE, max_wait: Optional[float] = None
+) -> List[Tuple[Optional[DailyBars], Optional[str]]]:
+    """load_daily_history for several symbols concurrently, in order."""
+    if len(symbols) == 1:
+        return [load_daily_history(symbols[0], priority=priority, max_wait=max_wait)]
+    return list(get_history_executor().map(
+        lambda s: load_daily_history(s, priority=priority, max_wait=max_wait), symbols
+    ))
+
+
+def usable_peer_bars(peers: List[str], histories) -> Dict[str, DailyBars]:
+    """Peers whose history loaded with enough bars to describe a trend."""
+    return {
+        peer: bars for peer, (bars, _) in zip(peers, histories)
+        if bars is not None and len(bars) >= 2
+    }
+
+
+def _learn_cache_config() -> Dict:
+    return {"max_entries": 256, "ttl": 6 * 60 * 60, **getattr(settings, "LEARN_PAYLOAD_CACHE", {})}
+
+
+# Built payloads keyed by (symbol, latest bar date): a new bar means a new key
+_payload_cache = TTLCache(
+    max_entries=_learn_cache_config()["max_entries"],
+    default_ttl=_learn_cache_config()["ttl"],
+)
 
 
 def build_live_learn_payload(symbol: str) -> Tuple[Optional[Dict], Optional[str]]:
     """
-    Uses Alpha Vantage raw data and converts it into your LearnData shape.
+    Uses locally stored Alpha Vantage history and converts it into your
+    LearnData shape. Payloads are cached per (symbol, latest bar date), in
+    memory and in the on-disk payload store shared by all workers, so a
+    symbol costs at most one upstream fetch and one build per trading day.
+    Sector peers are loaded alongside the symbol for the trends section.
+    Histories are only loaded when no payload exists for the stored date.
     """
-    raw, error = fetch_alpha_vantage_daily(symbol)
-    if error or raw is None:
+    last = get_timeseries_store().last_date(symbol)
+    if last is not None and not _needs_refresh(symbol, last):
+        payload = _built_payload(symbol, last)
+        if payload is not None:
+            return payload, None
+
+    peers = resolve_peers(symbol)
+    (bars, error), *peer_histories = load_histories([symbol] + peers)
+    if error or bars is None:
         return None, error
 
-    ts = raw["Time Series (Daily)"]
-    dates = sorted(ts.keys(), reverse=True)
-
-    if len(dates) < 2:
+    if len(bars) < 2:
         return None, "Not enough time series data."
 
-    latest = dates[0]
-    prev = dates[1]
+    payload = _payload_cache.get_or_set(
+        (symbol.upper(), bars.last_date),
+        lambda: _load_or_build_payload(symbol, bars, usable_peer_bars(peers, peer_histories)),
+    )
+    return payload, None
+
+
+def _built_payload(symbol: str, day) -> Optional[Dict]:
+    """A payload already built for `day`, from memory or the shared payload store."""
+    key = (symbol.upper(), day)
+    payload = _payload_cache.get(key)
+    if payload is None:
+        payload = get_payload_store().load(symbol, day)
+        if payload is not None:
+            _payload_cache.set(key, payload)
+    return payload
+
 
-    latest_data = ts[latest]
-    prev_data = ts[prev]
+def _load_or_build_payload(symbol: str, bars: DailyBars, peer_bars: Dict[str, DailyBars]) -> Dict:
+    store = get_payload_store()
+    payload = store.load(symbol, bars.last_date)
+    if payload is None:
+        payload = learn_payload_from_bars(symbol, bars, peer_bars)
+        try:
+            store.save(symbol, bars.last_date, payload)
+        except OSError as e:
+            print(f"[Learn] Could not persist payload for {symbol}: {e}")
+    return payload
 
-    latest_close = float(latest_data["4. close"])
-    prev_close = float(prev_data["4. close"])
+
+def cache_learn_payload(symbol: str, day, payload: Dict):
+    """Publish a payload built elsewhere (e.g. by the prewarm job) to this process."""
+    _payload_cache.set((symbol.upper(), day), payload)
+
+
+def learn_payload_from_bars(
+    symbol: str, bars: DailyBars, peer_bars: Optional[Dict[str, DailyBars]] = None
+) -> Dict:
+    """Build the LearnData payload from a symbol's stored daily bars (and its peers')."""
+    recent = bars.tail(2)
+    latest = str(recent.dates[-1])
+
+    latest_close = float(recent.close[-1])
+    prev_close = float(recent.close[-2])
 
     # % price change from previous close
     change_pct = round((latest_close - prev_close) / prev_close * 100, 2)
 
-    latest_volume = int(latest_data["6. volume"])
-    prev_volume = int(prev_data["6. volume"])
-    vol_change = latest_volume - prev_volume
+    vol_change = recent.volume[-1] - recent.volume[-2]
 
     # Dumb but beginner-friendly way to convert into "pressure" bars
     if change_pct > 0:
@@ -155,21 +415,36 @@ def build_live_learn_payload(symbol: str) -> Tuple[Optional[Dict], Optional[str]
 
     selling_pressure = 100 - buying_pressure
 
-    # Decide some simple labels based on change
-    if change_pct > 2:
-        ten_day_trend = "Strong Up"
-    elif change_pct > 0:
-        ten_day_trend = "Slightly Up"
-    elif change_pct < -2:
-        ten_day_trend = "Strong Down"
-    elif change_pct < 0:
-        ten_day_trend = "Slightly Down"
+    # 10/30-day trend, volatility and steadiness for the symbol and its peers, in one batch
+    peer_bars = peer_bars or {}
+    metrics = get_indicators({symbol: bars, **peer_bars})
+    trends = {trend_key(symbol): describe_indicators(metrics[symbol])}
+    for peer in peer_bars:
+        trends[trend_key(peer)] = describe_indicators(metrics[peer])
+
+    name, sector = company_profile(symbol)
+    note = SECTOR_NOTES.get(sector, GENERIC_SECTOR_NOTE)
+    if sector:
+        sector_factor = (
+            f"{sector} sector performance and sentiment affect this stock. "
+            f"If other {sector} stocks are doing well, this often helps too."
+        )
+        popular_reasons = [
+            f"Large, established {sector} company in India.",
+            f"One of the well-known names in the {sector} sector.",
+            "A familiar stock many beginners start with.",
+        ]
     else:
-        ten_day_trend = "Stable"
+        sector_factor = "How the stock's sector is doing often affects the stock itself."
+        popular_reasons = [
+            "Check the company's business and track record before investing.",
+        ]
 
     # Build a payload matching LearnData type
     payload = {
         "symbol": symbol.upper(),
+        "name": name or symbol.upper(),
+        "sector": sector,
         "changePct": change_pct,
         "beginnerVerdict": (
             f"Today the stock is {('up' if change_pct >= 0 else 'down')} "
@@ -191,14 +466,8 @@ def build_live_learn_payload(symbol: str) -> Tuple[Optional[Dict], Optional[str]
                 "Check the most recent earnings report to see if profits and "
                 "revenue are growing."
             ),
-            "sector": (
-                "IT sector performance and sentiment affect this stock. "
-                "If other IT stocks are doing well, this often helps too."
-            ),
-            "global": (
-                "Global tech demand and USD‑INR movements influence Indian IT "
-                "exporters."
-            ),
+            "sector": sector_factor,
+            "global": note["global"],
             "investorActivity": (
                 "Buying vs selling pressure is estimated from price and "
                 "volume changes."
@@ -215,67 +484,120 @@ def build_live_learn_payload(symbol: str) -> Tuple[Optional[Dict], Optional[str]
             "If you are new, start with a small SIP instead of a big one‑time "
             "investment. Watch how it behaves for a few weeks."
         ),
-        "sectorDescription": (
-            "The IT sector is influenced by global technology spending, "
-            "currency movements, and overall risk sentiment in the market."
-        ),
-        "trends": {
-            # We only have data for INFY here, so we keep peers as simple examples
-            "infosys": {
-                "trend10": ten_day_trend,
-                "trend30": "Slightly Up" if change_pct >= 0 else "Slightly Down",
-                "volatility": "Medium",
-                "steadiness": "Fairly Steady",
-            },
-            "tcs": {
-                "trend10": "Stable",
-                "trend30": "Slightly Up",
-                "volatility": "Low",
-                "steadiness": "Very Steady",
-            },
-            "wipro": {
-                "trend10": "Some Ups & Downs",
-                "trend30": "Slightly Down",
-                "volatility": "Medium",
-                "steadiness": "Some Ups & Downs",
-            },
-        },
-        "popularReasons": [
-            "Large, established IT company in India.",
-            "Backed by long‑term contracts with global clients.",
-            "Part of a sector many beginners start with.",
-        ],
+        "sectorDescription": note["description"],
+        "trends": trends,
+        "popularReasons": popular_reasons,
         "dataSource": "alpha_vantage",
         "latestDate": latest,
         "latestClose": latest_close,
     }
 
-    return payload, None
+    return payload
 
 
-# ---------- MAIN VIEW ----------
+# ---------- VIEWS ----------
 
-@api_view(["GET"])
-@permission_classes([AllowAny])
-def get_infy_data(request):
+# Most symbols a single bulk request may ask for
+MAX_BULK_SYMBOLS = 20
+
+# Ticker with an optional exchange suffix, e.g. INFY, M&M.BSE, BAJAJ-AUTO.NS.
+# Symbols become store file names, cache keys and upstream queries, so
+# anything else is rejected up front.
+SYMBOL_PATTERN = re.compile(r"^[A-Z0-9&-]{1,20}(\.[A-Z]{1,5})?$")
+
+
+def is_valid_symbol(symbol: str) -> bool:
+    return bool(SYMBOL_PATTERN.match(symbol.upper()))
+
+# Bulk learn requests get their own bounded pool, so a few of them waiting on
+# the rate limiter can't starve the market endpoints' quote executor.
+_bulk_executor: Optional[ThreadPoolExecutor] = None
+_bulk_executor_lock = threading.Lock()
+
+
+def get_bulk_executor() -> ThreadPoolExecutor:
+    global _bulk_executor
+    if _bulk_executor is None:
+        with _bulk_executor_lock:
+            if _bulk_executor is None:
+                _bulk_executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, "MARKET_DATA_MAX_WORKERS", 8),
+                    thread_name_prefix="learn-bulk",
+                )
+    return _bulk_executor
+
+
+def get_learn_payload(symbol: str) -> Tuple[Optional[Dict], Optional[str]]:
     """
-    Return learn‑page data for Infosys (INFY).
+    Learn-page data for one symbol, as (payload, error).
     If USE_REAL_MARKET_DATA=True and Alpha Vantage works, return live data.
-    Otherwise fall back to MOCK_LEARN_DATA so the frontend never breaks.
+    Otherwise Infosys falls back to MOCK_LEARN_DATA so its page never breaks;
+    the mock describes Infosys only, so other symbols get (None, reason).
     """
-    use_live = getattr(settings, "USE_REAL_MARKET_DATA", False)
+    symbol = symbol.upper()
+    error = "Live market data is disabled."
 
-    if use_live:
-        # Alpha Vantage symbol – adjust if you want NSE vs BSE etc.
-        # For NSE many people use "INFY.NS", for BSE "INFY.BSE".
-        symbol = "INFY.BSE"
+    if getattr(settings, "USE_REAL_MARKET_DATA", False):
         live_payload, error = build_live_learn_payload(symbol)
 
         if live_payload is not None:
-            return Response(live_payload, status=status.HTTP_200_OK)
+            return live_payload, None
 
         # Log the error so you can see it in the console
-        print(f"[Learn] Falling back to mock data. Reason: {error}")
+        print(f"[Learn] No live data for {symbol}. Reason: {error}")
 
-    # Default: return mock data
-    return Response(MOCK_LEARN_DATA, status=status.HTTP_200_OK)
+    if symbol.split(".")[0] == MOCK_LEARN_DATA["symbol"]:
+        return {**MOCK_LEARN_DATA, "symbol": symbol}, None
+    return None, error
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def get_infy_data(request):
+    """Return learn‑page data for Infosys (INFY)."""
+    # Alpha Vantage symbol – for NSE many people use "INFY.NS", for BSE "INFY.BSE".
+    payload, _ = get_learn_payload("INFY.BSE")
+    if payload.get("dataSource") == "mock":
+        payload = MOCK_LEARN_DATA
+    return Response(payload, status=status.HTTP_200_OK)
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def get_symbol_data(request, symbol: str):
+    """Return learn‑page data for any symbol, e.g. /learn/TCS.BSE/."""
+    if not is_valid_symbol(symbol):
+        return Response({"error": f"Invalid symbol: {symbol[:32]!r}"},
+                        status=status.HTTP_400_BAD_REQUEST)
+    payload, error = get_learn_payload(symbol)
+    if payload is None:
+        return Response({"error": f"No learn data for {symbol.upper()}: {error}"},
+                        status=status.HTTP_404_NOT_FOUND)
+    return Response(payload, status=status.HTTP_200_OK)
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def get_bulk_data(request):
+    """
+    Return learn‑page data for several symbols at once:
+    /learn/bulk/?symbols=INFY.BSE,TCS.BSE
+    """
+    requested = [s.strip().upper() for s in request.query_params.get("symbols", "").split(",") if s.strip()]
+    if not requested:
+        return Response({"error": "Pass one or more symbols, e.g. ?symbols=INFY.BSE,TCS.BSE"},
+                        status=status.HTTP_400_BAD_REQUEST)
+    if len(requested) > MAX_BULK_SYMBOLS:
+        return Response({"error": f"At most {MAX_BULK_SYMBOLS} symbols per request."},
+                        status=status.HTTP_400_BAD_REQUEST)
+    invalid = [s for s in requested if not is_valid_symbol(s)]
+    if invalid:
+        return Response({"error": f"Invalid symbols: {', '.join(s[:32] for s in invalid)}"},
+                        status=status.HTTP_400_BAD_REQUEST)
+    symbols: List[str] = list(dict.fromkeys(requested))
+
+    # Cold symbols wait on the shared rate limiter concurrently rather than in turn
+    results = {}
+    for symbol, (payload, error) in zip(symbols, get_bulk_executor().map(get_learn_payload, symbols)):
+        results[symbol] = payload if payload is not None else {"symbol": symbol, "error": error}
+    return Response(results, status=status.HTTP_200_OK)
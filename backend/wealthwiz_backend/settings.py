@@ -62,6 +62,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'wealthwiz_backend.wsgi.application'
+ASGI_APPLICATION = 'wealthwiz_backend.asgi.application'
 
 # Database - SQLite for dev, PostgreSQL for production
 if DEBUG:
@@ -141,11 +142,208 @@ CORS_ALLOW_CREDENTIALS = True
 USE_REAL_MARKET_DATA = config('USE_REAL_MARKET_DATA', default=False, cast=bool)
 ALPHA_VANTAGE_API_KEY = config('ALPHA_VANTAGE_API_KEY', default='demo')
 
+# Local daily OHLCV history (append-only, memory-mapped)
+MARKET_DATA_STORE_DIR = config('MARKET_DATA_STORE_DIR', default=str(BASE_DIR / 'data' / 'timeseries'))
+
+# Market data cache (TTLs in seconds; short while NSE trades, long after close,
+# and short again for mock fallback data so it doesn't outlive an outage)
+MARKET_DATA_CACHE = {
+    'open_ttl': config('MARKET_CACHE_OPEN_TTL', default=60, cast=int),
+    'closed_ttl': config('MARKET_CACHE_CLOSED_TTL', default=6 * 60 * 60, cast=int),
+    'fallback_ttl': config('MARKET_CACHE_FALLBACK_TTL', default=30, cast=int),
+    'max_entries': config('MARKET_CACHE_MAX_ENTRIES', default=1024, cast=int),
+}
+
+# Alpha Vantage quota (free tier: 5 calls/minute). Calls queue for up to
+# max_wait seconds before falling back. The token bucket is kept in state_dir
+# so all worker processes and management commands on the host share it.
+ALPHA_VANTAGE_RATE_LIMIT = {
+    'calls_per_minute': config('ALPHA_VANTAGE_CALLS_PER_MINUTE', default=5, cast=float),
+    'burst': config('ALPHA_VANTAGE_BURST', default=5, cast=int),
+    'max_wait': config('ALPHA_VANTAGE_MAX_WAIT', default=20, cast=float),
+    'state_dir': config('ALPHA_VANTAGE_RATE_STATE_DIR', default=str(BASE_DIR / 'data' / 'ratelimit')),
+}
+
+# Number of symbols in the mock market (the 16 real names, then synthetic ones)
+MOCK_MARKET_UNIVERSE_SIZE = config('MOCK_MARKET_UNIVERSE_SIZE', default=16, cast=int)
+
+# Intraday tick simulator for the mock market (load/latency testing)
+MOCK_MARKET_SIMULATION = {
+    'enabled': config('MOCK_MARKET_SIMULATION', default=False, cast=bool),
+    'ticks_per_second': config('MOCK_MARKET_TICKS_PER_SECOND', default=50, cast=float),
+    'ring_size': 128,
+}
+
+# NSE symbols scanned for top gainers/losers when using real market data
+MARKET_WATCHLIST = config(
+    'MARKET_WATCHLIST',
+    default=(
+        'INFY.NS,HDFCBANK.NS,ITC.NS,TCS.NS,RELIANCE.NS,'
+        'ICICIBANK.NS,HINDUNILVR.NS,WIPRO.NS,SBIN.NS,BHARTIARTL.NS'
+    ),
+    cast=Csv()
+)
+
+# Background market snapshot (summary, risk, movers) rebuilt every interval seconds
+MARKET_SNAPSHOT = {
+    'interval': config('MARKET_SNAPSHOT_INTERVAL', default=60, cast=int),
+    'background': config('MARKET_SNAPSHOT_BACKGROUND', default=True, cast=bool),
+    'movers_count': 10,
+}
+
+# Live market stream (SSE): snapshot poll and keep-alive intervals in seconds
+MARKET_STREAM = {
+    'poll_interval': config('MARKET_STREAM_POLL_INTERVAL', default=2, cast=float),
+    'keepalive': 15,
+}
+
+# Circuit breaker for market data providers. Opens when failure_rate of the
+# last `window` calls fails; probes again after open_seconds. Failed symbols
+# go straight to the fallback (and failed learn history refreshes aren't
+# retried) for negative_ttl seconds.
+MARKET_CIRCUIT_BREAKER = {
+    'failure_rate': 0.5,
+    'window': 20,
+    'min_calls': 5,
+    'open_seconds': config('MARKET_BREAKER_OPEN_SECONDS', default=30, cast=int),
+    'negative_ttl': config('MARKET_NEGATIVE_CACHE_TTL', default=60, cast=int),
+}
+
+# Max concurrent provider requests (also the keep-alive pool size)
+MARKET_DATA_MAX_WORKERS = config('MARKET_DATA_MAX_WORKERS', default=8, cast=int)
+
+# Real-data providers in order of preference (mock stays the last resort)
+MARKET_DATA_PROVIDERS = config('MARKET_DATA_PROVIDERS', default='alpha_vantage,store', cast=Csv())
+
+# Hedged requests: when a provider is slower than its own observed p95, also
+# ask the next one and take whichever answers first. Until min_samples calls
+# have been seen, default_delay seconds is used instead of the p95.
+MARKET_HEDGING = {
+    'enabled': config('MARKET_HEDGING', default=True, cast=bool),
+    'default_delay': config('MARKET_HEDGE_DEFAULT_DELAY', default=2.0, cast=float),
+    'min_delay': 0.05,
+    'min_samples': 20,
+    'max_workers': 16,
+}
+
+# Market risk from realized volatility (annualized %) and drawdown (%) over a
+# rolling window of daily index closes. With real data, index_symbol's closes
+# come from the local history store (refreshed by the learn prewarm) and its
+# quote supplies today's level.
+MARKET_RISK = {
+    'index_symbol': config('MARKET_RISK_INDEX_SYMBOL', default='NIFTYBEES.BSE'),
+    'window': config('MARKET_RISK_WINDOW', default=20, cast=int),
+    'min_days': 5,
+    'history_size': 30,
+    'high_volatility': 25.0,
+    'medium_volatility': 15.0,
+    'high_drawdown': 10.0,
+    'medium_drawdown': 5.0,
+}
+
+# Built learn-page payloads, cached per (symbol, latest bar date)
+LEARN_PAYLOAD_CACHE = {
+    'max_entries': config('LEARN_PAYLOAD_CACHE_SIZE', default=256, cast=int),
+    'ttl': 6 * 60 * 60,
+}
+
+# Built learn payloads shared across worker processes (one JSON file per symbol)
+LEARN_PAYLOAD_DIR = config('LEARN_PAYLOAD_DIR', default=str(BASE_DIR / 'data' / 'learn'))
+
+# Symbols whose learn payloads are prebuilt after the close
+LEARN_WATCHLIST = config(
+    'LEARN_WATCHLIST',
+    default=(
+        'INFY.BSE,TCS.BSE,WIPRO.BSE,HCLTECH.BSE,RELIANCE.BSE,'
+        'HDFCBANK.BSE,ICICIBANK.BSE,ITC.BSE,SBIN.BSE,BHARTIARTL.BSE'
+    ),
+    cast=Csv()
+)
+
+# After-close prewarm (`manage.py prewarm_learn`). With schedule on, each
+# web process runs it delay_minutes after the NSE close; a file lock keeps
+# it to one run at a time. max_wait is how long fetches may queue on the
+# Alpha Vantage rate limit.
+LEARN_PREWARM = {
+    'schedule': config('LEARN_PREWARM_SCHEDULE', default=False, cast=bool),
+    'delay_minutes': 30,
+    'processes': config('LEARN_PREWARM_PROCESSES', default=2, cast=int),
+    'max_wait': 600,
+}
+
 # LLM Provider Configuration
 LLM_PROVIDER = config('LLM_PROVIDER', default='gemini')  # 'gemini' or 'openai'
 GEMINI_API_KEY = config('GEMINI_API_KEY', default='')
 OPENAI_API_KEY = config('OPENAI_API_KEY', default='')
 
+# Ordered provider chain; defaults to LLM_PROVIDER, then the other provider.
+# Providers without an API key are skipped and the mock answers only when
+# every provider failed.
+LLM_PROVIDERS = config('LLM_PROVIDERS', default='', cast=Csv())
+
+# A call slower than its provider's rolling p90 is raced against the next
+# provider in the chain; default_delay applies until min_samples calls
+# have been seen.
+LLM_HEDGING = {
+    'enabled': config('LLM_HEDGING', default=True, cast=bool),
+    'percentile': 90,
+    'default_delay': config('LLM_HEDGE_DEFAULT_DELAY', default=5.0, cast=float),
+    'min_delay': 0.5,
+    'min_samples': 20,
+    'max_workers': 8,
+}
+
+# Process-wide cache of LLM responses, keyed by provider, model, prompt and
+# max_tokens. Market-wide prompts are identical for every user, so one
+# generation serves all page views until the TTL runs out.
+LLM_CACHE = {
+    'enabled': config('LLM_CACHE', default=True, cast=bool),
+    'ttl': config('LLM_CACHE_TTL', default=3600, cast=int),
+    'max_entries': config('LLM_CACHE_SIZE', default=512, cast=int),
+}
+
+# Build the LLM clients and open provider connections when a worker boots
+LLM_WARMUP = config('LLM_WARMUP', default=True, cast=bool)
+
+# Hard timeout for a single provider SDK request (seconds)
+LLM_REQUEST_TIMEOUT = config('LLM_REQUEST_TIMEOUT', default=20, cast=float)
+
+# Gated LLM calls (the explain endpoint): at most max_in_flight generations
+# per worker process, at most max_queue callers waiting for a slot, and a
+# deadline of timeout seconds per call. Callers over the limits get a
+# degraded response immediately. Keep max_in_flight + max_queue below the
+# worker's thread count so other views always have a thread.
+LLM_CONCURRENCY = {
+    'max_in_flight': config('LLM_MAX_IN_FLIGHT', default=4, cast=int),
+    'max_queue': config('LLM_MAX_QUEUE', default=2, cast=int),
+    'timeout': config('LLM_DEADLINE', default=15, cast=float),
+}
+
+# Seconds between chunks when the mock LLM streams a response
+LLM_MOCK_STREAM_DELAY = config('LLM_MOCK_STREAM_DELAY', default=0.05, cast=float)
+
+# Concurrent identical LLM calls share one in-flight generation; waiters
+# give up after timeout seconds.
+LLM_COALESCING = {
+    'enabled': config('LLM_COALESCING', default=True, cast=bool),
+    'timeout': config('LLM_COALESCE_TIMEOUT', default=30, cast=float),
+}
+
+# Personalized advice is generated per band of inputs rather than per user:
+# readiness score in steps of score_step (also split at the readiness status
+# thresholds), emergency fund coverage split at
+# the ef_months edges (the last edge means "or more"). Advice for each band
+# is cached for cache_ttl seconds. With prewarm on, each web process fills
+# every band in the background, checking the market risk level every
+# prewarm_interval seconds.
+ADVICE_BUCKETS = {
+    'score_step': config('ADVICE_SCORE_STEP', default=10, cast=int),
+    'ef_months': config('ADVICE_EF_MONTHS', default='0,1,3,6', cast=Csv(cast=float)),
+    'cache_ttl': config('ADVICE_CACHE_TTL', default=21600, cast=int),
+    'prewarm': config('ADVICE_PREWARM', default=False, cast=bool),
+    'prewarm_interval': 60,
+}
+
 # Readiness Score Weights
 READINESS_WEIGHTS = {
     'emergency_fund': 0.40,
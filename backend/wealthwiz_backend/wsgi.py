@@ -6,3 +6,17 @@ from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'wealthwiz_backend.settings')
 application = get_wsgi_application()
+
+from django.conf import settings  # noqa: E402
+
+if settings.LEARN_PREWARM.get('schedule'):
+    from learn.prewarm import start_prewarm_schedule
+    start_prewarm_schedule()
+
+if settings.ADVICE_BUCKETS.get('prewarm'):
+    from advisor.services.advice_engine import start_advice_prewarm
+    start_advice_prewarm()
+
+if settings.LLM_WARMUP:
+    from advisor.services.llm_client import warm_up_llm_clients
+    warm_up_llm_clients()